@@ -0,0 +1,816 @@
+import functools
+import pickle
+import re
+import threading
+from collections import OrderedDict
+
+import db
+from db import get_connection
+
+# -----------------------------
+# --- Analysis (no GUI) -------
+# -----------------------------
+# Pure data functions behind the Analysis menu. They return DataFrames and
+# never touch Tkinter or matplotlib, so they can be reused and benchmarked.
+# pandas/numpy are imported inside the functions that need them: each SQL
+# analysis also has a *_query() builder whose (sql, params) can be run with
+# read_rows(), which is how the CLI answers without loading pandas at all.
+
+
+def read_rows(sql, params=()):
+    # (column names, row tuples) straight from SQLite
+    cursor = get_connection().execute(sql, params)
+    return [d[0] for d in cursor.description], cursor.fetchall()
+
+
+def read_frame(sql, params=()):
+    import pandas as pd
+    return pd.read_sql_query(sql, get_connection(), params=params)
+
+
+# -----------------------------
+# --- Result Cache ------------
+# -----------------------------
+# The DataFrame analyses below are memoized in an LRU cache of CACHE_SIZE
+# results, keyed by (database, analysis, arguments). Each entry carries the
+# (table, scope) tags it was computed from, where scope is ("tournament", id),
+# ("match", id) or ("knockout", tournament id) for knockout-stage matches. The
+# db change notifications published by the CRUD functions are mapped to the
+# same tags (_change_tags), and only the entries they hit are dropped. A bulk
+# insert or a reset drops every entry that reads the table, and an entry with
+# the ALL scope (all-time analyses) is dropped by any change to its tables.
+# Callers get a copy (of every value, for dict results), so the cached frames
+# are never mutated; read-only arrays are shared instead of copied.
+# cached_figure() does the same for functions that draw a matplotlib Figure:
+# it is stored pickled and unpickled per caller.
+# The uncached function is available as func.__wrapped__.
+CACHE_SIZE = 128
+_cache = OrderedDict()      # key -> (tags, result)
+_cache_lock = threading.Lock()
+_cache_generation = 0       # bumped on every invalidation
+_cache_stats = {"hits": 0, "misses": 0, "invalidations": 0}
+ALL = ("all",)              # scope of results that read every tournament
+
+
+def cached(tags):
+    # tags(*args) -> set of (table, scope) the result depends on
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (db.DB_PATH, func.__name__) + args + tuple(sorted(kwargs.items()))
+            with _cache_lock:
+                entry = _cache.get(key)
+                if entry is not None:
+                    _cache.move_to_end(key)
+                    _cache_stats["hits"] += 1
+                    return _copy(entry[1])
+                _cache_stats["misses"] += 1
+                generation = _cache_generation
+            result = func(*args, **kwargs)
+            entry_tags = tags(*args, **kwargs)
+            with _cache_lock:
+                # Skip the store if a write landed while we were computing
+                if generation == _cache_generation:
+                    _cache[key] = (entry_tags, result)
+                    while len(_cache) > CACHE_SIZE:
+                        _cache.popitem(last=False)
+            return _copy(result)
+        return wrapper
+    return decorator
+
+
+def _copy(result):
+    # A dict result (several frames/arrays) is copied value by value. Bytes
+    # (pickled figures), read-only arrays (head_to_head's matrices) and other
+    # immutable values are shared as they are.
+    if isinstance(result, dict):
+        return {key: _copy(value) for key, value in result.items()}
+    if not getattr(getattr(result, "flags", None), "writeable", True):
+        return result
+    return result.copy() if hasattr(result, "copy") else result
+
+
+def cached_figure(tags):
+    def decorator(func):
+        @cached(tags)
+        @functools.wraps(func)
+        def pickled(*args, **kwargs):
+            return pickle.dumps(func(*args, **kwargs))
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return pickle.loads(pickled(*args, **kwargs))
+        return wrapper
+    return decorator
+
+
+def _tournament_of(table, key):
+    # tournament_id of a Match (by match_id) or a Team (by team_id)
+    column = "match_id" if table == "Match" else "team_id"
+    row = get_connection().execute(f"SELECT tournament_id FROM {table} WHERE {column}=?", (key,)).fetchone()
+    return row[0] if row else None
+
+
+def _change_tags(table, row):
+    # The (table, scope) tags a changed row can affect
+    if table == "Match":
+        tags = {("Match", ("tournament", row[7])), ("Match", ("match", row[0]))}
+        if stage_round(row[2]) is not None:
+            tags.add(("Match", ("knockout", row[7])))
+        return tags
+    if table == "Tournament":
+        return {("Tournament", ("tournament", row[0]))}
+    if table == "Team":
+        return {("Team", ("tournament", row[4]))}
+    if table == "Player":
+        return {("Player", ("tournament", _tournament_of("Team", row[3])))}
+    if table == "Event":
+        return {("Event", ("match", row[1])), ("Event", ("tournament", _tournament_of("Match", row[1])))}
+    return set()
+
+
+def _invalidate(table, action, key, row=None):
+    global _cache_generation
+    tags = _change_tags(table, row) if row is not None else None
+    with _cache_lock:
+        _cache_generation += 1
+        for cache_key, (entry_tags, _) in list(_cache.items()):
+            if any(tag[0] == table and (tags is None or tag[1] == ALL or tag in tags) for tag in entry_tags):
+                del _cache[cache_key]
+                _cache_stats["invalidations"] += 1
+
+db.subscribe(_invalidate)
+
+
+def clear_cache():
+    global _cache_generation
+    with _cache_lock:
+        _cache_generation += 1
+        _cache.clear()
+
+
+def cache_info():
+    with _cache_lock:
+        return dict(_cache_stats, size=len(_cache), max_size=CACHE_SIZE)
+
+
+def _tournament_tags(*tables):
+    return lambda tournament_id, *args, **kwargs: {(table, ("tournament", tournament_id)) for table in tables}
+
+
+def _all_tags(*tables):
+    return lambda *args, **kwargs: {(table, ALL) for table in tables}
+
+
+def _match_tags(match_id):
+    tags = {("Event", ("match", match_id)), ("Match", ("match", match_id))}
+    tournament_id = _tournament_of("Match", match_id)
+    if tournament_id is not None:   # else the match is gone (or not there yet)
+        tags |= {("Player", ("tournament", tournament_id)), ("Team", ("tournament", tournament_id))}
+    return tags
+
+LEADERBOARD_COLUMNS = ["team_id", "team_name", "played", "won", "drawn", "lost",
+                       "goals_for", "goals_against", "goal_difference", "points"]
+
+
+def leaderboard_from_frames(df_teams, df_matches):
+    # df_teams: team_id, team_name
+    # df_matches: team1_id, team2_id, team1_score, team2_score
+    # Every match is stacked as two rows (home view + away view) and the
+    # per-team totals are produced with np.bincount over team positions.
+    # Unplayed matches (no score) are left out, as in TeamStanding.
+    import numpy as np
+    import pandas as pd
+    n = len(df_teams)
+    team_index = pd.Index(df_teams["team_id"].to_numpy())
+
+    df_matches = df_matches.dropna(subset=["team1_score", "team2_score"])
+    t1 = df_matches["team1_id"].to_numpy()
+    t2 = df_matches["team2_id"].to_numpy()
+    s1 = df_matches["team1_score"].to_numpy(dtype=np.int64)
+    s2 = df_matches["team2_score"].to_numpy(dtype=np.int64)
+
+    codes = team_index.get_indexer(np.concatenate([t1, t2]))
+    scored = np.concatenate([s1, s2])
+    conceded = np.concatenate([s2, s1])
+    # Matches against teams outside this tournament's Team rows are ignored
+    keep = codes >= 0
+    codes, scored, conceded = codes[keep], scored[keep], conceded[keep]
+    result = np.sign(scored - conceded)
+
+    played = np.bincount(codes, minlength=n)
+    won = np.bincount(codes, weights=result > 0, minlength=n).astype(np.int64)
+    drawn = np.bincount(codes, weights=result == 0, minlength=n).astype(np.int64)
+    goals_for = np.bincount(codes, weights=scored, minlength=n).astype(np.int64)
+    goals_against = np.bincount(codes, weights=conceded, minlength=n).astype(np.int64)
+
+    board = pd.DataFrame({
+        "team_id": df_teams["team_id"].to_numpy(),
+        "team_name": df_teams["team_name"].to_numpy(),
+        "played": played,
+        "won": won,
+        "drawn": drawn,
+        "lost": played - won - drawn,
+        "goals_for": goals_for,
+        "goals_against": goals_against,
+        "goal_difference": goals_for - goals_against,
+        "points": 3 * won + drawn,
+    }, columns=LEADERBOARD_COLUMNS)
+    board = board.sort_values(["points", "goal_difference", "goals_for", "team_name"],
+                              ascending=[False, False, False, True], kind="mergesort")
+    return board.reset_index(drop=True)
+
+
+TOURNAMENT_TEAMS_SQL = "SELECT team_id, team_name FROM Team WHERE tournament_id=?"
+TOURNAMENT_SCORES_SQL = "SELECT team1_id, team2_id, team1_score, team2_score FROM Match WHERE tournament_id=?"
+STANDINGS_SQL = """
+SELECT t.team_id, t.team_name,
+       COALESCE(s.played, 0) AS played, COALESCE(s.won, 0) AS won,
+       COALESCE(s.drawn, 0) AS drawn, COALESCE(s.lost, 0) AS lost,
+       COALESCE(s.goals_for, 0) AS goals_for, COALESCE(s.goals_against, 0) AS goals_against,
+       COALESCE(s.goals_for - s.goals_against, 0) AS goal_difference,
+       COALESCE(s.points, 0) AS points
+FROM Team t
+LEFT JOIN TeamStanding s ON s.tournament_id = t.tournament_id AND s.team_id = t.team_id
+WHERE t.tournament_id = ?
+"""
+
+
+def leaderboard_query(tournament_id):
+    return (STANDINGS_SQL + " ORDER BY points DESC, goal_difference DESC, goals_for DESC, t.team_name",
+            (tournament_id,))
+
+
+@cached(_tournament_tags("Team", "Match"))
+def compute_leaderboard(tournament_id):
+    # Sorted standings for one tournament: points, W/D/L, GF, GA, GD.
+    # Reads the TeamStanding summary, so the cost is O(teams), not O(matches).
+    return read_frame(*leaderboard_query(tournament_id))
+
+
+@cached(_tournament_tags("Team", "Match"))
+def compute_leaderboard_from_matches(tournament_id):
+    # Same result recomputed from every Match row (no TeamStanding)
+    df_teams = read_frame(TOURNAMENT_TEAMS_SQL, (tournament_id,))
+    df_matches = read_frame(TOURNAMENT_SCORES_SQL, (tournament_id,))
+    return leaderboard_from_frames(df_teams, df_matches)
+
+
+TOP_SCORERS_SQL = """
+SELECT p.player_id, p.player_name, t.team_name, COUNT(*) AS count
+FROM Event e
+JOIN Match m ON m.match_id = e.match_id
+JOIN Player p ON p.player_id = e.player_id
+LEFT JOIN Team t ON t.team_id = p.team_id
+WHERE m.tournament_id = ? AND e.event_type = ?
+GROUP BY p.player_id
+ORDER BY count DESC, p.player_name
+"""
+
+
+def top_scorers_query(tournament_id, event_type="Goal", limit=None):
+    sql = TOP_SCORERS_SQL
+    params = [tournament_id, event_type]
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(int(limit))
+    return sql, params
+
+
+@cached(_tournament_tags("Event", "Match", "Player", "Team"))
+def top_scorers(tournament_id, event_type="Goal", limit=None):
+    # Players ranked by how many events of event_type (Goal, Assist, Save, ...)
+    # they have in a tournament. Counting and ranking happen in SQLite, so only
+    # the ranked rows are transferred.
+    return read_frame(*top_scorers_query(tournament_id, event_type, limit))
+
+
+MATCH_TIMELINE_SQL = """
+SELECT e.event_id, e.minute, e.event_type, e.player_id, p.player_name, t.team_name
+FROM Event e
+LEFT JOIN Player p ON p.player_id = e.player_id
+LEFT JOIN Team t ON t.team_id = p.team_id
+WHERE e.match_id = ?
+ORDER BY e.minute, e.event_id
+"""
+
+
+def match_timeline_query(match_id):
+    return MATCH_TIMELINE_SQL, (match_id,)
+
+
+@cached(_match_tags)
+def match_timeline(match_id):
+    # Every event of a match in minute order, with player and team names
+    # resolved by the JOIN instead of per-row lookups
+    return read_frame(*match_timeline_query(match_id))
+
+
+def tournament_goals_query(tournament_id):
+    return (f"SELECT team_id, team_name, goals_for AS goals FROM ({STANDINGS_SQL}) ORDER BY team_id",
+            (tournament_id,))
+
+
+@cached(_tournament_tags("Team", "Match"))
+def tournament_goals(tournament_id):
+    # Goals scored per team in a tournament, in Team-table order
+    return read_frame(*tournament_goals_query(tournament_id))
+
+
+# -----------------------------
+# --- Group Standings ---------
+# -----------------------------
+# Per-group tables from Team.group_name and the group-stage matches (stage
+# "Group..."). A match counts for each side in that team's own group, even when
+# the opponent is in another group, as in the preset data; unplayed fixtures
+# with no score are left out. FIFA order: points, goal difference, goals for;
+# then, among the teams still level, points, goal difference and goals for in
+# the matches between them; then fair play (yellow -1, red -4); then lots,
+# which here is the team name so the order is stable. The mini-table is applied
+# once to each block of level teams (not re-applied to a smaller remainder).
+# Every group is ranked in the same vectorised pass.
+GROUP_CRITERIA = ["points", "goal_difference", "goals_for", "h2h_points", "h2h_goal_difference",
+                  "h2h_goals_for", "fair_play", "team_name"]
+GROUP_COLUMNS = ["group_name", "position", "team_id", "team_name", "played", "won", "drawn", "lost",
+                 "goals_for", "goals_against", "goal_difference", "points", "h2h_points",
+                 "h2h_goal_difference", "h2h_goals_for", "fair_play", "decided_by"]
+
+GROUP_TEAMS_SQL = """
+SELECT team_id, team_name, group_name FROM Team
+WHERE tournament_id = ? AND group_name IS NOT NULL AND trim(group_name) <> ''
+"""
+GROUP_MATCHES_SQL = """
+SELECT m.match_id, m.date, t1.group_name AS group1, m.team1_id, t1.team_name AS team1, m.team1_score,
+       m.team2_score, t2.team_name AS team2, m.team2_id, t2.group_name AS group2
+FROM Match m
+JOIN Team t1 ON t1.team_id = m.team1_id
+JOIN Team t2 ON t2.team_id = m.team2_id
+WHERE m.tournament_id = ? AND m.stage LIKE 'Group%'
+ORDER BY m.date, m.match_id
+"""
+FAIR_PLAY_SQL = """
+SELECT p.team_id, SUM(CASE e.event_type WHEN 'Red Card' THEN -4 ELSE -1 END) AS fair_play
+FROM Event e
+JOIN Match m ON m.match_id = e.match_id
+JOIN Player p ON p.player_id = e.player_id
+WHERE e.event_type IN ('Yellow Card', 'Red Card') AND m.tournament_id = ? AND m.stage LIKE 'Group%'
+GROUP BY p.team_id
+"""
+
+
+def group_standings_from_frames(df_teams, df_matches, df_fair_play=None):
+    # df_teams: team_id, team_name, group_name
+    # df_matches: team1_id, team2_id, team1_score, team2_score
+    # df_fair_play: team_id, fair_play (optional)
+    import numpy as np
+    import pandas as pd
+    n = len(df_teams)
+    team_index = pd.Index(df_teams["team_id"].to_numpy())
+    groups = pd.factorize(df_teams["group_name"])[0]
+
+    df_matches = df_matches.dropna(subset=["team1_score", "team2_score"])
+    c1 = team_index.get_indexer(df_matches["team1_id"].to_numpy())
+    c2 = team_index.get_indexer(df_matches["team2_id"].to_numpy())
+    s1 = df_matches["team1_score"].to_numpy(dtype=np.int64)
+    s2 = df_matches["team2_score"].to_numpy(dtype=np.int64)
+    # One row per side; a side whose team is not loaded (-1) is dropped
+    team = np.concatenate([c1, c2])
+    opponent = np.concatenate([c2, c1])
+    scored = np.concatenate([s1, s2])
+    conceded = np.concatenate([s2, s1])
+    keep = team >= 0
+    team, opponent, scored, conceded = team[keep], opponent[keep], scored[keep], conceded[keep]
+
+    def totals(rows):
+        # played, won, drawn, goals for, goals against over the selected rows
+        codes = team[rows]
+        won = np.bincount(codes, weights=scored[rows] > conceded[rows], minlength=n).astype(np.int64)
+        drawn = np.bincount(codes, weights=scored[rows] == conceded[rows], minlength=n).astype(np.int64)
+        goals_for = np.bincount(codes, weights=scored[rows], minlength=n).astype(np.int64)
+        goals_against = np.bincount(codes, weights=conceded[rows], minlength=n).astype(np.int64)
+        return np.bincount(codes, minlength=n), won, drawn, goals_for, goals_against
+
+    played, won, drawn, goals_for, goals_against = totals(np.ones(len(team), dtype=bool))
+    points = 3 * won + drawn
+    # Blocks of teams level on points, GD and GF within a group, then the
+    # mini-table of the matches inside each block
+    level = pd.factorize(pd.MultiIndex.from_arrays([groups, points, goals_for - goals_against, goals_for]))[0]
+    _, h2h_won, h2h_drawn, h2h_for, h2h_against = totals((opponent >= 0) & (level[team] == level[opponent]))
+    fair_play = np.zeros(n, dtype=np.int64)
+    if df_fair_play is not None and len(df_fair_play):
+        positions = team_index.get_indexer(df_fair_play["team_id"].to_numpy())
+        fair_play[positions[positions >= 0]] = df_fair_play["fair_play"].to_numpy()[positions >= 0]
+
+    board = pd.DataFrame({
+        "group_name": df_teams["group_name"].to_numpy(),
+        "team_id": df_teams["team_id"].to_numpy(),
+        "team_name": df_teams["team_name"].to_numpy(),
+        "played": played,
+        "won": won,
+        "drawn": drawn,
+        "lost": played - won - drawn,
+        "goals_for": goals_for,
+        "goals_against": goals_against,
+        "goal_difference": goals_for - goals_against,
+        "points": points,
+        "h2h_points": 3 * h2h_won + h2h_drawn,
+        "h2h_goal_difference": h2h_for - h2h_against,
+        "h2h_goals_for": h2h_for,
+        "fair_play": fair_play,
+    })
+    board = board.sort_values(["group_name"] + GROUP_CRITERIA, ascending=[True] + [False] * 7 + [True],
+                              kind="mergesort", ignore_index=True)
+    board["position"] = board.groupby("group_name", sort=False).cumcount() + 1
+    # The first criterion that separates each team from the one above it
+    differs = board[GROUP_CRITERIA].ne(board[GROUP_CRITERIA].shift())
+    board["decided_by"] = np.where(board["position"] > 1, differs.idxmax(axis=1).replace("team_name", "lots"), "")
+    return board[GROUP_COLUMNS]
+
+
+@cached(_tournament_tags("Team", "Match", "Event", "Player"))
+def _group_frames(tournament_id):
+    return {"teams": read_frame(GROUP_TEAMS_SQL, (tournament_id,)),
+            "matches": read_frame(GROUP_MATCHES_SQL, (tournament_id,)),
+            "fair_play": read_frame(FAIR_PLAY_SQL, (tournament_id,))}
+
+
+@cached(_tournament_tags("Team", "Match", "Event", "Player"))
+def group_standings(tournament_id):
+    # One table for every group: position within the group, record, the
+    # tiebreak values and decided_by (the criterion that put the team below
+    # the one above it)
+    frames = _group_frames(tournament_id)
+    return group_standings_from_frames(frames["teams"], frames["matches"], frames["fair_play"])
+
+
+def group_matches(tournament_id):
+    # The group-stage fixtures (match_id, date, groups, teams, scores)
+    return _group_frames(tournament_id)["matches"].copy()
+
+
+def group_what_if(tournament_id, match_id, team1_score, team2_score):
+    # The tables of the group(s) of match_id's teams as if it had ended
+    # team1_score-team2_score, with actual_position from the real results.
+    # Nothing is written; only those groups are re-ranked, from the cached
+    # frames.
+    frames = _group_frames(tournament_id)
+    matches = frames["matches"]
+    edited = matches[matches["match_id"] == match_id]
+    if edited.empty:
+        raise ValueError(f"match {match_id} is not a group-stage match of tournament {tournament_id}")
+    teams = frames["teams"][frames["teams"]["group_name"].isin(edited[["group1", "group2"]].iloc[0])]
+    matches = matches[matches["team1_id"].isin(teams["team_id"]) | matches["team2_id"].isin(teams["team_id"])]
+    actual = group_standings_from_frames(teams, matches, frames["fair_play"])
+    matches = matches.astype({"team1_score": "float64", "team2_score": "float64"})
+    matches.loc[matches["match_id"] == match_id, ["team1_score", "team2_score"]] = [team1_score, team2_score]
+    board = group_standings_from_frames(teams, matches, frames["fair_play"])
+    board["actual_position"] = board["team_id"].map(actual.set_index("team_id")["position"])
+    return board
+
+
+# -----------------------------
+# --- Knockout Bracket --------
+# -----------------------------
+# Match.stage is free text ("Round of 16", "Quarterfinal", "Semi-final",
+# "Semifinal", "Final", ...). stage_round() maps it to the number of teams
+# left in that round (16, 8, 4, 2), or None for group and third-place
+# matches. A match is linked to the match of the next round that its winner
+# plays in, found through a (round, team_id) -> match dict, so building the
+# tree is O(matches). The team that turns up in the next round is the winner
+# (this covers penalty shoot-outs, which have no score); a drawn final goes
+# to Tournament.winner. Matches whose winner is not found start a tree of
+# their own, so incomplete data still renders.
+# The layout is cached per tournament and tagged with each of its matches
+# plus ("knockout", tournament), so editing a group match never re-renders it.
+BRACKET_MATCHES_SQL = """
+SELECT m.match_id, m.date, m.stage, m.team1_id, t1.team_name AS team1, m.team1_score,
+       m.team2_score, t2.team_name AS team2, m.team2_id
+FROM Match m
+LEFT JOIN Team t1 ON t1.team_id = m.team1_id
+LEFT JOIN Team t2 ON t2.team_id = m.team2_id
+WHERE m.tournament_id = ?
+ORDER BY m.date, m.match_id
+"""
+BRACKET_COLUMNS = ["match_id", "round", "stage", "date", "team1", "team1_score", "team2_score", "team2",
+                   "winner", "parent_id", "x", "y"]
+
+
+@functools.lru_cache(maxsize=256)
+def stage_round(stage):
+    text = re.sub(r"[^a-z0-9]", "", (stage or "").lower())
+    if text in ("final", "finals"):
+        return 2
+    if text.startswith("semi"):
+        return 4
+    if text.startswith("quarter"):
+        return 8
+    match = re.fullmatch(r"(?:roundof|last|r)(\d+)", text)
+    if match and int(match.group(1)) >= 2:
+        return int(match.group(1))
+    return None
+
+
+def round_name(teams_left):
+    return {2: "Final", 4: "Semi-final", 8: "Quarterfinal"}.get(teams_left, f"Round of {teams_left}")
+
+
+def bracket_from_frames(df_matches, champion=None):
+    # df_matches: BRACKET_MATCHES_SQL columns. Returns one row per knockout
+    # match with its winner, parent_id (the next-round match, or <NA>) and
+    # x (round column, earliest round = 0) / y (vertical slot) to draw it at
+    import pandas as pd
+    rounds = df_matches["stage"].map(stage_round)
+    ko = df_matches[rounds.notna()].assign(round=rounds[rounds.notna()].astype(int))
+    ko = ko.sort_values(["round", "date", "match_id"], ascending=[True, True, True], ignore_index=True)
+    n = len(ko)
+    round_of = ko["round"].tolist()
+    teams = list(zip(ko["team1_id"].tolist(), ko["team2_id"].tolist()))
+    names = list(zip(ko["team1"].tolist(), ko["team2"].tolist()))
+    scores = list(zip(ko["team1_score"].tolist(), ko["team2_score"].tolist()))
+
+    # (round, team) -> first match of that team in that round
+    plays_in = {}
+    for i in range(n):
+        for team in teams[i]:
+            plays_in.setdefault((round_of[i], team), i)
+
+    parent = [-1] * n
+    children = [[] for _ in range(n)]
+    winner = [None] * n
+    for i in range(n):
+        (t1, t2), (s1, s2) = teams[i], scores[i]
+        by_score = None
+        if s1 == s1 and s2 == s2 and s1 is not None and s2 is not None and s1 != s2:
+            by_score = 0 if s1 > s2 else 1
+        nxt = [plays_in.get((round_of[i] // 2, t)) for t in (t1, t2)]
+        side = by_score
+        if nxt[0] is not None and nxt[1] is None:
+            side = 0
+        elif nxt[1] is not None and nxt[0] is None:
+            side = 1
+        if side is None and round_of[i] == 2 and champion:
+            # Names are NaN/None once a team is deleted (LEFT JOIN)
+            side = next((k for k in (0, 1)
+                         if isinstance(names[i][k], str) and names[i][k].strip().lower() == champion), None)
+        if side is None:
+            continue
+        winner[i] = names[i][side] if isinstance(names[i][side], str) else None
+        p = nxt[side]
+        if p is not None and len(children[p]) < 2:
+            parent[i] = p
+            children[p].append(i)
+
+    # Leaves take the next free slot; a match sits between its feeders.
+    # The feeder of team1 is drawn above the feeder of team2.
+    columns = sorted(set(round_of), reverse=True)
+    x = {r: c for c, r in enumerate(columns)}
+    ys = [0.0] * n
+    slot = 0
+    roots = sorted((i for i in range(n) if parent[i] < 0), key=lambda i: round_of[i])
+    for root in roots:
+        stack = [(root, False)]
+        while stack:
+            i, done = stack.pop()
+            if done or not children[i]:
+                if children[i]:
+                    ys[i] = sum(ys[c] for c in children[i]) / len(children[i])
+                else:
+                    ys[i] = slot
+                    slot += 1
+                continue
+            stack.append((i, True))
+            first = teams[i][0]
+            ordered = sorted(children[i], key=lambda c: first not in teams[c])
+            stack.extend((c, False) for c in reversed(ordered))
+
+    board = pd.DataFrame({
+        "match_id": ko["match_id"],
+        "round": ko["round"],
+        "stage": [round_name(r) for r in round_of],
+        "date": ko["date"],
+        "team1": ko["team1"],
+        "team1_score": ko["team1_score"],
+        "team2_score": ko["team2_score"],
+        "team2": ko["team2"],
+        "winner": winner,
+        "parent_id": pd.array([ko["match_id"].iat[p] if p >= 0 else None for p in parent], dtype="Int64"),
+        "x": [x[r] for r in round_of],
+        "y": ys,
+    }, columns=BRACKET_COLUMNS)
+    return board.sort_values(["x", "y"], ignore_index=True)
+
+
+def bracket_tags(tournament_id):
+    # Every knockout match of the tournament, any new knockout match, its
+    # teams (names) and the Tournament row (champion)
+    rows = get_connection().execute("SELECT match_id, stage FROM Match WHERE tournament_id=?", (tournament_id,))
+    tags = {("Match", ("match", match_id)) for match_id, stage in rows if stage_round(stage) is not None}
+    return tags | {("Match", ("knockout", tournament_id)), ("Team", ("tournament", tournament_id)),
+                   ("Tournament", ("tournament", tournament_id))}
+
+
+@cached(bracket_tags)
+def knockout_bracket(tournament_id):
+    df_matches = read_frame(BRACKET_MATCHES_SQL, (tournament_id,))
+    row = get_connection().execute("SELECT lower(trim(winner)) FROM Tournament WHERE tournament_id=?",
+                                   (tournament_id,)).fetchone()
+    return bracket_from_frames(df_matches, row[0] if row else None)
+
+
+# -----------------------------
+# --- All-Time (every edition) --
+# -----------------------------
+# Teams and players get a new row in every tournament, so across editions
+# they are identified by name: lower(trim(name)) is the canonical key
+# (team_key / player_key), backed by an expression index. Every query is one
+# grouped pass over the Team/Player rows, reading the trigger-maintained
+# TeamStanding and PlayerEventCount summaries instead of Match and Event.
+
+ALL_TIME_TEAMS_SQL = """
+SELECT lower(trim(t.team_name)) AS team_key, MIN(t.team_name) AS team_name,
+       COUNT(DISTINCT t.tournament_id) AS editions,
+       COUNT(DISTINCT CASE WHEN lower(trim(tr.winner)) = lower(trim(t.team_name)) THEN t.tournament_id END) AS titles,
+       COUNT(DISTINCT CASE WHEN lower(trim(tr.runner_up)) = lower(trim(t.team_name)) THEN t.tournament_id END) AS runner_up,
+       SUM(COALESCE(s.played, 0)) AS played, SUM(COALESCE(s.won, 0)) AS won,
+       SUM(COALESCE(s.drawn, 0)) AS drawn, SUM(COALESCE(s.lost, 0)) AS lost,
+       SUM(COALESCE(s.goals_for, 0)) AS goals_for, SUM(COALESCE(s.goals_against, 0)) AS goals_against,
+       SUM(COALESCE(s.goals_for - s.goals_against, 0)) AS goal_difference,
+       SUM(COALESCE(s.points, 0)) AS points
+FROM Team t
+LEFT JOIN TeamStanding s ON s.tournament_id = t.tournament_id AND s.team_id = t.team_id
+LEFT JOIN Tournament tr ON tr.tournament_id = t.tournament_id
+GROUP BY lower(trim(t.team_name))
+ORDER BY titles DESC, points DESC, goal_difference DESC, team_name
+"""
+
+
+def all_time_teams_query(limit=None):
+    sql, params = ALL_TIME_TEAMS_SQL, []
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(int(limit))
+    return sql, params
+
+
+@cached(_all_tags("Team", "Match", "Tournament"))
+def all_time_teams(limit=None):
+    # Team records summed over every edition, with titles and final defeats
+    return read_frame(*all_time_teams_query(limit))
+
+
+# appearances: matches played by the player's team in the editions the
+# player was in the squad (there is no line-up data)
+ALL_TIME_PLAYERS_SQL = """
+SELECT lower(trim(p.player_name)) AS player_key, MIN(p.player_name) AS player_name,
+       COUNT(DISTINCT t.tournament_id) AS editions,
+       GROUP_CONCAT(DISTINCT t.team_name) AS teams,
+       SUM(COALESCE(s.played, 0)) AS appearances,
+       SUM(COALESCE((SELECT count FROM PlayerEventCount c
+                     WHERE c.player_id = p.player_id AND c.event_type = 'Goal'), 0)) AS goals,
+       SUM(COALESCE((SELECT count FROM PlayerEventCount c
+                     WHERE c.player_id = p.player_id AND c.event_type = 'Assist'), 0)) AS assists,
+       SUM(COALESCE((SELECT SUM(count) FROM PlayerEventCount c WHERE c.player_id = p.player_id), 0)) AS events
+FROM Player p
+LEFT JOIN Team t ON t.team_id = p.team_id
+LEFT JOIN TeamStanding s ON s.tournament_id = t.tournament_id AND s.team_id = t.team_id
+GROUP BY lower(trim(p.player_name))
+"""
+ALL_TIME_PLAYER_SORTS = ["goals", "assists", "events", "appearances", "editions"]
+
+
+def all_time_players_query(sort="goals", limit=None):
+    if sort not in ALL_TIME_PLAYER_SORTS:
+        raise ValueError(f"sort must be one of {', '.join(ALL_TIME_PLAYER_SORTS)}")
+    sql, params = ALL_TIME_PLAYERS_SQL + f" ORDER BY {sort} DESC, player_name", []
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(int(limit))
+    return sql, params
+
+
+@cached(_all_tags("Player", "Team", "Match", "Event"))
+def all_time_players(sort="goals", limit=None):
+    # Career totals per player name across editions
+    return read_frame(*all_time_players_query(sort, limit))
+
+
+HEAD_TO_HEAD_HISTORY_SQL = """
+SELECT m.match_id, tr.year, m.date, m.stage,
+       t1.team_name AS team1, m.team1_score, m.team2_score, t2.team_name AS team2,
+       CASE WHEN m.team1_id = ta.team_id THEN m.team1_score ELSE m.team2_score END AS goals_for,
+       CASE WHEN m.team1_id = ta.team_id THEN m.team2_score ELSE m.team1_score END AS goals_against
+FROM Team ta
+CROSS JOIN Team tb
+CROSS JOIN Match m
+JOIN Team t1 ON t1.team_id = m.team1_id
+JOIN Team t2 ON t2.team_id = m.team2_id
+LEFT JOIN Tournament tr ON tr.tournament_id = m.tournament_id
+WHERE lower(trim(ta.team_name)) = lower(trim(?1))
+  AND lower(trim(tb.team_name)) = lower(trim(?2)) AND tb.tournament_id = ta.tournament_id
+  AND ((m.team1_id = ta.team_id AND m.team2_id = tb.team_id) OR (m.team1_id = tb.team_id AND m.team2_id = ta.team_id))
+ORDER BY m.date, m.match_id
+"""
+
+
+def head_to_head_history_query(team_a, team_b):
+    return HEAD_TO_HEAD_HISTORY_SQL, (team_a, team_b)
+
+
+@cached(_all_tags("Team", "Match", "Tournament"))
+def head_to_head_history(team_a, team_b):
+    # Every meeting of two teams (by name) in any edition; goals_for and
+    # goals_against are from team_a's side. CROSS JOIN keeps SQLite on the
+    # plan "both teams per edition by name, then their matches by team id".
+    return read_frame(*head_to_head_history_query(team_a, team_b))
+
+
+def head_to_head_record(history):
+    # Won/drawn/lost and goals for team_a from a head_to_head_history() frame
+    gf = history["goals_for"].fillna(0)
+    ga = history["goals_against"].fillna(0)
+    return {"played": len(history), "won": int((gf > ga).sum()), "drawn": int((gf == ga).sum()),
+            "lost": int((gf < ga).sum()), "goals_for": int(gf.sum()), "goals_against": int(ga.sum())}
+
+
+# -----------------------------
+# --- Head-to-Head Matrix -----
+# -----------------------------
+# Dense team x team matrices (teams identified by name, as above) built from
+# one read of Match: every match is stacked as two (team, opponent) rows and
+# scattered into the matrices with np.add.at. won[i, j] is how often team i
+# beat team j, so lost is won.T and goal_difference is antisymmetric. int32
+# cells keep 3000 teams at ~36 MB per matrix.
+HEAD_TO_HEAD_METRICS = ["goal_difference", "won", "drawn", "lost", "played"]
+
+
+def _ids_filter(column, ids):
+    if ids is None:
+        return "", ()
+    return f" WHERE {column} IN ({', '.join('?' * len(ids))})", tuple(ids)
+
+
+def head_to_head_from_frames(df_teams, df_matches):
+    # df_teams: team_id, team_name
+    # df_matches: team1_id, team2_id, team1_score, team2_score
+    import numpy as np
+    import pandas as pd
+    keys = df_teams["team_name"].fillna("").str.strip().str.lower()
+    team_codes, key_names = pd.factorize(keys, sort=True)
+    names = df_teams.groupby(team_codes)["team_name"].first().reindex(range(len(key_names)))
+    n = len(key_names)
+
+    positions = pd.Index(df_teams["team_id"].to_numpy())
+    p1 = positions.get_indexer(df_matches["team1_id"].to_numpy())
+    p2 = positions.get_indexer(df_matches["team2_id"].to_numpy())
+    # Skip matches whose teams are not loaded and matches not played yet
+    played = (df_matches["team1_score"].notna() & df_matches["team2_score"].notna()).to_numpy()
+    keep = (p1 >= 0) & (p2 >= 0) & played
+    c1, c2 = team_codes[p1[keep]], team_codes[p2[keep]]
+    s1 = df_matches["team1_score"].fillna(0).to_numpy(dtype=np.int32)[keep]
+    s2 = df_matches["team2_score"].fillna(0).to_numpy(dtype=np.int32)[keep]
+
+    team = np.concatenate([c1, c2])
+    opponent = np.concatenate([c2, c1])
+    margin = np.concatenate([s1 - s2, s2 - s1])
+    won = np.zeros((n, n), dtype=np.int32)
+    drawn = np.zeros((n, n), dtype=np.int32)
+    goal_difference = np.zeros((n, n), dtype=np.int32)
+    np.add.at(won, (team[margin > 0], opponent[margin > 0]), 1)
+    np.add.at(drawn, (team[margin == 0], opponent[margin == 0]), 1)
+    np.add.at(goal_difference, (team, opponent), margin)
+    lost = won.T
+    result = {"teams": names.tolist(), "won": won, "drawn": drawn, "lost": lost,
+              "goal_difference": goal_difference, "played": won + drawn + lost}
+    for matrix in result.values():
+        if isinstance(matrix, np.ndarray):
+            matrix.flags.writeable = False   # shared by every cache hit
+    return result
+
+
+@cached(lambda tournament_ids=None: ({("Team", ALL), ("Match", ALL)} if tournament_ids is None else
+                                     {(t, ("tournament", i)) for t in ("Team", "Match") for i in tournament_ids}))
+def _head_to_head(tournament_ids=None):
+    where, params = _ids_filter("tournament_id", tournament_ids)
+    df_teams = read_frame("SELECT team_id, team_name FROM Team" + where, params)
+    df_matches = read_frame("SELECT team1_id, team2_id, team1_score, team2_score FROM Match" + where, params)
+    return head_to_head_from_frames(df_teams, df_matches)
+
+
+def head_to_head(tournament_ids=None):
+    # {"teams": [names], "won"/"drawn"/"lost"/"goal_difference"/"played": n x n
+    # read-only int32 arrays}, over the given tournaments or all of them
+    if tournament_ids is not None:
+        tournament_ids = tuple(sorted(set(tournament_ids)))
+    return _head_to_head(tournament_ids)
+
+
+def head_to_head_pairs(matrices):
+    # Long form for export: (team, opponent, played, won, drawn, lost,
+    # goal_difference) for every pair that met
+    import numpy as np
+    teams = matrices["teams"]
+    rows_i, cols_j = np.nonzero(matrices["played"])
+    columns = ["team", "opponent", "played", "won", "drawn", "lost", "goal_difference"]
+    rows = [(teams[i], teams[j]) + tuple(int(matrices[m][i, j]) for m in columns[2:])
+            for i, j in zip(rows_i.tolist(), cols_j.tolist())]
+    return columns, rows
@@ -1,441 +1,410 @@
 import os
+import json
+import time
 import tkinter as tk
-from tkinter import ttk, messagebox, simpledialog
-import sqlite3
-import pandas as pd
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-
-# -------------------------
-# --- Database Init -------
-# -------------------------
-def get_connection():
-    conn = sqlite3.connect("tournament.db")
-    return conn
-
-def init_db():
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("PRAGMA foreign_keys = ON;")
-    
-    cursor.execute("""
-    CREATE TABLE IF NOT EXISTS Tournament (
-        tournament_id INTEGER PRIMARY KEY AUTOINCREMENT,
-        year INTEGER,
-        host_country TEXT,
-        winner TEXT,
-        runner_up TEXT
-    )
-    """)
-    cursor.execute("""
-    CREATE TABLE IF NOT EXISTS Team (
-        team_id INTEGER PRIMARY KEY AUTOINCREMENT,
-        team_name TEXT,
-        coach_name TEXT,
-        group_name TEXT,
-        tournament_id INTEGER,
-        FOREIGN KEY (tournament_id) REFERENCES Tournament(tournament_id)
-    )
-    """)
-    cursor.execute("""
-    CREATE TABLE IF NOT EXISTS Player (
-        player_id INTEGER PRIMARY KEY AUTOINCREMENT,
-        player_name TEXT,
-        position TEXT,
-        team_id INTEGER,
-        FOREIGN KEY (team_id) REFERENCES Team(team_id)
-    )
-    """)
-    cursor.execute("""
-    CREATE TABLE IF NOT EXISTS Match (
-        match_id INTEGER PRIMARY KEY AUTOINCREMENT,
-        date TEXT,
-        stage TEXT,
-        team1_id INTEGER,
-        team2_id INTEGER,
-        team1_score INTEGER,
-        team2_score INTEGER,
-        tournament_id INTEGER,
-        FOREIGN KEY (team1_id) REFERENCES Team(team_id),
-        FOREIGN KEY (team2_id) REFERENCES Team(team_id),
-        FOREIGN KEY (tournament_id) REFERENCES Tournament(tournament_id)
-    )
-    """)
-    cursor.execute("""
-    CREATE TABLE IF NOT EXISTS Event (
-        event_id INTEGER PRIMARY KEY AUTOINCREMENT,
-        match_id INTEGER,
-        player_id INTEGER,
-        minute INTEGER,
-        event_type TEXT,
-        FOREIGN KEY (match_id) REFERENCES Match(match_id),
-        FOREIGN KEY (player_id) REFERENCES Player(player_id)
-    )
-    """)
-    conn.commit()
-    conn.close()
-
-# -------------------------
-# --- Database CRUD -------
-# -------------------------
-# Tournament CRUD
-def add_tournament(year, host_country, winner=None, runner_up=None):
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("INSERT INTO Tournament (year, host_country, winner, runner_up) VALUES (?, ?, ?, ?)",
-                   (year, host_country, winner, runner_up))
-    tid = cursor.lastrowid
-    conn.commit()
-    conn.close()
-    return tid
-
-def view_tournaments():
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM Tournament")
-    data = cursor.fetchall()
-    conn.close()
-    return data
-
-def edit_tournament(tid, year=None, host_country=None, winner=None, runner_up=None):
-    conn = get_connection()
-    cursor = conn.cursor()
-    updates, values = [], []
-    if year is not None: updates.append("year=?"); values.append(year)
-    if host_country: updates.append("host_country=?"); values.append(host_country)
-    if winner: updates.append("winner=?"); values.append(winner)
-    if runner_up: updates.append("runner_up=?"); values.append(runner_up)
-    values.append(tid)
-    cursor.execute(f"UPDATE Tournament SET {', '.join(updates)} WHERE tournament_id=?", values)
-    conn.commit()
-    conn.close()
-
-def delete_tournament(tid):
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM Tournament WHERE tournament_id=?", (tid,))
-    conn.commit()
-    conn.close()
-
-# Team CRUD
-def add_team(team_name, coach_name, group_name, tournament_id):
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("INSERT INTO Team (team_name, coach_name, group_name, tournament_id) VALUES (?, ?, ?, ?)",
-                   (team_name, coach_name, group_name, tournament_id))
-    tid = cursor.lastrowid
-    conn.commit()
-    conn.close()
-    return tid
-
-def view_teams(tournament_id=None):
-    conn = get_connection()
-    cursor = conn.cursor()
-    if tournament_id:
-        cursor.execute("SELECT * FROM Team WHERE tournament_id=?", (tournament_id,))
-    else:
-        cursor.execute("SELECT * FROM Team")
-    data = cursor.fetchall()
-    conn.close()
-    return data
-
-def edit_team(team_id, team_name=None, coach_name=None, group_name=None):
-    conn = get_connection()
-    cursor = conn.cursor()
-    updates, values = [], []
-    if team_name: updates.append("team_name=?"); values.append(team_name)
-    if coach_name: updates.append("coach_name=?"); values.append(coach_name)
-    if group_name: updates.append("group_name=?"); values.append(group_name)
-    values.append(team_id)
-    cursor.execute(f"UPDATE Team SET {', '.join(updates)} WHERE team_id=?", values)
-    conn.commit()
-    conn.close()
-
-def delete_team(team_id):
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM Team WHERE team_id=?", (team_id,))
-    conn.commit()
-    conn.close()
-
-# Player CRUD
-def add_player(player_name, position, team_id):
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("INSERT INTO Player (player_name, position, team_id) VALUES (?, ?, ?)",
-                   (player_name, position, team_id))
-    pid = cursor.lastrowid
-    conn.commit()
-    conn.close()
-    return pid
-
-def view_players(team_id=None):
-    conn = get_connection()
-    cursor = conn.cursor()
-    if team_id:
-        cursor.execute("SELECT * FROM Player WHERE team_id=?", (team_id,))
-    else:
-        cursor.execute("SELECT * FROM Player")
-    data = cursor.fetchall()
-    conn.close()
-    return data
-
-def edit_player(player_id, player_name=None, position=None):
-    conn = get_connection()
-    cursor = conn.cursor()
-    updates, values = [], []
-    if player_name: updates.append("player_name=?"); values.append(player_name)
-    if position: updates.append("position=?"); values.append(position)
-    values.append(player_id)
-    cursor.execute(f"UPDATE Player SET {', '.join(updates)} WHERE player_id=?", values)
-    conn.commit()
-    conn.close()
-
-def delete_player(player_id):
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM Player WHERE player_id=?", (player_id,))
-    conn.commit()
-    conn.close()
-
-# Match CRUD
-def add_match(date, stage, team1_id, team2_id, team1_score, team2_score, tournament_id):
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("INSERT INTO Match (date, stage, team1_id, team2_id, team1_score, team2_score, tournament_id) VALUES (?, ?, ?, ?, ?, ?, ?)",
-                   (date, stage, team1_id, team2_id, team1_score, team2_score, tournament_id))
-    mid = cursor.lastrowid
-    conn.commit()
-    conn.close()
-    return mid
-
-def view_matches(tournament_id=None):
-    conn = get_connection()
-    cursor = conn.cursor()
-    if tournament_id:
-        cursor.execute("SELECT * FROM Match WHERE tournament_id=?", (tournament_id,))
-    else:
-        cursor.execute("SELECT * FROM Match")
-    data = cursor.fetchall()
-    conn.close()
-    return data
-
-def edit_match(match_id, date=None, stage=None, team1_score=None, team2_score=None):
-    conn = get_connection()
-    cursor = conn.cursor()
-    updates, values = [], []
-    if date: updates.append("date=?"); values.append(date)
-    if stage: updates.append("stage=?"); values.append(stage)
-    if team1_score is not None: updates.append("team1_score=?"); values.append(team1_score)
-    if team2_score is not None: updates.append("team2_score=?"); values.append(team2_score)
-    values.append(match_id)
-    cursor.execute(f"UPDATE Match SET {', '.join(updates)} WHERE match_id=?", values)
-    conn.commit()
-    conn.close()
-
-def delete_match(match_id):
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM Match WHERE match_id=?", (match_id,))
-    conn.commit()
-    conn.close()
-
-# Event CRUD
-def add_event(match_id, player_id, minute, event_type):
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("INSERT INTO Event (match_id, player_id, minute, event_type) VALUES (?, ?, ?, ?)",
-                   (match_id, player_id, minute, event_type))
-    eid = cursor.lastrowid
-    conn.commit()
-    conn.close()
-    return eid
-
-def view_events(match_id=None):
-    conn = get_connection()
-    cursor = conn.cursor()
-    if match_id:
-        cursor.execute("SELECT * FROM Event WHERE match_id=?", (match_id,))
-    else:
-        cursor.execute("SELECT * FROM Event")
-    data = cursor.fetchall()
-    conn.close()
-    return data
-
-def edit_event(event_id, minute=None, event_type=None):
-    conn = get_connection()
-    cursor = conn.cursor()
-    updates, values = [], []
-    if minute is not None: updates.append("minute=?"); values.append(minute)
-    if event_type: updates.append("event_type=?"); values.append(event_type)
-    values.append(event_id)
-    cursor.execute(f"UPDATE Event SET {', '.join(updates)} WHERE event_id=?", values)
-    conn.commit()
-    conn.close()
-
-def delete_event(event_id):
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM Event WHERE event_id=?", (event_id,))
-    conn.commit()
-    conn.close()
+from tkinter import ttk, messagebox, simpledialog, filedialog
+from db import (close_all_connections, rebuild_summaries, clear_query_log,
+                slowest_queries, frequent_queries, QUERY_SUMMARY_COLUMNS)
+from crud import (add_tournament, edit_tournament, delete_tournament,
+                  add_team, edit_team, delete_team,
+                  add_player, edit_player, delete_player,
+                  add_match, edit_match, delete_match,
+                  add_event, edit_event, delete_event, view_page)
+from seed import ensure_seeded_db, restore_seed_snapshot
+from analysis import (compute_leaderboard, top_scorers, match_timeline, tournament_goals,
+                      cache_info, clear_cache, all_time_teams, all_time_players,
+                      ALL_TIME_PLAYER_SORTS, head_to_head_history, head_to_head_record,
+                      head_to_head, HEAD_TO_HEAD_METRICS, group_standings, group_matches, group_what_if,
+                      knockout_bracket, bracket_tags, cached_figure)
+from jobs import JobRunner
+from widgets import PagedTable
+from simulate import tournament_forecast
+from ratings import current_ratings, rating_history
+from transfer import export_database, import_database, publish_reset, FORMATS
+from search import search, search_index_pending, update_search_index, SEARCH_KINDS
+
+# pandas and matplotlib are imported on first use inside the analysis
+# functions below, so the main window does not wait for them.
 
+# -----------------------------
+# --- Startup Timing ----------
+# -----------------------------
+# When TOURNAMENT_STARTUP_REPORT names a file, wall-clock timestamps of the
+# startup phases are written there as JSON and the app exits right after the
+# tournament table is populated (used by `python benchmark.py startup`).
+STARTUP_REPORT = os.environ.get("TOURNAMENT_STARTUP_REPORT")
+startup_marks = {}
+
+def mark_startup(phase):
+    if STARTUP_REPORT:
+        startup_marks[phase] = time.time()
+
+def finish_startup_report():
+    if not STARTUP_REPORT:
+        return
+    with open(STARTUP_REPORT, "w") as f:
+        json.dump(startup_marks, f)
+    root.after(0, root.destroy)
 
+mark_startup("imported")
 
 # -----------------------------
 # --- Analysis / Visualize ----
 # -----------------------------
+# Each form parses its inputs on the Tk thread, then hands the query, pandas
+# work and figure building to the background job runner (see jobs.py). Only
+# the Treeview and the canvas are created back on the Tk thread.
+
+def run_in_background(form, key, compute, render):
+    # Show a busy bar + Cancel button in the form while compute() runs.
+    # Clicking Generate again for the same key is ignored until it finishes.
+    if jobs.is_running(key):
+        return
+    busy = tk.Frame(form)
+    bar = ttk.Progressbar(busy, mode="indeterminate", length=150)
+    bar.pack(side=tk.LEFT, padx=5)
+
+    def finish():
+        if busy.winfo_exists():
+            bar.stop()
+            busy.destroy()
+
+    def cancel():
+        jobs.cancel(key)
+        finish()
+
+    def on_done(result):
+        finish()
+        render(result)
+
+    def on_error(e):
+        finish()
+        messagebox.showerror("Error", f"Analysis failed:\n{e}")
+
+    tk.Button(busy, text="Cancel", command=cancel).pack(side=tk.LEFT, padx=5)
+    busy.pack(pady=5)
+    bar.start(10)
+    jobs.submit(key, compute, on_done, on_error)
+
+
+def new_figure(figsize):
+    from matplotlib.figure import Figure
+    return Figure(figsize=figsize)
+
+
+def show_figure(fig, master):
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+    canvas = FigureCanvasTkAgg(fig, master=master)
+    canvas.draw()
+    canvas.get_tk_widget().pack()
+
+
+def show_dataframe(df, master):
+    # Treeview with one column per DataFrame column
+    columns = list(df.columns)
+    tree = ttk.Treeview(master, columns=columns, show="headings")
+    for col in columns:
+        tree.heading(col, text=col.replace("_", " ").title())
+        tree.column(col, width=90)
+    tree.pack(fill=tk.BOTH, expand=True)
+    for row in df.itertuples(index=False):
+        tree.insert("", "end", values=["" if v is None else v for v in row])
+    return tree
+
+
+# Recompute the TeamStanding and PlayerEventCount summaries (recovery)
+def rebuild_standings():
+    rebuild_summaries()
+    messagebox.showinfo("Success", "Team standings and player event counts rebuilt")
+
 
 # Leaderboard per Tournament (Bar chart)
+def leaderboard_figure(board):
+    names = board['team_name'].tolist()
+    fig = new_figure((6,4))
+    ax = fig.add_subplot()
+    ax.bar(names, board['points'].tolist(), color='skyblue')
+    ax.set_ylabel("Points")
+    ax.set_title("Leaderboard")
+    ax.set_xticks(range(len(names)))
+    ax.set_xticklabels(names, rotation=45, ha='right')
+    fig.tight_layout()
+    return fig
+
 def leaderboard_form():
+    def compute(tid):
+        board = compute_leaderboard(tid)
+        return board, leaderboard_figure(board)
+
+    def render(result):
+        board, fig = result
+        table_win = tk.Toplevel(root)
+        table_win.title("Leaderboard")
+        columns = ("Team", "P", "W", "D", "L", "GF", "GA", "GD", "Points")
+        tree = ttk.Treeview(table_win, columns=columns, show="headings")
+        for col in columns: tree.heading(col, text=col)
+        tree.pack(fill=tk.BOTH, expand=True)
+
+        for row in board.itertuples(index=False):
+            tree.insert("", "end", values=(row.team_name, row.played, row.won, row.drawn, row.lost,
+                                           row.goals_for, row.goals_against, row.goal_difference, row.points))
+        show_figure(fig, table_win)
+
     def generate():
         tid = tid_entry.get()
         if not tid:
             messagebox.showerror("Error", "Tournament ID required")
             return
         tid = int(tid)
+        run_in_background(form, ("leaderboard", tid), lambda: compute(tid), render)
+
+    form = tk.Toplevel(root)
+    form.title("Leaderboard")
+    tk.Label(form, text="Tournament ID:").pack(pady=5)
+    tid_entry = tk.Entry(form)
+    tid_entry.pack(pady=5)
+    tk.Button(form, text="Generate Leaderboard", command=generate).pack(pady=10)
 
-        conn = sqlite3.connect("tournament.db")
-        df_matches = pd.read_sql_query(f"SELECT * FROM Match WHERE tournament_id={tid}", conn)
-        df_teams = pd.read_sql_query(f"SELECT * FROM Team WHERE tournament_id={tid}", conn)
-        conn.close()
 
-        points = {team_id:0 for team_id in df_teams['team_id']}
-        goals_for = {team_id:0 for team_id in df_teams['team_id']}
-        goals_against = {team_id:0 for team_id in df_teams['team_id']}
+# Group Standings (FIFA tiebreakers) with a what-if score editor
+GROUP_TABLE_COLUMNS = ["group_name", "position", "team_name", "played", "won", "drawn", "lost",
+                       "goals_for", "goals_against", "goal_difference", "points", "decided_by"]
 
-        for _, row in df_matches.iterrows():
-            t1, t2 = row['team1_id'], row['team2_id']
-            s1, s2 = row['team1_score'], row['team2_score']
-            goals_for[t1] += s1; goals_for[t2] += s2
-            goals_against[t1] += s2; goals_against[t2] += s1
-            if s1 > s2: points[t1] += 3
-            elif s1 < s2: points[t2] += 3
-            else: points[t1] += 1; points[t2] += 1
+def group_standings_form():
+    def compute(tid):
+        return group_standings(tid), group_matches(tid)
 
+    def render(result, tid):
+        board, fixtures = result
+        if board.empty:
+            messagebox.showinfo("Info", "No teams with a group in this tournament")
+            return
         table_win = tk.Toplevel(root)
-        table_win.title("Leaderboard")
-        tree = ttk.Treeview(table_win, columns=("Team", "Points", "GF", "GA"), show="headings")
-        for col in ["Team", "Points", "GF", "GA"]: tree.heading(col, text=col)
-        tree.pack(fill=tk.BOTH, expand=True)
+        table_win.title(f"Group Standings - Tournament {tid}")
+        table_win.geometry("1000x650")
+        show_dataframe(board[GROUP_TABLE_COLUMNS], table_win)
+
+        # What-if: re-rank a match's group(s) with another score, nothing saved
+        what_if = tk.LabelFrame(table_win, text="What if...")
+        what_if.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        labels = {f"{r.match_id}: {r.team1} {_score(r.team1_score)}-{_score(r.team2_score)} {r.team2}": r.match_id
+                  for r in fixtures.itertuples(index=False)}
+        controls = tk.Frame(what_if)
+        controls.pack(pady=5)
+        match_entry = ttk.Combobox(controls, values=list(labels), state="readonly", width=45)
+        match_entry.pack(side=tk.LEFT, padx=5)
+        score1_entry = tk.Entry(controls, width=4)
+        score1_entry.pack(side=tk.LEFT)
+        tk.Label(controls, text="-").pack(side=tk.LEFT)
+        score2_entry = tk.Entry(controls, width=4)
+        score2_entry.pack(side=tk.LEFT)
+        results = tk.Frame(what_if)
+        results.pack(fill=tk.BOTH, expand=True)
+
+        def show(board):
+            for child in results.winfo_children():
+                child.destroy()
+            show_dataframe(board[GROUP_TABLE_COLUMNS + ["actual_position"]], results)
+
+        def recompute():
+            try:
+                match_id = labels[match_entry.get()]
+                s1, s2 = int(score1_entry.get()), int(score2_entry.get())
+            except (KeyError, ValueError):
+                messagebox.showerror("Error", "Pick a match and enter both scores")
+                return
+            run_in_background(what_if, ("group_what_if", tid, match_id, s1, s2),
+                              lambda: group_what_if(tid, match_id, s1, s2), show)
+
+        tk.Button(controls, text="Recompute", command=recompute).pack(side=tk.LEFT, padx=5)
 
-        names, pts = [], []
-        for tid_team, team_name in zip(df_teams['team_id'], df_teams['team_name']):
-            tree.insert("", "end", values=(team_name, points[tid_team], goals_for[tid_team], goals_against[tid_team]))
-            names.append(team_name)
-            pts.append(points[tid_team])
-
-        # Bar chart
-        fig, ax = plt.subplots(figsize=(6,4))
-        ax.bar(names, pts, color='skyblue')
-        ax.set_ylabel("Points")
-        ax.set_title("Leaderboard")
-        ax.set_xticks(range(len(names)))
-        ax.set_xticklabels(names, rotation=45, ha='right')
-        canvas = FigureCanvasTkAgg(fig, master=table_win)
-        canvas.draw()
-        canvas.get_tk_widget().pack()
+    def generate():
+        tid = tid_entry.get()
+        if not tid:
+            messagebox.showerror("Error", "Tournament ID required")
+            return
+        tid = int(tid)
+        run_in_background(form, ("group_standings", tid), lambda: compute(tid), lambda result: render(result, tid))
 
     form = tk.Toplevel(root)
-    form.title("Leaderboard")
+    form.title("Group Standings")
     tk.Label(form, text="Tournament ID:").pack(pady=5)
     tid_entry = tk.Entry(form)
     tid_entry.pack(pady=5)
-    tk.Button(form, text="Generate Leaderboard", command=generate).pack(pady=10)
-
+    tk.Button(form, text="Generate Group Tables", command=generate).pack(pady=10)
+
+def _score(value):
+    return "" if value is None or value != value else int(value)   # NaN = not played
+
+
+# Knockout Bracket (drawn from the cached layout, see analysis.knockout_bracket)
+def bracket_figure(bracket):
+    from matplotlib.collections import LineCollection
+    leaves = max(int(bracket['y'].max()) + 1, 1)
+    rounds = int(bracket['x'].max()) + 1
+    fig = new_figure((max(6, 2.4 * rounds), min(max(5, 0.3 * leaves), 20)))
+    ax = fig.add_subplot()
+    font = max(3, min(9, 400 / leaves))   # beyond ~130 leaves, zoom in with the toolbar
+    for row in bracket.itertuples(index=False):
+        team1, team2 = (name if isinstance(name, str) else "?" for name in (row.team1, row.team2))
+        ax.text(row.x, row.y, f"{team1} {_score(row.team1_score)}\n{team2} {_score(row.team2_score)}",
+                fontsize=font, ha='center', va='center', bbox=dict(boxstyle='round', fc='lightyellow', ec='gray'))
+    # Elbow connector from every match to the next-round match it feeds
+    edges = bracket.dropna(subset=['parent_id']).merge(
+        bracket[['match_id', 'x', 'y']], left_on='parent_id', right_on='match_id', suffixes=('', '_parent'))
+    lines = [[(x, y), ((x + px) / 2, y), ((x + px) / 2, py), (px, py)]
+             for x, y, px, py in zip(edges['x'], edges['y'], edges['x_parent'], edges['y_parent'])]
+    ax.add_collection(LineCollection(lines, colors='gray', linewidths=0.8, zorder=0))
+    stages = bracket.drop_duplicates('x').sort_values('x')
+    ax.set_xticks(stages['x'].tolist())
+    ax.set_xticklabels(stages['stage'].tolist())
+    ax.set_xlim(-0.6, rounds - 0.4)
+    ax.set_ylim(leaves - 0.5, -0.5)
+    ax.set_yticks([])
+    ax.set_title(f"Knockout Bracket ({len(bracket)} matches)")
+    fig.tight_layout()
+    return fig
+
+# The drawn figure is cached under the same tags as the layout, so reopening
+# an unchanged bracket skips building its artists
+@cached_figure(bracket_tags)
+def knockout_bracket_figure(tournament_id):
+    bracket = knockout_bracket(tournament_id)
+    return bracket_figure(bracket) if not bracket.empty else None
+
+def bracket_form():
+    def render(fig):
+        if fig is None:
+            messagebox.showinfo("Info", "No knockout matches in this tournament")
+            return
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+        table_win = tk.Toplevel(root)
+        table_win.title("Knockout Bracket")
+        canvas = FigureCanvasTkAgg(fig, master=table_win)
+        canvas.draw()
+        # Zoom/pan for large brackets
+        NavigationToolbar2Tk(canvas, table_win).update()
+        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
 
-# Top Players per Tournament (Pie chart)
-def top_players_form():
     def generate():
         tid = tid_entry.get()
         if not tid:
             messagebox.showerror("Error", "Tournament ID required")
             return
         tid = int(tid)
+        run_in_background(form, ("bracket", tid), lambda: knockout_bracket_figure(tid), render)
+
+    form = tk.Toplevel(root)
+    form.title("Knockout Bracket")
+    tk.Label(form, text="Tournament ID:").pack(pady=5)
+    tid_entry = tk.Entry(form)
+    tid_entry.pack(pady=5)
+    tk.Button(form, text="Draw Bracket", command=generate).pack(pady=10)
 
-        conn = sqlite3.connect("tournament.db")
-        df_matches = pd.read_sql_query(f"SELECT match_id FROM Match WHERE tournament_id={tid}", conn)
-        match_ids = df_matches['match_id'].tolist()
-        if not match_ids:
-            messagebox.showinfo("Info", "No matches found")
-            conn.close()
-            return
-        match_ids_str = ",".join(map(str, match_ids))
-        df_events = pd.read_sql_query(f"SELECT * FROM Event WHERE match_id IN ({match_ids_str}) AND event_type='Goal'", conn)
-        df_players = pd.read_sql_query("SELECT * FROM Player", conn)
-        conn.close()
 
-        goal_counts = df_events['player_id'].value_counts().to_dict()
+# Top Players per Tournament (Pie chart)
+def top_players_figure(df_top, event_type):
+    fig = new_figure((6,6))
+    ax = fig.add_subplot()
+    ax.pie(df_top['count'].tolist(), labels=df_top['player_name'].tolist(), autopct='%1.1f%%', startangle=140)
+    ax.set_title(f"Top Players ({event_type})")
+    return fig
+
+def top_players_form():
+    def compute(tid, event_type, limit):
+        df_top = top_scorers(tid, event_type, limit)
+        fig = top_players_figure(df_top, event_type) if not df_top.empty else None
+        return df_top, fig
+
+    def render(result, event_type):
+        df_top, fig = result
+        if df_top.empty:
+            messagebox.showinfo("Info", f"No {event_type} events found")
+            return
 
         table_win = tk.Toplevel(root)
         table_win.title("Top Players")
-        tree = ttk.Treeview(table_win, columns=("Player", "Goals"), show="headings")
+        tree = ttk.Treeview(table_win, columns=("Player", "Team", "Count"), show="headings")
         tree.heading("Player", text="Player")
-        tree.heading("Goals", text="Goals")
+        tree.heading("Team", text="Team")
+        tree.heading("Count", text=event_type)
         tree.pack(fill=tk.BOTH, expand=True)
 
-        labels, goals = [], []
-        for pid, count in goal_counts.items():
-            name = df_players[df_players['player_id']==pid]['player_name'].values[0]
-            tree.insert("", "end", values=(name, count))
-            labels.append(name)
-            goals.append(count)
-
-        # Pie chart
-        fig, ax = plt.subplots(figsize=(6,6))
-        ax.pie(goals, labels=labels, autopct='%1.1f%%', startangle=140)
-        ax.set_title("Top Goal Scorers")
-        canvas = FigureCanvasTkAgg(fig, master=table_win)
-        canvas.draw()
-        canvas.get_tk_widget().pack()
+        for row in df_top.itertuples(index=False):
+            tree.insert("", "end", values=(row.player_name, row.team_name, row.count))
+        show_figure(fig, table_win)
+
+    def generate():
+        tid = tid_entry.get()
+        if not tid:
+            messagebox.showerror("Error", "Tournament ID required")
+            return
+        tid = int(tid)
+        event_type = type_entry.get() or "Goal"
+        limit = int(limit_entry.get()) if limit_entry.get() else None
+        run_in_background(form, ("top_players", tid, event_type, limit),
+                          lambda: compute(tid, event_type, limit),
+                          lambda result: render(result, event_type))
 
     form = tk.Toplevel(root)
     form.title("Top Players")
     tk.Label(form, text="Tournament ID:").pack(pady=5)
     tid_entry = tk.Entry(form)
     tid_entry.pack(pady=5)
+    tk.Label(form, text="Event Type:").pack(pady=5)
+    type_entry = ttk.Combobox(form, values=["Goal", "Assist", "Save", "Shot on target"])
+    type_entry.set("Goal")
+    type_entry.pack(pady=5)
+    tk.Label(form, text="Top N (blank = all):").pack(pady=5)
+    limit_entry = tk.Entry(form)
+    limit_entry.pack(pady=5)
     tk.Button(form, text="Show Top Players", command=generate).pack(pady=10)
 
 
 # Match Key Events by Match ID (Scatter plot)
-def match_events_form():
-    def generate():
-        mid = mid_entry.get()
-        if not mid:
-            messagebox.showerror("Error", "Match ID required")
-            return
-        mid = int(mid)
-
-        conn = sqlite3.connect("tournament.db")
-        df_events = pd.read_sql_query(f"SELECT * FROM Event WHERE match_id={mid}", conn)
-        df_players = pd.read_sql_query("SELECT * FROM Player", conn)
-        conn.close()
+def match_events_figure(df_events):
+    # One scatter call per event type, players on the x axis
+    import pandas as pd
+    fig = new_figure((8,4))
+    ax = fig.add_subplot()
+    colors = {'Goal':'green','Save':'red','Assist':'blue','Shot on target':'orange'}
+    x, player_names = pd.factorize(df_events['player_name'].fillna('Unknown'))
+    minutes = df_events['minute'].to_numpy()
+    for event_type, idx in df_events.groupby('event_type', sort=False).indices.items():
+        ax.scatter(x[idx], minutes[idx], color=colors.get(event_type,'black'), s=100, label=event_type)
+    ax.set_ylabel("Minute")
+    ax.set_xlabel("Player")
+    ax.set_title("Match Key Events")
+    if len(df_events): ax.legend()
+    ax.set_xticks(range(len(player_names)))
+    ax.set_xticklabels(player_names, rotation=45, ha='right')
+    fig.tight_layout()
+    return fig
 
-        df_events['player_name'] = df_events['player_id'].apply(lambda x: df_players[df_players['player_id']==x]['player_name'].values[0])
+def match_events_form():
+    def compute(mid):
+        df_events = match_timeline(mid)
+        return df_events, match_events_figure(df_events)
 
+    def render(result):
+        df_events, fig = result
         table_win = tk.Toplevel(root)
         table_win.title("Match Key Events")
         tree = ttk.Treeview(table_win, columns=("Minute", "Player", "Event"), show="headings")
         for col in ["Minute", "Player", "Event"]: tree.heading(col, text=col)
         tree.pack(fill=tk.BOTH, expand=True)
 
-        for _, row in df_events.iterrows():
-            tree.insert("", "end", values=(row['minute'], row['player_name'], row['event_type']))
-
-        # Scatter plot
-        fig, ax = plt.subplots(figsize=(8,4))
-        colors = {'Goal':'green','Save':'red','Assist':'blue','Shot on target':'orange'}
-        for _, row in df_events.iterrows():
-            ax.scatter(row['player_name'], row['minute'], color=colors.get(row['event_type'],'black'), s=100, label=row['event_type'])
-        ax.set_ylabel("Minute")
-        ax.set_xlabel("Player")
-        ax.set_title("Match Key Events")
-        ax.legend(colors.keys())
-        ax.set_xticks(range(len(df_events['player_name'])))
-        ax.set_xticklabels(df_events['player_name'], rotation=45, ha='right')
-        canvas = FigureCanvasTkAgg(fig, master=table_win)
-        canvas.draw()
-        canvas.get_tk_widget().pack()
+        for row in df_events.itertuples(index=False):
+            tree.insert("", "end", values=(row.minute, row.player_name, row.event_type))
+        show_figure(fig, table_win)
+
+    def generate():
+        mid = mid_entry.get()
+        if not mid:
+            messagebox.showerror("Error", "Match ID required")
+            return
+        mid = int(mid)
+        run_in_background(form, ("match_events", mid), lambda: compute(mid), render)
 
     form = tk.Toplevel(root)
     form.title("Match Key Events")
@@ -446,61 +415,447 @@ def match_events_form():
 
 
 # Tournament Trends (Total Goals per Team)
+def tournament_trends_figure(df_goals):
+    names = df_goals['team_name'].tolist()
+    fig = new_figure((6,4))
+    ax = fig.add_subplot()
+    ax.bar(names, df_goals['goals'].tolist(), color='purple')
+    ax.set_ylabel("Goals")
+    ax.set_title("Goals per Team in Tournament")
+    ax.set_xticks(range(len(names)))
+    ax.set_xticklabels(names, rotation=45, ha='right')
+    fig.tight_layout()
+    return fig
+
 def tournament_trends_form():
+    def compute(tid):
+        df_goals = tournament_goals(tid)
+        return df_goals, tournament_trends_figure(df_goals)
+
+    def render(result):
+        df_goals, fig = result
+        table_win = tk.Toplevel(root)
+        table_win.title("Tournament Trends")
+        tree = ttk.Treeview(table_win, columns=("Team", "Goals"), show="headings")
+        tree.heading("Team", text="Team")
+        tree.heading("Goals", text="Goals")
+        tree.pack(fill=tk.BOTH, expand=True)
+
+        for row in df_goals.itertuples(index=False):
+            tree.insert("", "end", values=(row.team_name, row.goals))
+        show_figure(fig, table_win)
+
     def generate():
         tid = tid_entry.get()
         if not tid:
             messagebox.showerror("Error", "Tournament ID required")
             return
         tid = int(tid)
+        run_in_background(form, ("tournament_trends", tid), lambda: compute(tid), render)
+
+    form = tk.Toplevel(root)
+    form.title("Tournament Trends")
+    tk.Label(form, text="Tournament ID:").pack(pady=5)
+    tid_entry = tk.Entry(form)
+    tid_entry.pack(pady=5)
+    tk.Button(form, text="Generate Tournament Trends", command=generate).pack(pady=10)
+
+# All-Time Teams (every edition, by team name)
+def all_time_teams_form():
+    def render(board):
+        table_win = tk.Toplevel(root)
+        table_win.title("All-Time Teams")
+        table_win.geometry("1000x400")
+        show_dataframe(board.drop(columns=["team_key"]), table_win)
 
-        conn = sqlite3.connect("tournament.db")
-        df_matches = pd.read_sql_query(f"SELECT * FROM Match WHERE tournament_id={tid}", conn)
-        df_teams = pd.read_sql_query(f"SELECT * FROM Team WHERE tournament_id={tid}", conn)
-        conn.close()
+    def generate():
+        limit = int(limit_entry.get()) if limit_entry.get() else None
+        run_in_background(form, ("all_time_teams", limit), lambda: all_time_teams(limit), render)
+
+    form = tk.Toplevel(root)
+    form.title("All-Time Teams")
+    tk.Label(form, text="Top N (blank = all):").pack(pady=5)
+    limit_entry = tk.Entry(form)
+    limit_entry.pack(pady=5)
+    tk.Button(form, text="Generate All-Time Table", command=generate).pack(pady=10)
 
-        goals_per_team = {team_id:0 for team_id in df_teams['team_id']}
-        for _, row in df_matches.iterrows():
-            goals_per_team[row['team1_id']] += row['team1_score']
-            goals_per_team[row['team2_id']] += row['team2_score']
 
+# All-Time Players (career totals, by player name)
+def all_time_players_form():
+    def render(board):
         table_win = tk.Toplevel(root)
-        table_win.title("Tournament Trends")
-        tree = ttk.Treeview(table_win, columns=("Team", "Goals"), show="headings")
-        tree.heading("Team", text="Team")
-        tree.heading("Goals", text="Goals")
-        tree.pack(fill=tk.BOTH, expand=True)
+        table_win.title("All-Time Players")
+        table_win.geometry("900x400")
+        show_dataframe(board.drop(columns=["player_key"]), table_win)
 
-        names, goals = [], []
-        for tid_team, team_name in zip(df_teams['team_id'], df_teams['team_name']):
-            tree.insert("", "end", values=(team_name, goals_per_team[tid_team]))
-            names.append(team_name)
-            goals.append(goals_per_team[tid_team])
-
-        # Bar chart
-        fig, ax = plt.subplots(figsize=(6,4))
-        ax.bar(names, goals, color='purple')
-        ax.set_ylabel("Goals")
-        ax.set_title("Goals per Team in Tournament")
-        ax.set_xticks(range(len(names)))
-        ax.set_xticklabels(names, rotation=45, ha='right')
-        canvas = FigureCanvasTkAgg(fig, master=table_win)
-        canvas.draw()
-        canvas.get_tk_widget().pack()
+    def generate():
+        sort = sort_entry.get()
+        limit = int(limit_entry.get()) if limit_entry.get() else None
+        run_in_background(form, ("all_time_players", sort, limit), lambda: all_time_players(sort, limit), render)
 
     form = tk.Toplevel(root)
-    form.title("Tournament Trends")
+    form.title("All-Time Players")
+    tk.Label(form, text="Rank by:").pack(pady=5)
+    sort_entry = ttk.Combobox(form, values=ALL_TIME_PLAYER_SORTS, state="readonly")
+    sort_entry.set("goals")
+    sort_entry.pack(pady=5)
+    tk.Label(form, text="Top N (blank = all):").pack(pady=5)
+    limit_entry = tk.Entry(form)
+    limit_entry.insert(0, "20")
+    limit_entry.pack(pady=5)
+    tk.Button(form, text="Generate Career Table", command=generate).pack(pady=10)
+
+
+# Head-to-Head History (two teams, every edition)
+def head_to_head_history_form():
+    def render(history, team_a, team_b):
+        if history.empty:
+            messagebox.showinfo("Info", f"{team_a} and {team_b} never met")
+            return
+        record = head_to_head_record(history)
+        table_win = tk.Toplevel(root)
+        table_win.title(f"{team_a} vs {team_b}")
+        tk.Label(table_win, text=f"{team_a}: {record['won']} won, {record['drawn']} drawn, {record['lost']} lost, "
+                                 f"goals {record['goals_for']}-{record['goals_against']}").pack(pady=5)
+        show_dataframe(history.drop(columns=["match_id", "goals_for", "goals_against"]), table_win)
+
+    def generate():
+        team_a, team_b = a_entry.get().strip(), b_entry.get().strip()
+        if not team_a or not team_b:
+            messagebox.showerror("Error", "Both team names required")
+            return
+        run_in_background(form, ("head_to_head_history", team_a.lower(), team_b.lower()),
+                          lambda: head_to_head_history(team_a, team_b),
+                          lambda history: render(history, team_a, team_b))
+
+    form = tk.Toplevel(root)
+    form.title("Head-to-Head History")
+    tk.Label(form, text="Team A:").pack(pady=5)
+    a_entry = tk.Entry(form)
+    a_entry.pack(pady=5)
+    tk.Label(form, text="Team B:").pack(pady=5)
+    b_entry = tk.Entry(form)
+    b_entry.pack(pady=5)
+    tk.Button(form, text="Show History", command=generate).pack(pady=10)
+
+# Head-to-Head Matrix (Heatmap)
+def head_to_head_figure(matrices, metric):
+    matrix = matrices[metric]
+    teams = matrices["teams"]
+    fig = new_figure((8,7))
+    ax = fig.add_subplot()
+    if metric == "goal_difference":
+        # Diverging colours centred on 0: row team ahead = blue, behind = red
+        limit = max(int(abs(matrix).max()), 1)
+        image = ax.imshow(matrix, cmap="RdBu", vmin=-limit, vmax=limit, interpolation="nearest")
+    else:
+        image = ax.imshow(matrix, cmap="viridis", interpolation="nearest")
+    fig.colorbar(image, ax=ax, label=metric.replace("_", " "))
+    if len(teams) <= 40:   # beyond that the labels would overlap
+        ax.set_xticks(range(len(teams)))
+        ax.set_xticklabels(teams, rotation=90, fontsize=7)
+        ax.set_yticks(range(len(teams)))
+        ax.set_yticklabels(teams, fontsize=7)
+    ax.set_xlabel("Opponent")
+    ax.set_ylabel("Team")
+    ax.set_title(f"Head-to-Head: {metric.replace('_', ' ')} ({len(teams)} teams)")
+    fig.tight_layout()
+    return fig
+
+def head_to_head_form():
+    def compute(tournament_ids, metric):
+        matrices = head_to_head(tournament_ids)
+        return head_to_head_figure(matrices, metric)
+
+    def render(fig):
+        table_win = tk.Toplevel(root)
+        table_win.title("Head-to-Head Matrix")
+        show_figure(fig, table_win)
+
+    def generate():
+        text = ids_entry.get().replace(",", " ").split()
+        try:
+            tournament_ids = [int(t) for t in text] or None
+        except ValueError:
+            messagebox.showerror("Error", "Tournament IDs must be numbers")
+            return
+        metric = metric_entry.get()
+        key = ("head_to_head", tuple(tournament_ids or ()), metric)
+        run_in_background(form, key, lambda: compute(tournament_ids, metric), render)
+
+    form = tk.Toplevel(root)
+    form.title("Head-to-Head Matrix")
+    tk.Label(form, text="Tournament IDs (blank = all):").pack(pady=5)
+    ids_entry = tk.Entry(form)
+    ids_entry.pack(pady=5)
+    tk.Label(form, text="Metric:").pack(pady=5)
+    metric_entry = ttk.Combobox(form, values=HEAD_TO_HEAD_METRICS, state="readonly")
+    metric_entry.set("goal_difference")
+    metric_entry.pack(pady=5)
+    tk.Button(form, text="Generate Heatmap", command=generate).pack(pady=10)
+
+# Elo Ratings over time (Line chart, see ratings.py)
+def ratings_figure(history):
+    import pandas as pd
+    fig = new_figure((8,4))
+    ax = fig.add_subplot()
+    dates = pd.to_datetime(history['date'], errors='coerce')
+    for name, rows in history.groupby(history['team_name'].str.strip().str.lower(), sort=False):
+        ax.step(dates[rows.index], rows['rating_after'], where='post', label=rows['team_name'].iloc[0])
+    ax.set_ylabel("Elo rating")
+    ax.set_title("Elo Ratings")
+    ax.legend(fontsize=8)
+    fig.autofmt_xdate()
+    fig.tight_layout()
+    return fig
+
+def ratings_form():
+    def compute(names):
+        table = current_ratings()
+        names = names or table['team_name'].head(5).tolist()
+        return table, ratings_figure(rating_history(tuple(names)))
+
+    def render(result):
+        table, fig = result
+        table_win = tk.Toplevel(root)
+        table_win.title("Elo Ratings")
+        table_win.geometry("900x750")
+        show_dataframe(table.drop(columns=["team_key"]), table_win)
+        show_figure(fig, table_win)
+
+    def generate():
+        names = [n.strip() for n in teams_entry.get().split(",") if n.strip()]
+        run_in_background(form, ("ratings", tuple(n.lower() for n in names)), lambda: compute(names), render)
+
+    form = tk.Toplevel(root)
+    form.title("Elo Ratings")
+    tk.Label(form, text="Teams, comma separated (blank = top 5):").pack(pady=5)
+    teams_entry = tk.Entry(form, width=40)
+    teams_entry.pack(pady=5)
+    tk.Button(form, text="Generate Rating Chart", command=generate).pack(pady=10)
+
+
+# Tournament Forecast (Monte Carlo, see simulate.py)
+def forecast_figure(forecast, simulations):
+    top = forecast.head(16)
+    names = top['team_name'].tolist()
+    fig = new_figure((6,4))
+    ax = fig.add_subplot()
+    ax.bar(names, (top['champion'] * 100).tolist(), color='goldenrod')
+    ax.set_ylabel("Title chance (%)")
+    ax.set_title(f"Tournament Forecast ({simulations:,} simulations)")
+    ax.set_xticks(range(len(names)))
+    ax.set_xticklabels(names, rotation=45, ha='right')
+    fig.tight_layout()
+    return fig
+
+def forecast_form():
+    def compute(tid, simulations, seed):
+        forecast = tournament_forecast(tid, simulations, seed)
+        return forecast, forecast_figure(forecast, simulations)
+
+    def render(result):
+        forecast, fig = result
+        table_win = tk.Toplevel(root)
+        table_win.title("Tournament Forecast")
+        table_win.geometry("1000x700")
+        show_dataframe(forecast.drop(columns=["team_id"]).round(3), table_win)
+        show_figure(fig, table_win)
+
+    def generate():
+        try:
+            tid, simulations, seed = int(tid_entry.get()), int(sims_entry.get()), int(seed_entry.get())
+        except ValueError:
+            messagebox.showerror("Error", "Tournament ID, simulations and seed must be numbers")
+            return
+        if simulations < 1:
+            messagebox.showerror("Error", "Simulations must be at least 1")
+            return
+        run_in_background(form, ("forecast", tid, simulations, seed), lambda: compute(tid, simulations, seed), render)
+
+    form = tk.Toplevel(root)
+    form.title("Tournament Forecast")
     tk.Label(form, text="Tournament ID:").pack(pady=5)
     tid_entry = tk.Entry(form)
     tid_entry.pack(pady=5)
-    tk.Button(form, text="Generate Tournament Trends", command=generate).pack(pady=10)
+    tk.Label(form, text="Simulations:").pack(pady=5)
+    sims_entry = tk.Entry(form)
+    sims_entry.insert(0, "100000")
+    sims_entry.pack(pady=5)
+    tk.Label(form, text="Seed:").pack(pady=5)
+    seed_entry = tk.Entry(form)
+    seed_entry.insert(0, "0")
+    seed_entry.pack(pady=5)
+    tk.Button(form, text="Run Simulation", command=generate).pack(pady=10)
+
+# -----------------------------
+# --- Import / Export ---------
+# -----------------------------
+# Whole database to/from a folder of Parquet or Arrow files (see transfer.py)
+def import_export_form():
+    def browse():
+        directory = filedialog.askdirectory(parent=form)
+        if directory:
+            dir_entry.delete(0, tk.END)
+            dir_entry.insert(0, directory)
+
+    def summary(counts):
+        return "\n".join(f"{table}: {rows:,} rows" for table, rows in counts.items())
+
+    def export():
+        directory, fmt = dir_entry.get(), format_entry.get()
+        if not directory:
+            messagebox.showerror("Error", "Folder required")
+            return
+        run_in_background(form, ("transfer", directory), lambda: export_database(directory, fmt),
+                          lambda counts: messagebox.showinfo("Exported", summary(counts)))
+
+    def load():
+        directory = dir_entry.get()
+        if not directory:
+            messagebox.showerror("Error", "Folder required")
+            return
+        replace = replace_var.get()
+        if replace and not messagebox.askyesno("Confirm", "Replace all data with the files in this folder?"):
+            return
+
+        def done(counts):
+            # Notify open windows from the Tk thread, not the worker
+            publish_reset()
+            messagebox.showinfo("Imported", summary(counts))
+        run_in_background(form, ("transfer", directory),
+                          lambda: import_database(directory, replace=replace, publish_changes=False), done)
+
+    form = tk.Toplevel(root)
+    form.title("Import / Export")
+    tk.Label(form, text="Folder:").pack(pady=5)
+    dir_entry = tk.Entry(form, width=50)
+    dir_entry.pack(pady=5, padx=10)
+    tk.Button(form, text="Browse...", command=browse).pack(pady=5)
+    tk.Label(form, text="Export format:").pack(pady=5)
+    format_entry = ttk.Combobox(form, values=list(FORMATS), state="readonly")
+    format_entry.set("parquet")
+    format_entry.pack(pady=5)
+    replace_var = tk.BooleanVar(value=False)
+    tk.Checkbutton(form, text="Import replaces existing data", variable=replace_var).pack(pady=5)
+    tk.Button(form, text="Export", command=export).pack(side=tk.LEFT, padx=20, pady=10)
+    tk.Button(form, text="Import", command=load).pack(side=tk.RIGHT, padx=20, pady=10)
+
+# -----------------------------
+# --- Search ------------------
+# -----------------------------
+# Search-as-you-type over players, teams, coaches and hosts (see search.py).
+# Every keystroke restarts a short timer and the search runs when typing
+# pauses; double-click a result to open its squad or its tournament's teams.
+# Typing only reads the index: names still waiting to be indexed (new or
+# renamed rows, a reset or an import) are indexed on the job runner, and
+# the search runs again when that finishes.
+SEARCH_DELAY_MS = 150
+
+def search_window(event=None):
+    pending = [None]
+    results = {}   # Treeview item -> search row
+
+    def refresh_index():
+        if search_index_pending():   # submit() coalesces a refresh already running
+            jobs.submit(("search-index",), update_search_index,
+                        lambda indexed: form.winfo_exists() and schedule(),
+                        lambda e: messagebox.showerror("Error", f"Indexing names failed:\n{e}"))
+
+    def run_search():
+        pending[0] = None
+        refresh_index()
+        kind = kind_entry.get()
+        tree.delete(*tree.get_children())
+        results.clear()
+        for row in search(text_entry.get(), None if kind == "all" else [kind], limit=50, refresh=False):
+            kind_name, _, name, _, team_name, _, year = row
+            item = tree.insert("", "end", values=(kind_name, name, team_name or "", year or ""))
+            results[item] = row
+
+    def schedule(event=None):
+        if pending[0] is not None:
+            form.after_cancel(pending[0])
+        pending[0] = form.after(SEARCH_DELAY_MS, run_search)
+
+    def open_selected(event=None):
+        selected = tree.selection() or tree.get_children()[:1]
+        if not selected:
+            return
+        kind, _, _, team_id, _, tournament_id, _ = results[selected[0]]
+        if kind == "host":
+            view_teams_table(tournament_id)
+        elif team_id is not None:
+            view_players_table(team_id)
+
+    form = tk.Toplevel(root)
+    form.title("Search")
+    form.geometry("600x450")
+    bar = tk.Frame(form)
+    bar.pack(fill=tk.X, pady=5)
+    tk.Label(bar, text="Search:").pack(side=tk.LEFT, padx=5)
+    text_entry = tk.Entry(bar, width=40)
+    text_entry.pack(side=tk.LEFT, padx=5)
+    text_entry.bind("<KeyRelease>", schedule)
+    text_entry.bind("<Return>", open_selected)
+    kind_entry = ttk.Combobox(bar, values=["all"] + list(SEARCH_KINDS), state="readonly", width=8)
+    kind_entry.set("all")
+    kind_entry.pack(side=tk.LEFT, padx=5)
+    kind_entry.bind("<<ComboboxSelected>>", schedule)
+    columns = ("Kind", "Name", "Team", "Year")
+    tree = ttk.Treeview(form, columns=columns, show="headings")
+    for col in columns:
+        tree.heading(col, text=col)
+        tree.column(col, width=250 if col == "Name" else 90)
+    tree.pack(fill=tk.BOTH, expand=True)
+    tree.bind("<Double-1>", open_selected)
+    text_entry.focus_set()
+    refresh_index()
+
+# -----------------------------
+# --- Diagnostics -------------
+# -----------------------------
+# Summaries of the query log kept by db.py (last PROFILE["size"] statements)
+def show_query_stats(title, summary):
+    table_win = tk.Toplevel(root)
+    table_win.title(title)
+    table_win.geometry("1000x400")
+    tree = ttk.Treeview(table_win, columns=QUERY_SUMMARY_COLUMNS, show="headings")
+    for col in QUERY_SUMMARY_COLUMNS:
+        tree.heading(col, text=col)
+        tree.column(col, width=600 if col == "sql" else 70, anchor=tk.W if col == "sql" else tk.E)
+    tree.pack(fill=tk.BOTH, expand=True)
+    for sql, count, total, mean, worst, rows, steps in summary:
+        tree.insert("", "end", values=(sql, count, f"{total * 1000:.2f} ms", f"{mean * 1000:.3f} ms",
+                                       f"{worst * 1000:.3f} ms", rows, steps))
+
+
+def slowest_queries_window():
+    show_query_stats("Slowest Queries", slowest_queries(50))
+
+
+def frequent_queries_window():
+    show_query_stats("Most Frequent Queries", frequent_queries(50))
+
+
+def clear_query_log_window():
+    clear_query_log()
+    messagebox.showinfo("Success", "Query log cleared")
+
+
+def analysis_cache_window():
+    info = cache_info()
+    if messagebox.askyesno("Analysis Cache",
+                           f"{info['size']}/{info['max_size']} results cached\n"
+                           f"{info['hits']} hits, {info['misses']} misses, "
+                           f"{info['invalidations']} invalidated\n\nClear the cache?"):
+        clear_cache()
 
 # -------------------------
 # --- Tkinter GUI ----------
 # -------------------------
-root = tk.Tk()
-root.title("Tournament Analyser")
-root.geometry("1000x600")
+# root and jobs are created under __main__: the forecast's worker processes
+# re-import this module and must not open a window of their own
 
 # GUI helpers and menu will be same as described in my previous message
 
@@ -544,29 +899,23 @@ def add_team_form():
     tk.Button(form, text="Add", command=submit).grid(row=4, column=0, columnspan=2, pady=10)
 
 # --- View/Edit/Delete Teams Table ---
-def view_teams_table():
-    # Ask for Tournament ID first
-    tournament_id = simpledialog.askinteger("Input", "Enter Tournament ID:")
+def view_teams_table(tournament_id=None):
+    # Ask for Tournament ID first (unless opened from a search result)
+    if tournament_id is None:
+        tournament_id = simpledialog.askinteger("Input", "Enter Tournament ID:")
     if tournament_id is None:
         return
 
     table_win = tk.Toplevel(root)
     table_win.title(f"Teams in Tournament {tournament_id}")
 
-    tree = ttk.Treeview(table_win, columns=("ID", "Name", "Coach", "Group", "TournamentID"), show="headings")
-    tree.heading("ID", text="ID")
-    tree.heading("Name", text="Team Name")
-    tree.heading("Coach", text="Coach")
-    tree.heading("Group", text="Group")
-    tree.heading("TournamentID", text="Tournament ID")
-    tree.pack(fill=tk.BOTH, expand=True)
-
-    def refresh():
-        for row in tree.get_children():
-            tree.delete(row)
-        data = view_teams(tournament_id)
-        for t in data:
-            tree.insert("", "end", values=t)
+    table = PagedTable(table_win, ("ID", "Name", "Coach", "Group", "TournamentID"),
+                       ("ID", "Team Name", "Coach", "Group", "Tournament ID"),
+                       lambda after, limit: view_page("Team", {"tournament_id": tournament_id}, after, limit))
+    table.pack(fill=tk.BOTH, expand=True)
+    tree = table.tree
+    table.watch("Team")
+    refresh = table.reload
 
     def edit_selected():
         selected = tree.selection()
@@ -578,7 +927,6 @@ def view_teams_table():
         coach = simpledialog.askstring("Edit", "Coach Name:", initialvalue=tree.item(selected[0])['values'][2])
         group = simpledialog.askstring("Edit", "Group:", initialvalue=tree.item(selected[0])['values'][3])
         edit_team(tid, name, coach, group)
-        refresh()
 
     def delete_selected():
         selected = tree.selection()
@@ -588,7 +936,6 @@ def view_teams_table():
         tid = tree.item(selected[0])['values'][0]
         if messagebox.askyesno("Confirm", "Are you sure you want to delete this team?"):
             delete_team(tid)
-            refresh()
 
     btn_frame = tk.Frame(table_win)
     btn_frame.pack(fill=tk.X)
@@ -656,23 +1003,13 @@ def view_matches_table():
     table_win = tk.Toplevel(root)
     table_win.title(f"Matches for Tournament {tournament_id}")
 
-    tree = ttk.Treeview(table_win, columns=("ID","Date","Stage","Team1","Team2","Score1","Score2","TournamentID"), show="headings")
-    tree.heading("ID", text="Match ID")
-    tree.heading("Date", text="Date")
-    tree.heading("Stage", text="Stage")
-    tree.heading("Team1", text="Team 1 ID")
-    tree.heading("Team2", text="Team 2 ID")
-    tree.heading("Score1", text="Team 1 Score")
-    tree.heading("Score2", text="Team 2 Score")
-    tree.heading("TournamentID", text="Tournament ID")
-    tree.pack(fill=tk.BOTH, expand=True)
-
-    def refresh():
-        for row in tree.get_children():
-            tree.delete(row)
-        data = view_matches(tournament_id)
-        for m in data:
-            tree.insert("", "end", values=m)
+    table = PagedTable(table_win, ("ID","Date","Stage","Team1","Team2","Score1","Score2","TournamentID"),
+                       ("Match ID", "Date", "Stage", "Team 1 ID", "Team 2 ID", "Team 1 Score", "Team 2 Score", "Tournament ID"),
+                       lambda after, limit: view_page("Match", {"tournament_id": tournament_id}, after, limit))
+    table.pack(fill=tk.BOTH, expand=True)
+    tree = table.tree
+    table.watch("Match")
+    refresh = table.reload
 
     def edit_selected():
         selected = tree.selection()
@@ -685,7 +1022,6 @@ def view_matches_table():
         score1 = simpledialog.askinteger("Edit", "Team 1 Score:", initialvalue=tree.item(selected[0])['values'][5])
         score2 = simpledialog.askinteger("Edit", "Team 2 Score:", initialvalue=tree.item(selected[0])['values'][6])
         edit_match(mid, date, stage, score1, score2)
-        refresh()
 
     def delete_selected():
         selected = tree.selection()
@@ -695,7 +1031,6 @@ def view_matches_table():
         mid = tree.item(selected[0])['values'][0]
         if messagebox.askyesno("Confirm", "Are you sure you want to delete this match?"):
             delete_match(mid)
-            refresh()
 
     btn_frame = tk.Frame(table_win)
     btn_frame.pack(fill=tk.X)
@@ -742,11 +1077,7 @@ def add_tournament_form():
 # View/Edit/Delete Tournaments
 def view_tournaments_table():
     def refresh():
-        for row in tree.get_children():
-            tree.delete(row)
-        data = view_tournaments()
-        for t in data:
-            tree.insert("", "end", values=t)
+        table.reload()
 
     def edit_selected():
         selected = tree.selection()
@@ -759,7 +1090,6 @@ def view_tournaments_table():
         winner = simpledialog.askstring("Edit", "Winner:", initialvalue=tree.item(selected[0])['values'][3])
         runner_up = simpledialog.askstring("Edit", "Runner-up:", initialvalue=tree.item(selected[0])['values'][4])
         edit_tournament(tid, year, host, winner, runner_up)
-        refresh()
 
     def delete_selected():
         selected = tree.selection()
@@ -769,17 +1099,15 @@ def view_tournaments_table():
         tid = tree.item(selected[0])['values'][0]
         if messagebox.askyesno("Confirm", "Are you sure you want to delete this tournament?"):
             delete_tournament(tid)
-            refresh()
 
     table_win = tk.Toplevel(root)
     table_win.title("View Tournaments")
-    tree = ttk.Treeview(table_win, columns=("ID", "Year", "Host", "Winner", "RunnerUp"), show="headings")
-    tree.heading("ID", text="ID")
-    tree.heading("Year", text="Year")
-    tree.heading("Host", text="Host Country")
-    tree.heading("Winner", text="Winner")
-    tree.heading("RunnerUp", text="Runner-up")
-    tree.pack(fill=tk.BOTH, expand=True)
+    table = PagedTable(table_win, ("ID", "Year", "Host", "Winner", "RunnerUp"),
+                       ("ID", "Year", "Host Country", "Winner", "Runner-up"),
+                       lambda after, limit: view_page("Tournament", None, after, limit))
+    table.pack(fill=tk.BOTH, expand=True)
+    tree = table.tree
+    table.watch("Tournament")
 
     btn_frame = tk.Frame(table_win)
     btn_frame.pack(fill=tk.X)
@@ -821,17 +1149,14 @@ def add_player_form():
 # -----------------------------
 # --- View/Edit/Delete Players -
 # -----------------------------
-def view_players_table():
-    team_id = simpledialog.askinteger("Team ID", "Enter Team ID to view players:")
+def view_players_table(team_id=None):
+    if team_id is None:
+        team_id = simpledialog.askinteger("Team ID", "Enter Team ID to view players:")
     if team_id is None:
         return
 
     def refresh():
-        for row in tree.get_children():
-            tree.delete(row)
-        data = view_players(team_id)
-        for p in data:
-            tree.insert("", "end", values=p)
+        table.reload()
 
     def edit_selected():
         selected = tree.selection()
@@ -842,7 +1167,6 @@ def view_players_table():
         name = simpledialog.askstring("Edit", "Player Name:", initialvalue=tree.item(selected[0])['values'][1])
         position = simpledialog.askstring("Edit", "Position:", initialvalue=tree.item(selected[0])['values'][2])
         edit_player(pid, name, position)
-        refresh()
 
     def delete_selected():
         selected = tree.selection()
@@ -852,16 +1176,15 @@ def view_players_table():
         pid = tree.item(selected[0])['values'][0]
         if messagebox.askyesno("Confirm", "Delete this player?"):
             delete_player(pid)
-            refresh()
 
     table_win = tk.Toplevel(root)
     table_win.title(f"Players of Team {team_id}")
-    tree = ttk.Treeview(table_win, columns=("ID", "Name", "Position", "Team ID"), show="headings")
-    tree.heading("ID", text="ID")
-    tree.heading("Name", text="Name")
-    tree.heading("Position", text="Position")
-    tree.heading("Team ID", text="Team ID")
-    tree.pack(fill=tk.BOTH, expand=True)
+    table = PagedTable(table_win, ("ID", "Name", "Position", "Team ID"),
+                       ("ID", "Name", "Position", "Team ID"),
+                       lambda after, limit: view_page("Player", {"team_id": team_id}, after, limit))
+    table.pack(fill=tk.BOTH, expand=True)
+    tree = table.tree
+    table.watch("Player")
 
     btn_frame = tk.Frame(table_win)
     btn_frame.pack(fill=tk.X)
@@ -914,11 +1237,7 @@ def view_events_table():
         return
 
     def refresh():
-        for row in tree.get_children():
-            tree.delete(row)
-        data = view_events(match_id)
-        for e in data:
-            tree.insert("", "end", values=e)
+        table.reload()
 
     def edit_selected():
         selected = tree.selection()
@@ -929,7 +1248,6 @@ def view_events_table():
         minute = simpledialog.askinteger("Edit", "Minute:", initialvalue=tree.item(selected[0])['values'][3])
         event_type = simpledialog.askstring("Edit", "Event Type:", initialvalue=tree.item(selected[0])['values'][4])
         edit_event(eid, minute, event_type)
-        refresh()
 
     def delete_selected():
         selected = tree.selection()
@@ -939,17 +1257,15 @@ def view_events_table():
         eid = tree.item(selected[0])['values'][0]
         if messagebox.askyesno("Confirm", "Delete this event?"):
             delete_event(eid)
-            refresh()
 
     table_win = tk.Toplevel(root)
     table_win.title(f"Events of Match {match_id}")
-    tree = ttk.Treeview(table_win, columns=("ID", "Match ID", "Player ID", "Minute", "Event Type"), show="headings")
-    tree.heading("ID", text="ID")
-    tree.heading("Match ID", text="Match ID")
-    tree.heading("Player ID", text="Player ID")
-    tree.heading("Minute", text="Minute")
-    tree.heading("Event Type", text="Event Type")
-    tree.pack(fill=tk.BOTH, expand=True)
+    table = PagedTable(table_win, ("ID", "Match ID", "Player ID", "Minute", "Event Type"),
+                       ("ID", "Match ID", "Player ID", "Minute", "Event Type"),
+                       lambda after, limit: view_page("Event", {"match_id": match_id}, after, limit))
+    table.pack(fill=tk.BOTH, expand=True)
+    tree = table.tree
+    table.watch("Event")
 
     btn_frame = tk.Frame(table_win)
     btn_frame.pack(fill=tk.X)
@@ -962,359 +1278,28 @@ def view_events_table():
 
 
 if __name__ == "__main__":
-    if os.path.exists("tournament.db"):
-        os.remove("tournament.db")
-
-    init_db()
-
-    ##DATA SET
-    # -----------------------------
-    # --- Tournaments -------------
-    # -----------------------------
-    tid2010 = add_tournament(2010, "South Africa", "Spain", "Netherlands")
-    tid2014 = add_tournament(2014, "Brazil", "Germany", "Argentina")
-    tid2018 = add_tournament(2018, "Russia", "France", "Croatia")
-    tid2022 = add_tournament(2022, "Qatar", "Argentina", "France")
-
-    # -----------------------------
-    # --- Teams -------------------
-    # -----------------------------
-    # 2010
-    t2010_spain = add_team("Spain", "Vicente del Bosque", "H", tid2010)
-    t2010_netherlands = add_team("Netherlands", "Bert van Marwijk", "E", tid2010)
-    t2010_germany = add_team("Germany", "Joachim Löw", "D", tid2010)
-    t2010_uruguay = add_team("Uruguay", "Óscar Tabárez", "A", tid2010)
-    t2010_ghana = add_team("Ghana", "Milovan Rajevac", "D", tid2010)
-    t2010_brazil = add_team("Brazil", "Dunga", "G", tid2010)
-    t2010_argentina = add_team("Argentina", "Diego Maradona", "B", tid2010)
-    t2010_england = add_team("England", "Fabio Capello", "C", tid2010)
-    t2010_france = add_team("France", "Raymond Domenech", "A", tid2010)
-    t2010_italy = add_team("Italy", "Marcello Lippi", "F", tid2010)
-
-    # 2014
-    t2014_germany = add_team("Germany", "Joachim Löw", "G", tid2014)
-    t2014_argentina = add_team("Argentina", "Alejandro Sabella", "F", tid2014)
-    t2014_brazil = add_team("Brazil", "Luiz Felipe Scolari", "A", tid2014)
-    t2014_netherlands = add_team("Netherlands", "Louis van Gaal", "B", tid2014)
-    t2014_belgium = add_team("Belgium", "Marc Wilmots", "H", tid2014)
-    t2014_france = add_team("France", "Didier Deschamps", "E", tid2014)
-    t2014_chile = add_team("Chile", "Jorge Sampaoli", "D", tid2014)
-    t2014_colombia = add_team("Colombia", "José Pekerman", "C", tid2014)
-    t2014_mexico = add_team("Mexico", "Miguel Herrera", "A", tid2014)
-    t2014_uruguay = add_team("Uruguay", "Óscar Tabárez", "B", tid2014)
-
-    # 2018
-    t2018_france = add_team("France", "Didier Deschamps", "C", tid2018)
-    t2018_croatia = add_team("Croatia", "Zlatko Dalić", "D", tid2018)
-    t2018_belgium = add_team("Belgium", "Roberto Martínez", "G", tid2018)
-    t2018_england = add_team("England", "Gareth Southgate", "G", tid2018)
-    t2018_brazil = add_team("Brazil", "Tite", "E", tid2018)
-    t2018_russia = add_team("Russia", "Stanislav Cherchesov", "A", tid2018)
-    t2018_sweden = add_team("Sweden", "Jan Andersson", "F", tid2018)
-    t2018_uruguay = add_team("Uruguay", "Óscar Tabárez", "A", tid2018)
-    t2018_portugal = add_team("Portugal", "Fernando Santos", "B", tid2018)
-    t2018_spain = add_team("Spain", "Fernando Hierro", "B", tid2018)
-
-    # 2022
-    t2022_argentina = add_team("Argentina", "Lionel Scaloni", "C", tid2022)
-    t2022_france = add_team("France", "Didier Deschamps", "D", tid2022)
-    t2022_croatia = add_team("Croatia", "Zlatko Dalić", "F", tid2022)
-    t2022_morocco = add_team("Morocco", "Walid Regragui", "F", tid2022)
-    t2022_brazil = add_team("Brazil", "Tite", "G", tid2022)
-    t2022_england = add_team("England", "Gareth Southgate", "B", tid2022)
-    t2022_portugal = add_team("Portugal", "Fernando Santos", "H", tid2022)
-    t2022_netherlands = add_team("Netherlands", "Louis van Gaal", "A", tid2022)
-    t2022_germany = add_team("Germany", "Hansi Flick", "E", tid2022)
-    t2022_spain = add_team("Spain", "Luis Enrique", "D", tid2022)
-
-
-    # -----------------------------
-    # --- Players -----------------
-    # -----------------------------
-    p2010_players = [
-        add_player("Andres Iniesta", "Midfielder", t2010_spain),
-        add_player("Iker Casillas", "Goalkeeper", t2010_spain),
-        add_player("Xavi", "Midfielder", t2010_spain),
-        add_player("David Villa", "Forward", t2010_spain),
-        add_player("Wesley Sneijder", "Midfielder", t2010_netherlands),
-        add_player("Robin van Persie", "Forward", t2010_netherlands),
-        add_player("Rafael van der Vaart", "Midfielder", t2010_netherlands),
-        add_player("Arjen Robben", "Forward", t2010_netherlands),
-        add_player("Miroslav Klose", "Forward", t2010_germany),
-        add_player("Thomas Müller", "Forward", t2010_germany),
-        add_player("Lukas Podolski", "Forward", t2010_germany),
-        add_player("Diego Forlán", "Forward", t2010_uruguay),
-        add_player("Luis Suárez", "Forward", t2010_uruguay),
-        add_player("Edinson Cavani", "Forward", t2010_uruguay),
-        add_player("Asamoah Gyan", "Forward", t2010_ghana),
-        add_player("Kevin-Prince Boateng", "Midfielder", t2010_ghana),
-        add_player("Kaka", "Midfielder", t2010_brazil),
-        add_player("Neymar", "Forward", t2010_brazil),
-        add_player("Lionel Messi", "Forward", t2010_argentina),
-        add_player("Sergio Agüero", "Forward", t2010_argentina),
-        add_player("Wayne Rooney", "Forward", t2010_england),
-        add_player("Frank Lampard", "Midfielder", t2010_england),
-        add_player("Franck Ribéry", "Midfielder", t2010_france),
-        add_player("Karim Benzema", "Forward", t2010_france),
-        add_player("Gianluigi Buffon", "Goalkeeper", t2010_italy),
-        add_player("Andrea Pirlo", "Midfielder", t2010_italy),
-        add_player("Daniele De Rossi", "Midfielder", t2010_italy),
-        add_player("Thiago Silva", "Defender", t2010_brazil),
-        add_player("Xabi Alonso", "Midfielder", t2010_spain),
-        add_player("David Beckham", "Midfielder", t2010_england)
-    ]
-
-
-
-
-    # 2014 Germany & Argentina & others
-    p2014_players = [
-        # Germany
-        add_player("Mario Götze", "Forward", t2014_germany),
-        add_player("Manuel Neuer", "Goalkeeper", t2014_germany),
-        add_player("Toni Kroos", "Midfielder", t2014_germany),
-        add_player("Philipp Lahm", "Defender", t2014_germany),
-        add_player("Thomas Müller", "Forward", t2014_germany),
-        add_player("Mats Hummels", "Defender", t2014_germany),
-        add_player("Bastian Schweinsteiger", "Midfielder", t2014_germany),
-        # Argentina
-        add_player("Lionel Messi", "Forward", t2014_argentina),
-        add_player("Sergio Agüero", "Forward", t2014_argentina),
-        add_player("Gonzalo Higuaín", "Forward", t2014_argentina),
-        add_player("Ezequiel Lavezzi", "Midfielder", t2014_argentina),
-        add_player("Javier Mascherano", "Midfielder", t2014_argentina),
-        add_player("Sergio Romero", "Goalkeeper", t2014_argentina),
-        # Brazil
-        add_player("Neymar", "Forward", t2014_brazil),
-        add_player("Hulk", "Forward", t2014_brazil),
-        add_player("Oscar", "Midfielder", t2014_brazil),
-        add_player("Thiago Silva", "Defender", t2014_brazil),
-        add_player("David Luiz", "Defender", t2014_brazil),
-        add_player("Julio Cesar", "Goalkeeper", t2014_brazil),
-        # Netherlands
-        add_player("Robin van Persie", "Forward", t2014_netherlands),
-        add_player("Wesley Sneijder", "Midfielder", t2014_netherlands),
-        add_player("Arjen Robben", "Forward", t2014_netherlands),
-        add_player("Daryl Janmaat", "Defender", t2014_netherlands),
-        add_player("Maarten Stekelenburg", "Goalkeeper", t2014_netherlands),
-        # Belgium
-        add_player("Eden Hazard", "Forward", t2014_belgium),
-        add_player("Kevin De Bruyne", "Midfielder", t2014_belgium),
-        add_player("Vincent Kompany", "Defender", t2014_belgium),
-        # France
-        add_player("Antoine Griezmann", "Forward", t2014_france),
-        add_player("Paul Pogba", "Midfielder", t2014_france),
-        add_player("Hugo Lloris", "Goalkeeper", t2014_france)
-    ]
-
-    # 2018 France & Croatia & others
-    p2018_players = [
-        # France
-        add_player("Kylian Mbappé", "Forward", t2018_france),
-        add_player("Antoine Griezmann", "Forward", t2018_france),
-        add_player("Paul Pogba", "Midfielder", t2018_france),
-        add_player("N'Golo Kanté", "Midfielder", t2018_france),
-        add_player("Hugo Lloris", "Goalkeeper", t2018_france),
-        add_player("Raphaël Varane", "Defender", t2018_france),
-        add_player("Samuel Umtiti", "Defender", t2018_france),
-        # Croatia
-        add_player("Luka Modric", "Midfielder", t2018_croatia),
-        add_player("Ivan Rakitic", "Midfielder", t2018_croatia),
-        add_player("Mario Mandzukic", "Forward", t2018_croatia),
-        add_player("Danijel Subasic", "Goalkeeper", t2018_croatia),
-        add_player("Dejan Lovren", "Defender", t2018_croatia),
-        add_player("Domagoj Vida", "Defender", t2018_croatia),
-        # Belgium
-        add_player("Eden Hazard", "Forward", t2018_belgium),
-        add_player("Romelu Lukaku", "Forward", t2018_belgium),
-        add_player("Kevin De Bruyne", "Midfielder", t2018_belgium),
-        add_player("Thibaut Courtois", "Goalkeeper", t2018_belgium),
-        add_player("Jan Vertonghen", "Defender", t2018_belgium),
-        # England
-        add_player("Harry Kane", "Forward", t2018_england),
-        add_player("Raheem Sterling", "Forward", t2018_england),
-        add_player("Jordan Henderson", "Midfielder", t2018_england),
-        add_player("Jordan Pickford", "Goalkeeper", t2018_england),
-        add_player("Harry Maguire", "Defender", t2018_england),
-        # Brazil
-        add_player("Neymar", "Forward", t2018_brazil),
-        add_player("Philippe Coutinho", "Midfielder", t2018_brazil),
-        add_player("Marcelo", "Defender", t2018_brazil),
-        add_player("Alisson Becker", "Goalkeeper", t2018_brazil),
-        # Russia
-        add_player("Artem Dzyuba", "Forward", t2018_russia),
-        add_player("Igor Akinfeev", "Goalkeeper", t2018_russia),
-        add_player("Denis Cheryshev", "Midfielder", t2018_russia)
-    ]
-
-    # 2022 Argentina & France & others
-    p2022_players = [
-        # Argentina
-        add_player("Lionel Messi", "Forward", t2022_argentina),
-        add_player("Paulo Dybala", "Forward", t2022_argentina),
-        add_player("Enzo Fernández", "Midfielder", t2022_argentina),
-        add_player("Emiliano Martínez", "Goalkeeper", t2022_argentina),
-        add_player("Rodrigo De Paul", "Midfielder", t2022_argentina),
-        add_player("Lautaro Martínez", "Forward", t2022_argentina),
-        add_player("Nicolás Otamendi", "Defender", t2022_argentina),
-        # France
-        add_player("Kylian Mbappé", "Forward", t2022_france),
-        add_player("Antoine Griezmann", "Forward", t2022_france),
-        add_player("Paul Pogba", "Midfielder", t2022_france),
-        add_player("Hugo Lloris", "Goalkeeper", t2022_france),
-        add_player("Raphaël Varane", "Defender", t2022_france),
-        add_player("Olivier Giroud", "Forward", t2022_france),
-        # Croatia
-        add_player("Luka Modric", "Midfielder", t2022_croatia),
-        add_player("Ivan Perišić", "Forward", t2022_croatia),
-        add_player("Domagoj Vida", "Defender", t2022_croatia),
-        add_player("Lovre Kalinić", "Goalkeeper", t2022_croatia),
-        # Morocco
-        add_player("Achraf Hakimi", "Defender", t2022_morocco),
-        add_player("Youssef En-Nesyri", "Forward", t2022_morocco),
-        add_player("Sofyan Amrabat", "Midfielder", t2022_morocco),
-        add_player("Yassine Bounou", "Goalkeeper", t2022_morocco),
-        # Brazil
-        add_player("Neymar", "Forward", t2022_brazil),
-        add_player("Vinicius Jr.", "Forward", t2022_brazil),
-        add_player("Casemiro", "Midfielder", t2022_brazil),
-        # England
-        add_player("Harry Kane", "Forward", t2022_england),
-        add_player("Phil Foden", "Midfielder", t2022_england),
-        add_player("Jordan Pickford", "Goalkeeper", t2022_england),
-        # Portugal
-        add_player("Cristiano Ronaldo", "Forward", t2022_portugal),
-        add_player("Bruno Fernandes", "Midfielder", t2022_portugal),
-        add_player("Rui Patricio", "Goalkeeper", t2022_portugal)
-    ]
-
-    # -----------------------------
-    # --- Matches -----------------
-    # -----------------------------
-    m2010_matches = [
-        add_match("2010-06-11", "Group", t2010_spain, t2010_netherlands, 1, 0, tid2010),
-        add_match("2010-06-12", "Group", t2010_uruguay, t2010_germany, 0, 0, tid2010),
-        add_match("2010-06-13", "Group", t2010_ghana, t2010_brazil, 1, 2, tid2010),
-        add_match("2010-06-14", "Group", t2010_argentina, t2010_england, 2, 1, tid2010),
-        add_match("2010-06-15", "Group", t2010_france, t2010_italy, 0, 0, tid2010),
-        add_match("2010-06-20", "Round of 16", t2010_spain, t2010_ghana, 1, 0, tid2010),
-        add_match("2010-06-21", "Round of 16", t2010_germany, t2010_uruguay, 4, 2, tid2010),
-        add_match("2010-06-25", "Quarterfinal", t2010_spain, t2010_germany, 1, 0, tid2010),
-        add_match("2010-07-07", "Semifinal", t2010_netherlands, t2010_uruguay, 3, 2, tid2010),
-        add_match("2010-07-11", "Final", t2010_spain, t2010_netherlands, 1, 0, tid2010)
-    ]
-
-    # 2014 Germany tournament matches
-    m2014_1 = add_match("2014-06-12", "Group", t2014_brazil, t2014_mexico, 3, 1, tid2014)
-    m2014_2 = add_match("2014-06-13", "Group", t2014_mexico, t2014_netherlands, 1, 0, tid2014)
-    m2014_3 = add_match("2014-06-14", "Group", t2014_brazil, t2014_netherlands, 1, 5, tid2014)
-    m2014_4 = add_match("2014-06-15", "Group", t2014_germany, t2014_argentina, 4, 0, tid2014)
-    m2014_5 = add_match("2014-06-16", "Group", t2014_argentina, t2014_germany, 2, 1, tid2014)
-    m2014_6 = add_match("2014-06-17", "Round of 16", t2014_brazil, t2014_chile, 1, 1, tid2014)
-    m2014_7 = add_match("2014-06-18", "Round of 16", t2014_colombia, t2014_uruguay, 2, 0, tid2014)
-    m2014_8 = add_match("2014-07-08", "Semi-final", t2014_germany, t2014_brazil, 7, 1, tid2014)
-    m2014_9 = add_match("2014-07-09", "Semi-final", t2014_argentina, t2014_netherlands, 0, 0, tid2014)
-    m2014_10 = add_match("2014-07-13", "Final", t2014_germany, t2014_argentina, 1, 0, tid2014)
-
-
-    # 2018 Russia tournament matches
-    m2018_1 = add_match("2018-06-14", "Group", t2018_russia, t2018_spain, 5, 0, tid2018)
-    m2018_2 = add_match("2018-06-15", "Group", t2018_france, t2018_uruguay, 0, 1, tid2018)
-    m2018_3 = add_match("2018-06-16", "Group", t2018_portugal, t2018_spain, 3, 3, tid2018)
-    m2018_4 = add_match("2018-06-17", "Group", t2018_france, t2018_belgium, 2, 1, tid2018)
-    m2018_5 = add_match("2018-06-18", "Group", t2018_france, t2018_brazil, 1, 1, tid2018)
-    m2018_6 = add_match("2018-06-19", "Group", t2018_brazil, t2018_russia, 1, 1, tid2018)
-    m2018_7 = add_match("2018-06-20", "Round of 16", t2018_france, t2018_russia, 4, 3, tid2018)
-    m2018_8 = add_match("2018-06-21", "Round of 16", t2018_uruguay, t2018_portugal, 2, 1, tid2018)
-    m2018_9 = add_match("2018-07-14", "Semi-final", t2018_france, t2018_belgium, 1, 0, tid2018)
-    m2018_10 = add_match("2018-07-15", "Final", t2018_france, t2018_croatia, 4, 2, tid2018)
-
-
-        # 2022 Qatar tournament matches
-    m2022_1 = add_match("2022-11-20", "Group", t2022_netherlands, t2022_england, 0, 2, tid2022)
-    m2022_2 = add_match("2022-11-21", "Group", t2022_england, t2022_portugal, 6, 2, tid2022)
-    m2022_3 = add_match("2022-11-22", "Group", t2022_brazil, t2022_netherlands, 0, 2, tid2022)
-    m2022_4 = add_match("2022-11-23", "Group", t2022_spain, t2022_netherlands, 1, 1, tid2022)
-    m2022_5 = add_match("2022-11-24", "Group", t2022_argentina, t2022_germany, 1, 2, tid2022)
-    m2022_6 = add_match("2022-11-25", "Group", t2022_croatia, t2022_argentina, 0, 0, tid2022)
-    m2022_7 = add_match("2022-12-03", "Round of 16", t2022_argentina, t2022_portugal, 2, 1, tid2022)
-    m2022_8 = add_match("2022-12-04", "Round of 16", t2022_france, t2022_croatia, 3, 1, tid2022)
-    m2022_9 = add_match("2022-12-17", "Semi-final", t2022_argentina, t2022_croatia, 3, 0, tid2022)
-    m2022_10 = add_match("2022-12-18", "Final", t2022_argentina, t2022_france, 3, 3, tid2022)
-
-
-
-    # -----------------------------
-    # --- Key Events --------------
-    # -----------------------------
-    add_event(m2010_matches[0], p2010_players[0], 54, "Goal")
-    add_event(m2010_matches[1], p2010_players[9], 77, "Goal")
-    add_event(m2010_matches[2], p2010_players[17], 23, "Goal")
-    add_event(m2010_matches[3], p2010_players[19], 45, "Goal")
-    add_event(m2010_matches[4], p2010_players[25], 12, "Save")
-    add_event(m2010_matches[5], p2010_players[0], 88, "Goal")
-    add_event(m2010_matches[6], p2010_players[8], 60, "Goal")
-    add_event(m2010_matches[7], p2010_players[0], 116, "Goal")
-    add_event(m2010_matches[8], p2010_players[4], 55, "Goal")
-    add_event(m2010_matches[9], p2010_players[0], 116, "Goal")
-
-        # -----------------------------
-    # --- Key Events 2014 ---------
-    # -----------------------------
-    add_event(m2014_1, p2014_players[0], 29, "Goal")    # Mario Götze
-    add_event(m2014_1, p2014_players[7], 45, "Goal")    # Lionel Messi
-    add_event(m2014_2, p2014_players[13], 60, "Save")   # Neymar
-    add_event(m2014_3, p2014_players[18], 12, "Goal")   # Robin van Persie
-    add_event(m2014_4, p2014_players[2], 75, "Assist")  # Toni Kroos
-    add_event(m2014_5, p2014_players[8], 88, "Goal")    # Sergio Agüero
-    add_event(m2014_6, p2014_players[21], 34, "Goal")   # Arjen Robben
-
-    # -----------------------------
-    # --- Key Events 2018 ---------
-    # -----------------------------
-    add_event(m2018_1, p2018_players[0], 18, "Goal")     # Kylian Mbappé
-    add_event(m2018_1, p2018_players[7], 28, "Assist")   # Luka Modric
-    add_event(m2018_2, p2018_players[12], 35, "Goal")    # Eden Hazard
-    add_event(m2018_3, p2018_players[16], 42, "Goal")    # Harry Kane
-    add_event(m2018_4, p2018_players[20], 50, "Assist")  # Neymar
-    add_event(m2018_5, p2018_players[3], 68, "Goal")     # Antoine Griezmann
-    add_event(m2018_6, p2018_players[1], 90, "Save")     # Hugo Lloris
-
-    # -----------------------------
-    # --- Key Events 2022 ---------
-    # -----------------------------
-    add_event(m2022_1, p2022_players[0], 23, "Goal")     # Lionel Messi
-    add_event(m2022_1, p2022_players[7], 45, "Goal")     # Kylian Mbappé
-    add_event(m2022_2, p2022_players[10], 60, "Assist")  # Enzo Fernández
-    add_event(m2022_3, p2022_players[14], 70, "Goal")    # Antoine Griezmann
-    add_event(m2022_4, p2022_players[20], 80, "Goal")    # Luka Modric
-    add_event(m2022_5, p2022_players[17], 88, "Save")    # Hugo Lloris
-    add_event(m2022_6, p2022_players[3], 115, "Goal")    # Emiliano Martínez
-
-
+    root = tk.Tk()
+    root.title("Tournament Analyser")
+    root.geometry("1000x600")
+    jobs = JobRunner(root)
 
     # start GUI here (menu bar + view/add forms)
     # Main Tournaments Table in root window
     tournament_frame = tk.Frame(root)
     tournament_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
 
-    tree = ttk.Treeview(tournament_frame, columns=("ID", "Year", "Host", "Winner", "RunnerUp"), show="headings")
-    tree.heading("ID", text="ID")
-    tree.heading("Year", text="Year")
-    tree.heading("Host", text="Host Country")
-    tree.heading("Winner", text="Winner")
-    tree.heading("RunnerUp", text="Runner-up")
-    tree.pack(fill=tk.BOTH, expand=True)
+    table = PagedTable(tournament_frame, ("ID", "Year", "Host", "Winner", "RunnerUp"),
+                       ("ID", "Year", "Host Country", "Winner", "Runner-up"),
+                       lambda after, limit: view_page("Tournament", None, after, limit))
+    table.pack(fill=tk.BOTH, expand=True)
+    tree = table.tree
+    table.watch("Tournament")
 
     # Buttons for edit/delete
     btn_frame = tk.Frame(root)
     btn_frame.pack(fill=tk.X)
     def refresh():
-        for row in tree.get_children():
-            tree.delete(row)
-        data = view_tournaments()
-        for t in data:
-            tree.insert("", "end", values=t)
+        table.reload()
 
     def edit_selected():
         selected = tree.selection()
@@ -1327,7 +1312,6 @@ if __name__ == "__main__":
         winner = simpledialog.askstring("Edit", "Winner:", initialvalue=tree.item(selected[0])['values'][3])
         runner_up = simpledialog.askstring("Edit", "Runner-up:", initialvalue=tree.item(selected[0])['values'][4])
         edit_tournament(tid, year, host, winner, runner_up)
-        refresh()
 
     def delete_selected():
         selected = tree.selection()
@@ -1337,13 +1321,16 @@ if __name__ == "__main__":
         tid = tree.item(selected[0])['values'][0]
         if messagebox.askyesno("Confirm", "Are you sure you want to delete this tournament?"):
             delete_tournament(tid)
-            refresh()
 
     tk.Button(btn_frame, text="Edit Selected", command=edit_selected).pack(side=tk.LEFT, padx=5, pady=5)
     tk.Button(btn_frame, text="Delete Selected", command=delete_selected).pack(side=tk.LEFT, padx=5, pady=5)
     tk.Button(btn_frame, text="Refresh", command=refresh).pack(side=tk.LEFT, padx=5, pady=5)
 
-    refresh()  # populate table on startup
+    def reset_to_seed():
+        if messagebox.askyesno("Confirm", "Replace all data with the FIFA 2010-2022 preset?"):
+            jobs.cancel_all()
+            restore_seed_snapshot()
+            refresh()
 
     # Menu Bar
     menu_bar = tk.Menu(root)
@@ -1352,6 +1339,9 @@ if __name__ == "__main__":
     tournament_menu = tk.Menu(menu_bar, tearoff=0)
     tournament_menu.add_command(label="Add Tournament", command=add_tournament_form)
     tournament_menu.add_command(label="View/Edit Tournaments", command=view_tournaments_table)
+    tournament_menu.add_separator()
+    tournament_menu.add_command(label="Reset to Seed Data", command=reset_to_seed)
+    tournament_menu.add_command(label="Import / Export...", command=import_export_form)
     menu_bar.add_cascade(label="Tournaments", menu=tournament_menu)
 
     # Teams Menu
@@ -1378,14 +1368,37 @@ if __name__ == "__main__":
     event_menu.add_command(label="View/Edit Events", command=view_events_table)
     menu_bar.add_cascade(label="Events", menu=event_menu)
 
+    # Search (also Ctrl+F)
+    menu_bar.add_command(label="Search", command=search_window)
+    root.bind_all("<Control-f>", search_window)
     
     # Analysis Menu
     analysis_menu = tk.Menu(menu_bar, tearoff=0)
     menu_bar.add_cascade(label="Analysis", menu=analysis_menu)
     analysis_menu.add_command(label="Leaderboard", command=leaderboard_form)
+    analysis_menu.add_command(label="Group Standings", command=group_standings_form)
+    analysis_menu.add_command(label="Knockout Bracket", command=bracket_form)
     analysis_menu.add_command(label="Top Players", command=top_players_form)
     analysis_menu.add_command(label="Match Key Events", command=match_events_form)
     analysis_menu.add_command(label="Tournament Trends", command=tournament_trends_form)
+    analysis_menu.add_separator()
+    analysis_menu.add_command(label="All-Time Teams", command=all_time_teams_form)
+    analysis_menu.add_command(label="All-Time Players", command=all_time_players_form)
+    analysis_menu.add_command(label="Head-to-Head History", command=head_to_head_history_form)
+    analysis_menu.add_command(label="Head-to-Head Matrix", command=head_to_head_form)
+    analysis_menu.add_separator()
+    analysis_menu.add_command(label="Elo Ratings", command=ratings_form)
+    analysis_menu.add_command(label="Tournament Forecast", command=forecast_form)
+    analysis_menu.add_separator()
+    analysis_menu.add_command(label="Rebuild Standings", command=rebuild_standings)
+
+    # Diagnostics Menu
+    diagnostics_menu = tk.Menu(menu_bar, tearoff=0)
+    menu_bar.add_cascade(label="Diagnostics", menu=diagnostics_menu)
+    diagnostics_menu.add_command(label="Slowest Queries", command=slowest_queries_window)
+    diagnostics_menu.add_command(label="Most Frequent Queries", command=frequent_queries_window)
+    diagnostics_menu.add_command(label="Clear Query Log", command=clear_query_log_window)
+    diagnostics_menu.add_command(label="Analysis Cache", command=analysis_cache_window)
 
     # Exit
     def on_close():
@@ -1394,5 +1407,21 @@ if __name__ == "__main__":
     menu_bar.add_command(label="Exit", command=root.quit)
     root.protocol("WM_DELETE_WINDOW", on_close)
     root.config(menu=menu_bar)
+
+    # Paint the (still empty) window before touching the database so it
+    # appears as early as possible, then open the data and fill the table.
+    # The existing database (and the user's edits) is kept; it is only
+    # filled from the seed snapshot while it holds no data.
+    root.update()
+    mark_startup("first_paint")
+
+    ensure_seeded_db()
+    refresh()  # populate table on startup
+    root.update_idletasks()
+    mark_startup("table_populated")
+    finish_startup_report()
+
     root.mainloop()
+    jobs.shutdown()
+    close_all_connections()
 
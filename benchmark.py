@@ -0,0 +1,513 @@
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import db
+
+# -------------------------
+# --- Benchmarks ----------
+# -------------------------
+# Run with: python benchmark.py <name> [options], e.g.
+#   python benchmark.py inserts --rows 2000
+#   python benchmark.py leaderboard --sizes 10000 100000 1000000
+#   python benchmark.py plans        (exits 1 if a hot query does a SCAN)
+#   python benchmark.py startup --save before.json  (then --baseline before.json)
+#   python benchmark.py suite --save before.json   (then --compare before.json)
+#   pytest tests/test_benchmarks.py   (the suite's analysis metrics, with
+#                                      pytest-benchmark installed)
+# Everything runs against a throwaway database in a temp directory, never
+# against tournament.db. Timings only compare on the same machine, so the
+# baseline files are made locally (e.g. on the commit before a change) and
+# not checked in.
+
+def _fresh_db(tmpdir, name):
+    # New database file with the app schema (tables + indexes)
+    path = os.path.join(tmpdir, name)
+    db.configure_db(path)
+    db.init_db()
+    db.close_all_connections()
+    return path
+
+
+def _timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+# --- Inserts: per-call connection vs pooled connection ---
+def bench_inserts_legacy(path, rows):
+    # The old get_connection(): open, insert, commit, close for every row,
+    # on a rollback-journal database like the one the old code created
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=DELETE")
+    conn.close()
+    start = time.perf_counter()
+    for i in range(rows):
+        conn = sqlite3.connect(path)
+        cursor = conn.cursor()
+        cursor.execute("INSERT INTO Team (team_name, coach_name, group_name, tournament_id) VALUES (?, ?, ?, ?)",
+                       (f"Team {i}", "Coach", "A", 1))
+        conn.commit()
+        conn.close()
+    return rows / (time.perf_counter() - start)
+
+
+def bench_inserts_pooled(path, rows):
+    # Pooled connection + WAL, still one transaction per row like add_team()
+    db.configure_db(path)
+    start = time.perf_counter()
+    for i in range(rows):
+        with db.transaction() as cursor:
+            cursor.execute("INSERT INTO Team (team_name, coach_name, group_name, tournament_id) VALUES (?, ?, ?, ?)",
+                           (f"Team {i}", "Coach", "A", 1))
+    elapsed = time.perf_counter() - start
+    db.close_all_connections()
+    return rows / elapsed
+
+
+def bench_inserts_single_transaction(path, rows):
+    # Pooled connection with every row wrapped in one outer transaction()
+    db.configure_db(path)
+    start = time.perf_counter()
+    with db.transaction():
+        for i in range(rows):
+            with db.transaction() as cursor:
+                cursor.execute("INSERT INTO Team (team_name, coach_name, group_name, tournament_id) VALUES (?, ?, ?, ?)",
+                               (f"Team {i}", "Coach", "A", 1))
+    elapsed = time.perf_counter() - start
+    db.close_all_connections()
+    return rows / elapsed
+
+
+def run_insert_benchmarks(rows=2000):
+    original_path = db.DB_PATH
+    results = {}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        results["legacy per-call connection"] = bench_inserts_legacy(_fresh_db(tmpdir, "legacy.db"), rows)
+        results["pooled connection"] = bench_inserts_pooled(_fresh_db(tmpdir, "pooled.db"), rows)
+        results["pooled, one transaction"] = bench_inserts_single_transaction(_fresh_db(tmpdir, "batch.db"), rows)
+    db.configure_db(original_path)
+    return results
+
+
+# --- Leaderboard: TeamStanding read vs vectorized recompute vs iterrows loop ---
+def _populate_tournament(path, matches, teams=200, seed=0):
+    import numpy as np
+    rng = np.random.default_rng(seed)
+    conn = sqlite3.connect(path)
+    conn.executemany("INSERT INTO Team (team_name, coach_name, group_name, tournament_id) VALUES (?, ?, ?, 1)",
+                     ((f"Team {i}", "Coach", "A") for i in range(teams)))
+    home = rng.integers(1, teams + 1, matches)
+    away = (home + rng.integers(1, teams, matches) - 1) % teams + 1
+    scores = rng.poisson(1.3, (matches, 2))
+    conn.executemany("INSERT INTO Match (date, stage, team1_id, team2_id, team1_score, team2_score, tournament_id) VALUES ('2022-01-01', 'Group', ?, ?, ?, ?, 1)",
+                     zip(home.tolist(), away.tolist(), scores[:, 0].tolist(), scores[:, 1].tolist()))
+    conn.commit()
+    conn.close()
+
+
+def leaderboard_iterrows(tournament_id):
+    # The original leaderboard_form() loop, kept here as the baseline
+    import pandas as pd
+    conn = db.get_connection()
+    df_matches = pd.read_sql_query(f"SELECT * FROM Match WHERE tournament_id={tournament_id}", conn)
+    df_teams = pd.read_sql_query(f"SELECT * FROM Team WHERE tournament_id={tournament_id}", conn)
+    points = {team_id: 0 for team_id in df_teams['team_id']}
+    goals_for = {team_id: 0 for team_id in df_teams['team_id']}
+    goals_against = {team_id: 0 for team_id in df_teams['team_id']}
+    for _, row in df_matches.iterrows():
+        t1, t2 = row['team1_id'], row['team2_id']
+        s1, s2 = row['team1_score'], row['team2_score']
+        goals_for[t1] += s1; goals_for[t2] += s2
+        goals_against[t1] += s2; goals_against[t2] += s1
+        if s1 > s2: points[t1] += 3
+        elif s1 < s2: points[t2] += 3
+        else: points[t1] += 1; points[t2] += 1
+    return points
+
+
+def run_leaderboard_benchmarks(sizes=(10_000, 100_000, 1_000_000), baseline_limit=100_000):
+    from analysis import compute_leaderboard, compute_leaderboard_from_matches
+    original_path = db.DB_PATH
+    results = {}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for size in sizes:
+            path = _fresh_db(tmpdir, f"leaderboard_{size}.db")
+            _populate_tournament(path, size)
+            db.configure_db(path)
+            standings, _ = _timed(compute_leaderboard, 1)
+            vectorized, _ = _timed(compute_leaderboard_from_matches, 1)
+            baseline = _timed(leaderboard_iterrows, 1)[0] if size <= baseline_limit else None
+            results[size] = {"standings": standings, "vectorized": vectorized, "iterrows": baseline}
+            db.close_all_connections()
+    db.configure_db(original_path)
+    return results
+
+
+# --- Query plans: hot queries must be index searches, never table scans ---
+def hot_queries():
+    # (label, sql, params) for every query on an interactive path
+    import analysis
+    return [
+        ("view_teams", "SELECT * FROM Team WHERE tournament_id=?", (1,)),
+        ("view_players", "SELECT * FROM Player WHERE team_id=?", (1,)),
+        ("view_matches", "SELECT * FROM Match WHERE tournament_id=?", (1,)),
+        ("view_events", "SELECT * FROM Event WHERE match_id=?", (1,)),
+        ("leaderboard teams", analysis.TOURNAMENT_TEAMS_SQL, (1,)),
+        ("leaderboard scores", analysis.TOURNAMENT_SCORES_SQL, (1,)),
+        ("standings", analysis.STANDINGS_SQL, (1,)),
+        ("top_scorers", analysis.TOP_SCORERS_SQL, (1, "Goal")),
+        ("match_timeline", analysis.MATCH_TIMELINE_SQL, (1,)),
+        ("team page", "SELECT * FROM Team WHERE tournament_id=? AND team_id>? ORDER BY team_id LIMIT ?", (1, 0, 200)),
+        ("match page", "SELECT * FROM Match WHERE tournament_id=? AND match_id>? ORDER BY match_id LIMIT ?", (1, 0, 200)),
+        ("player page", "SELECT * FROM Player WHERE team_id=? AND player_id>? ORDER BY player_id LIMIT ?", (1, 0, 200)),
+        ("event page", "SELECT * FROM Event WHERE match_id=? AND event_id>? ORDER BY event_id LIMIT ?", (1, 0, 200)),
+        ("head_to_head_history", analysis.HEAD_TO_HEAD_HISTORY_SQL, ("Brazil", "Germany")),
+        ("tournament page", "SELECT * FROM Tournament WHERE tournament_id>? ORDER BY tournament_id LIMIT ?", (0, 200)),
+    ]
+
+
+def query_plan_scans():
+    # {label: [SCAN steps]} for every hot query that falls back to a scan on
+    # the current database
+    failures = {}
+    for label, sql, params in hot_queries():
+        scans = db.table_scans(sql, params)
+        if scans:
+            failures[label] = scans
+    return failures
+
+
+def check_query_plans():
+    # query_plan_scans() on a throwaway database with 1000 matches
+    original_path = db.DB_PATH
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = _fresh_db(tmpdir, "plans.db")
+        _populate_tournament(path, 1000)
+        db.configure_db(path)
+        failures = query_plan_scans()
+        db.close_all_connections()
+    db.configure_db(original_path)
+    return failures
+
+
+# --- Suite: CRUD, analysis and table population at several data sizes ---
+# Every metric is seconds per call (lower is better), so two result files
+# from different commits can be compared metric by metric.
+SUITE_SIZES = (1_000, 10_000, 100_000)   # matches; 10 events per match
+SUITE_TOURNAMENTS = 10                   # fixed, so each tournament grows with the size
+
+
+def _median_time(func, *args, repeat=5):
+    func(*args)   # warm-up: lazy imports and a cold page cache are not measured
+    return statistics.median(_timed(func, *args)[0] for _ in range(repeat))
+
+
+def _per_call(func, args_list):
+    # Median seconds of single calls (robust to the odd WAL checkpoint), and
+    # the return values
+    times, returned = [], []
+    for args in args_list:
+        start = time.perf_counter()
+        returned.append(func(*args))
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), returned
+
+
+def bench_crud(ops=200):
+    # add_*, view_*, edit_* and delete_* on every table; the added rows are
+    # edited and then deleted again, so the data set is unchanged afterwards
+    import crud
+    cases = [
+        (lambda i: (2100 + i, "Host"), crud.add_tournament, crud.view_tournaments, (),
+         lambda k: (k, None, "Other Host"), crud.edit_tournament, crud.delete_tournament),
+        (lambda i: (f"Team {i}", "Coach", "A", 1), crud.add_team, crud.view_teams, (1,),
+         lambda k: (k, "Renamed"), crud.edit_team, crud.delete_team),
+        (lambda i: (f"Player {i}", "Forward", 1), crud.add_player, crud.view_players, (1,),
+         lambda k: (k, "Renamed"), crud.edit_player, crud.delete_player),
+        (lambda i: ("2100-06-01", "Group", 1, 2, 1, 0, 1), crud.add_match, crud.view_matches, (1,),
+         lambda k: (k, None, None, 2, 2), crud.edit_match, crud.delete_match),
+        (lambda i: (1, 1, 10, "Goal"), crud.add_event, crud.view_events, (1,),
+         lambda k: (k, 20), crud.edit_event, crud.delete_event),
+    ]
+    results = {}
+    for new_row, add, view, view_args, changes, edit, delete in cases:
+        results[add.__name__], ids = _per_call(add, [new_row(i) for i in range(ops)])
+        results[view.__name__] = _median_time(view, *view_args)
+        results[edit.__name__] = _per_call(edit, [changes(k) for k in ids])[0]
+        results[delete.__name__] = _per_call(delete, [(k,) for k in ids])[0]
+    return results
+
+
+def analysis_cases(tournament_id=1, match_id=1):
+    # {metric: (func, args)}: the compute half of each Analysis form (the
+    # part that runs on the job runner), uncached, plus a repeated
+    # leaderboard served from the cache. Also run by tests/test_benchmarks.py.
+    import analysis
+    import simulate
+    import ratings
+    import search
+    return {
+        "leaderboard": (analysis.compute_leaderboard.__wrapped__, (tournament_id,)),
+        "leaderboard_from_matches": (analysis.compute_leaderboard_from_matches.__wrapped__, (tournament_id,)),
+        "top_players": (analysis.top_scorers.__wrapped__, (tournament_id,)),
+        "match_events": (analysis.match_timeline.__wrapped__, (match_id,)),
+        "tournament_trends": (analysis.tournament_goals.__wrapped__, (tournament_id,)),
+        "leaderboard_cached": (analysis.compute_leaderboard, (tournament_id,)),
+        "group_standings": (analysis.group_standings.__wrapped__, (tournament_id,)),
+        "knockout_bracket": (analysis.knockout_bracket.__wrapped__, (tournament_id,)),
+        "ratings_full_replay": (ratings.rebuild_ratings, ()),
+        "forecast_10k": (simulate.tournament_forecast.__wrapped__, (tournament_id, 10_000, 0, 1)),
+        "search_index_rebuild": (search.rebuild_search_index, ()),
+        "search_as_you_type": (search.search, ("mull",)),
+        "search_fuzzy": (search.search, ("mueller",)),
+    }
+
+
+def bench_analysis(tournament_id=1, match_id=1):
+    return {name: _median_time(func, *args) for name, (func, args) in analysis_cases(tournament_id, match_id).items()}
+
+
+def bench_tables(tournament_id=1, match_id=1):
+    # PagedTable population for the view_*_table windows: the first page and
+    # scrolling through every page. None when there is no display.
+    import tkinter as tk
+    from crud import view_page
+    from widgets import PagedTable
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        return None
+    root.withdraw()
+    results = {}
+    for table, filters in (("Tournament", None), ("Team", {"tournament_id": tournament_id}),
+                           ("Match", {"tournament_id": tournament_id}), ("Player", {"team_id": 1}),
+                           ("Event", {"match_id": match_id})):
+        columns = [r[1] for r in db.get_connection().execute(f"PRAGMA table_info({table})")]
+        widget = PagedTable(root, columns, columns, lambda after, limit: view_page(table, filters, after, limit))
+        results[f"{table.lower()}_first_page"] = _timed(widget.reload)[0]
+        start = time.perf_counter()
+        widget.reload()
+        while not widget.exhausted:
+            widget.load_more()
+        results[f"{table.lower()}_all_pages"] = time.perf_counter() - start
+        widget.destroy()
+    root.destroy()
+    return results
+
+
+def _git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=HERE, capture_output=True, text=True)
+    except OSError:
+        return None
+    return out.stdout.strip() or None
+
+
+def run_suite(sizes=SUITE_SIZES, seed=0):
+    from generate import generate_data
+    original_path = db.DB_PATH
+    results = {"commit": _git_commit(), "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+               "python": platform.python_version(), "sqlite": sqlite3.sqlite_version, "sizes": {}}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for size in sizes:
+            db.configure_db(_fresh_db(tmpdir, f"suite_{size}.db"))
+            generate_data(tournaments=SUITE_TOURNAMENTS, matches=size, events=size * 10, seed=seed)
+            results["sizes"][str(size)] = {
+                "crud": bench_crud(),
+                "analysis": bench_analysis(),
+                "tables": bench_tables(),
+            }
+            db.close_all_connections()
+    db.configure_db(original_path)
+    results["startup"] = bench_startup()
+    return results
+
+
+def compare_suites(results, baseline, tolerance=0.25):
+    # [(size, group, metric, now, before)] for every metric measured in both
+    rows = []
+    for size, groups in results["sizes"].items():
+        for group, metrics in groups.items():
+            before = ((baseline["sizes"].get(size) or {}).get(group)) or {}
+            for metric, now in (metrics or {}).items():
+                if metric in before:
+                    rows.append((size, group, metric, now, before[metric]))
+    before = baseline.get("startup") or {}
+    for metric, now in (results.get("startup") or {}).items():
+        if metric in before:
+            rows.append(("-", "startup", metric, now, before[metric]))
+    regressions = [r for r in rows if r[3] > r[4] * (1 + tolerance)]
+    return rows, regressions
+
+
+# --- Startup: import time, first paint, populated tournament table ---
+HERE = os.path.dirname(os.path.abspath(__file__))
+STARTUP_PHASES = ["imported", "first_paint", "table_populated"]
+HEAVY_MODULES = ["pandas", "numpy", "matplotlib"]
+
+
+def app_modules():
+    # The modules of this repo that app.py imports at the top, read from its
+    # source so the list follows app.py
+    import ast
+    with open(os.path.join(HERE, "app.py"), encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.ImportFrom) and node.module:
+            names = [node.module]
+        elif isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        else:
+            continue
+        modules += [m for m in names if os.path.exists(os.path.join(HERE, m + ".py")) and m not in modules]
+    return modules
+
+
+def _import_app_modules():
+    # (seconds to import app_modules(), heavy modules they pulled in), in a
+    # fresh interpreter, so it works without a display
+    code = (f"import sys, time; start = time.perf_counter(); import {', '.join(app_modules())}; "
+            f"print(time.perf_counter() - start, ' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))")
+    out = subprocess.run([sys.executable, "-c", code], cwd=HERE, capture_output=True, text=True, check=True)
+    seconds, *heavy = out.stdout.split()
+    return float(seconds), heavy
+
+
+def heavy_imports_at_startup():
+    # Heavy modules pulled in by the modules app.py imports at startup
+    return _import_app_modules()[1]
+
+
+def bench_startup(runs=5):
+    # Import time of app.py's modules (always) and the GUI startup phases
+    # (only with a display)
+    results = {"app_imports": statistics.median(_import_app_modules()[0] for _ in range(runs))}
+    results.update(run_startup_benchmark(runs) or {})
+    return results
+
+
+def time_startup_once(workdir):
+    # Seconds from launching app.py to each phase, or None without a display.
+    # cwd=workdir so the app's tournament.db and seed snapshot live there.
+    report = os.path.join(workdir, "startup.json")
+    env = dict(os.environ, TOURNAMENT_STARTUP_REPORT=report)
+    start = time.time()
+    proc = subprocess.run([sys.executable, os.path.join(HERE, "app.py")], cwd=workdir, env=env,
+                          capture_output=True, text=True, timeout=120)
+    if proc.returncode != 0:
+        if "display" in proc.stderr:
+            return None
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    with open(report) as f:
+        marks = json.load(f)
+    return {phase: marks[phase] - start for phase in STARTUP_PHASES}
+
+
+def run_startup_benchmark(runs=5):
+    # Median seconds per phase over several launches, or None without a display.
+    # A first untimed launch builds the seed snapshot and the database, so the
+    # timed launches measure a normal (warm) start.
+    with tempfile.TemporaryDirectory() as tmpdir:
+        if time_startup_once(tmpdir) is None:
+            return None
+        samples = [time_startup_once(tmpdir) for _ in range(runs)]
+    return {phase: statistics.median(s[phase] for s in samples) for phase in STARTUP_PHASES}
+
+
+def startup_regressions(results, baseline, tolerance=0.25):
+    # Phases slower than baseline by more than tolerance (0.25 = 25%)
+    return {phase: (results[phase], baseline[phase]) for phase in STARTUP_PHASES
+            if phase in baseline and results[phase] > baseline[phase] * (1 + tolerance)}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tournament Analyser benchmarks")
+    sub = parser.add_subparsers(dest="name", required=True)
+    p = sub.add_parser("inserts", help="single-row insert throughput")
+    p.add_argument("--rows", type=int, default=2000)
+    p = sub.add_parser("leaderboard", help="compute_leaderboard on synthetic tournaments")
+    p.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    sub.add_parser("plans", help="fail if any hot query plan contains a SCAN")
+    p = sub.add_parser("suite", help="CRUD, analysis and table timings; JSON results for comparing commits")
+    p.add_argument("--sizes", type=int, nargs="+", default=list(SUITE_SIZES), help="matches per data set")
+    p.add_argument("--save", help="write the results to this JSON file")
+    p.add_argument("--compare", help="earlier results JSON; exit 1 if a metric got slower than --tolerance")
+    p.add_argument("--tolerance", type=float, default=0.5,
+                   help="allowed slowdown (default: %(default)s; most metrics are sub-millisecond)")
+    p = sub.add_parser("startup", help="time app.py startup; fail on regressions against a baseline")
+    p.add_argument("--runs", type=int, default=5)
+    p.add_argument("--baseline", help="JSON file with reference timings to compare against")
+    p.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown (default: %(default)s)")
+    p.add_argument("--save", help="write the measured timings to this JSON file")
+    args = parser.parse_args()
+
+    if args.name == "inserts":
+        print(f"Inserting {args.rows} Team rows")
+        for label, rate in run_insert_benchmarks(args.rows).items():
+            print(f"  {label:<30} {rate:>12,.0f} inserts/s")
+    elif args.name == "leaderboard":
+        print(f"{'matches':>10} {'standings':>12} {'vectorized':>12} {'iterrows':>12}")
+        for size, r in run_leaderboard_benchmarks(args.sizes).items():
+            baseline = f"{r['iterrows']:.3f}s" if r["iterrows"] is not None else "skipped"
+            print(f"{size:>10,} {r['standings']:>11.4f}s {r['vectorized']:>11.3f}s {baseline:>12}")
+    elif args.name == "plans":
+        failures = check_query_plans()
+        for label, scans in failures.items():
+            print(f"FAIL {label}: {'; '.join(scans)}")
+        print(f"{len(hot_queries()) - len(failures)}/{len(hot_queries())} hot queries use indexes")
+        raise SystemExit(1 if failures else 0)
+    elif args.name == "suite":
+        results = run_suite(args.sizes)
+        for size, groups in results["sizes"].items():
+            print(f"{int(size):,} matches")
+            for group, metrics in groups.items():
+                if metrics is None:
+                    print(f"  {group}: skipped (no display)")
+                    continue
+                for metric, seconds in metrics.items():
+                    print(f"  {group + '.' + metric:<36} {seconds * 1000:>10.3f} ms")
+        print("startup")
+        for metric, seconds in results["startup"].items():
+            print(f"  {'startup.' + metric:<36} {seconds * 1000:>10.3f} ms")
+        if args.save:
+            with open(args.save, "w") as f:
+                json.dump(results, f, indent=2)
+        regressions = []
+        if args.compare:
+            with open(args.compare) as f:
+                baseline = json.load(f)
+            rows, regressions = compare_suites(results, baseline, args.tolerance)
+            print(f"compared with {baseline.get('commit') or args.compare}:")
+            for size, group, metric, now, before in rows:
+                flag = "  SLOWER" if (size, group, metric, now, before) in regressions else ""
+                print(f"  {size:>8} {group + '.' + metric:<36} {now / before:>6.2f}x{flag}")
+        raise SystemExit(1 if regressions else 0)
+    elif args.name == "startup":
+        heavy = heavy_imports_at_startup()
+        print(f"heavy modules imported at startup: {', '.join(heavy) or 'none'}")
+        results = run_startup_benchmark(args.runs)
+        if results is None:
+            print("no display available, skipping GUI startup timing")
+            raise SystemExit(1 if heavy else 0)
+        for phase in STARTUP_PHASES:
+            print(f"  {phase:<16} {results[phase]:.3f}s (median of {args.runs})")
+        if args.save:
+            with open(args.save, "w") as f:
+                json.dump(results, f, indent=2)
+        regressions = {}
+        if args.baseline:
+            with open(args.baseline) as f:
+                regressions = startup_regressions(results, json.load(f), args.tolerance)
+            for phase, (now, before) in regressions.items():
+                print(f"FAIL {phase}: {now:.3f}s vs baseline {before:.3f}s")
+        raise SystemExit(1 if heavy or regressions else 0)
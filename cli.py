@@ -0,0 +1,295 @@
+import argparse
+import csv
+import json
+import sys
+
+import db
+
+# -----------------------------
+# --- Command Line Interface --
+# -----------------------------
+# Headless access to the data and analysis functions, e.g.
+#   python cli.py leaderboard --tournament 3 --format csv
+#   python cli.py top-players --tournament 4 --event-type Assist --limit 5
+# Never imports tkinter, and pandas/matplotlib only for commands that need
+# them, so it starts fast on display-less servers.
+
+
+def write_rows(columns, rows, fmt="table", out=sys.stdout):
+    if fmt == "csv":
+        writer = csv.writer(out, lineterminator="\n")
+        writer.writerow(columns)
+        writer.writerows(rows)
+    elif fmt == "json":
+        json.dump([dict(zip(columns, row)) for row in rows], out, ensure_ascii=False, indent=2)
+        out.write("\n")
+    else:
+        text = [[("" if v is None else str(v)) for v in row] for row in rows]
+        widths = [max([len(c)] + [len(r[i]) for r in text]) for i, c in enumerate(columns)]
+        out.write("  ".join(c.ljust(w) for c, w in zip(columns, widths)).rstrip() + "\n")
+        out.write("  ".join("-" * w for w in widths) + "\n")
+        for r in text:
+            out.write("  ".join(v.ljust(w) for v, w in zip(r, widths)).rstrip() + "\n")
+
+
+# --- Commands: each returns (columns, rows) or None ---
+def cmd_init(args):
+    if args.seed:
+        from seed import ensure_seeded_db
+        ensure_seeded_db(force=True)
+
+
+def cmd_tournaments(args):
+    from analysis import read_rows
+    return read_rows("SELECT * FROM Tournament ORDER BY tournament_id")
+
+
+def cmd_leaderboard(args):
+    from analysis import read_rows, leaderboard_query
+    return read_rows(*leaderboard_query(args.tournament))
+
+
+def cmd_top_players(args):
+    from analysis import read_rows, top_scorers_query
+    return read_rows(*top_scorers_query(args.tournament, args.event_type, args.limit))
+
+
+def cmd_match_events(args):
+    from analysis import read_rows, match_timeline_query
+    return read_rows(*match_timeline_query(args.match))
+
+
+def cmd_trends(args):
+    from analysis import read_rows, tournament_goals_query
+    return read_rows(*tournament_goals_query(args.tournament))
+
+
+def cmd_groups(args):
+    from analysis import group_standings, group_what_if
+    if args.what_if:
+        match_id, team1_score, team2_score = args.what_if
+        board = group_what_if(args.tournament, match_id, team1_score, team2_score)
+    else:
+        board = group_standings(args.tournament)
+    return list(board.columns), list(board.itertuples(index=False, name=None))
+
+
+def cmd_bracket(args):
+    from analysis import knockout_bracket
+    bracket = knockout_bracket(args.tournament).drop(columns=["x", "y"])
+    bracket = bracket.astype(object).where(bracket.notna(), None)
+    return list(bracket.columns), list(bracket.itertuples(index=False, name=None))
+
+
+def cmd_all_time_teams(args):
+    from analysis import read_rows, all_time_teams_query
+    return read_rows(*all_time_teams_query(args.limit))
+
+
+def cmd_all_time_players(args):
+    from analysis import read_rows, all_time_players_query
+    return read_rows(*all_time_players_query(args.sort, args.limit))
+
+
+def cmd_history(args):
+    from analysis import read_rows, head_to_head_history_query
+    return read_rows(*head_to_head_history_query(args.team_a, args.team_b))
+
+
+def cmd_head_to_head(args):
+    from analysis import head_to_head, head_to_head_pairs
+    matrices = head_to_head(args.tournament)
+    if args.matrix is None:
+        return head_to_head_pairs(matrices)
+    # Dense form: one row per team, one column per opponent
+    teams = matrices["teams"]
+    matrix = matrices[args.matrix].tolist()
+    return ["team"] + teams, [[team] + row for team, row in zip(teams, matrix)]
+
+
+def cmd_ratings(args):
+    from analysis import read_rows
+    from ratings import update_ratings, current_ratings_query
+    update_ratings()
+    return read_rows(*current_ratings_query(args.limit))
+
+
+def cmd_rating_history(args):
+    from analysis import read_rows
+    from ratings import update_ratings, rating_history_query
+    update_ratings()
+    return read_rows(*rating_history_query(args.team))
+
+
+def cmd_forecast(args):
+    from simulate import tournament_forecast
+    forecast = tournament_forecast(args.tournament, args.simulations, args.seed, args.workers)
+    return list(forecast.columns), list(forecast.round(4).itertuples(index=False, name=None))
+
+
+def cmd_search(args):
+    from search import search, SEARCH_COLUMNS
+    return SEARCH_COLUMNS, search(args.text, args.kind, args.limit)
+
+
+def _report_progress(table, rows):
+    sys.stderr.write(f"\r{table:<10} {rows:>12,} rows")
+    sys.stderr.flush()
+
+
+def cmd_export(args):
+    from transfer import export_database
+    counts = export_database(args.directory, args.to, args.chunk_rows, _report_progress)
+    sys.stderr.write("\n")
+    return ["table", "rows"], list(counts.items())
+
+
+def cmd_import(args):
+    from transfer import import_database
+    counts = import_database(args.directory, args.from_format, args.replace, args.chunk_rows, _report_progress)
+    sys.stderr.write("\n")
+    return ["table", "rows"], list(counts.items())
+
+
+def cmd_rebuild_standings(args):
+    db.rebuild_summaries()
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="tournament-analyzer", description="Tournament Analyser (headless)")
+    parser.add_argument("--db", default=db.DB_PATH, help="database file (default: %(default)s)")
+    parser.add_argument("--format", choices=["table", "csv", "json"], default="table")
+    parser.add_argument("--profile", type=int, metavar="N",
+                        help="afterwards print the N slowest and N most frequent queries to stderr")
+    parser.add_argument("--slow-ms", type=float, help="log queries slower than this many milliseconds")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("init", help="create/migrate the schema")
+    p.add_argument("--seed", action="store_true", help="restore the FIFA 2010-2022 preset snapshot (replaces the data) "
+                                                     "unless the database already holds the current preset")
+    p.set_defaults(func=cmd_init)
+
+    p = sub.add_parser("tournaments", help="list tournaments")
+    p.set_defaults(func=cmd_tournaments)
+
+    p = sub.add_parser("leaderboard", help="standings for a tournament")
+    p.add_argument("--tournament", type=int, required=True)
+    p.set_defaults(func=cmd_leaderboard)
+
+    p = sub.add_parser("top-players", help="players ranked by an event type")
+    p.add_argument("--tournament", type=int, required=True)
+    p.add_argument("--event-type", default="Goal")
+    p.add_argument("--limit", type=int)
+    p.set_defaults(func=cmd_top_players)
+
+    p = sub.add_parser("match-events", help="timeline of a match")
+    p.add_argument("--match", type=int, required=True)
+    p.set_defaults(func=cmd_match_events)
+
+    p = sub.add_parser("trends", help="goals per team in a tournament")
+    p.add_argument("--tournament", type=int, required=True)
+    p.set_defaults(func=cmd_trends)
+
+    p = sub.add_parser("groups", help="group tables with FIFA tiebreakers")
+    p.add_argument("--tournament", type=int, required=True)
+    p.add_argument("--what-if", type=int, nargs=3, metavar=("MATCH", "SCORE1", "SCORE2"),
+                   help="re-rank the match's group(s) as if it had ended SCORE1-SCORE2 (nothing is saved)")
+    p.set_defaults(func=cmd_groups)
+
+    p = sub.add_parser("bracket", help="knockout matches linked into a bracket (parent_id = next-round match)")
+    p.add_argument("--tournament", type=int, required=True)
+    p.set_defaults(func=cmd_bracket)
+
+    p = sub.add_parser("all-time-teams", help="team records across every edition (by team name)")
+    p.add_argument("--limit", type=int)
+    p.set_defaults(func=cmd_all_time_teams)
+
+    p = sub.add_parser("all-time-players", help="career totals across every edition (by player name)")
+    p.add_argument("--sort", choices=["goals", "assists", "events", "appearances", "editions"], default="goals")
+    p.add_argument("--limit", type=int)
+    p.set_defaults(func=cmd_all_time_players)
+
+    p = sub.add_parser("history", help="every meeting of two teams (by name)")
+    p.add_argument("--team-a", required=True)
+    p.add_argument("--team-b", required=True)
+    p.set_defaults(func=cmd_history)
+
+    p = sub.add_parser("head-to-head", help="team x team results (by team name), as pairs or a dense matrix")
+    p.add_argument("--tournament", type=int, nargs="+", help="only these tournaments (default: all)")
+    p.add_argument("--matrix", choices=["goal_difference", "won", "drawn", "lost", "played"],
+                   help="print this metric as a dense team x opponent matrix")
+    p.set_defaults(func=cmd_head_to_head)
+
+    p = sub.add_parser("ratings", help="current Elo rating of every team (by name)")
+    p.add_argument("--limit", type=int)
+    p.set_defaults(func=cmd_ratings)
+
+    p = sub.add_parser("rating-history", help="Elo rating before/after every match, in date order")
+    p.add_argument("--team", nargs="+", help="only these team names (default: all)")
+    p.set_defaults(func=cmd_rating_history)
+
+    p = sub.add_parser("forecast", help="Monte Carlo odds of each team winning its group, each round and the title")
+    p.add_argument("--tournament", type=int, required=True)
+    p.add_argument("--simulations", type=int, default=100_000)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--workers", type=int, help="processes (default: one per CPU)")
+    p.set_defaults(func=cmd_forecast)
+
+    p = sub.add_parser("search", help="players, teams, coaches and hosts by name (accent-insensitive, typo-tolerant)")
+    p.add_argument("text")
+    p.add_argument("--kind", nargs="+", choices=["player", "team", "coach", "host"], help="default: all")
+    p.add_argument("--limit", type=int, default=20)
+    p.set_defaults(func=cmd_search)
+
+    p = sub.add_parser("export", help="write every table to DIRECTORY as Parquet or Arrow files (needs pyarrow)")
+    p.add_argument("directory")
+    p.add_argument("--to", choices=["parquet", "arrow"], default="parquet")
+    p.add_argument("--chunk-rows", type=int, default=100_000)
+    p.set_defaults(func=cmd_export)
+
+    p = sub.add_parser("import", help="load the files written by export (needs pyarrow)")
+    p.add_argument("directory")
+    p.add_argument("--from", dest="from_format", choices=["parquet", "arrow"],
+                   help="file format (default: detected from the files)")
+    p.add_argument("--replace", action="store_true", help="empty the tables first")
+    p.add_argument("--chunk-rows", type=int, default=100_000)
+    p.set_defaults(func=cmd_import)
+
+    p = sub.add_parser("rebuild-standings", help="recompute TeamStanding and PlayerEventCount, re-index the names")
+    p.set_defaults(func=cmd_rebuild_standings)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    db.configure_db(args.db)
+    if args.slow_ms is not None:
+        db.configure_profiling(slow_ms=args.slow_ms)
+    db.init_db()
+    try:
+        result = args.func(args)
+        if result is not None:
+            write_rows(*result, fmt=args.format)
+    except (ValueError, FileNotFoundError) as e:
+        # Bad input (e.g. a clashing import): a message, not a traceback
+        sys.stderr.write(f"error: {e}\n")
+        return 1
+    finally:
+        db.close_all_connections()
+    if args.profile:
+        write_query_profile(args.profile, args.format)
+    return 0
+
+
+def write_query_profile(n, fmt):
+    columns = ["sql", "count", "total_ms", "mean_ms", "max_ms", "rows", "vm_steps"]
+    for title, summary in (("slowest", db.slowest_queries(n)), ("most frequent", db.frequent_queries(n))):
+        rows = [(sql[:100] if fmt == "table" else sql, count, round(total * 1000, 3), round(mean * 1000, 3),
+                 round(worst * 1000, 3), nrows, steps)
+                for sql, count, total, mean, worst, nrows, steps in summary]
+        sys.stderr.write(f"\n{title} queries:\n")
+        write_rows(columns, rows, fmt=fmt, out=sys.stderr)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
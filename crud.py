@@ -0,0 +1,238 @@
+from db import transaction, publish
+
+# -------------------------
+# --- Database CRUD -------
+# -------------------------
+# Every helper runs inside transaction() on the pooled per-thread connection,
+# so a caller can wrap several of them in one outer transaction(). Writes
+# publish a change notification (see db.publish); edit_* return the updated
+# row.
+
+# Tournament CRUD
+def add_tournament(year, host_country, winner=None, runner_up=None):
+    with transaction() as cursor:
+        cursor.execute("INSERT INTO Tournament (year, host_country, winner, runner_up) VALUES (?, ?, ?, ?)",
+                       (year, host_country, winner, runner_up))
+        row_id = cursor.lastrowid
+        publish("Tournament", "insert", row_id, (row_id, year, host_country, winner, runner_up))
+        return row_id
+
+def view_tournaments():
+    with transaction() as cursor:
+        cursor.execute("SELECT * FROM Tournament")
+        return cursor.fetchall()
+
+def edit_tournament(tid, year=None, host_country=None, winner=None, runner_up=None):
+    updates, values = [], []
+    if year is not None: updates.append("year=?"); values.append(year)
+    if host_country: updates.append("host_country=?"); values.append(host_country)
+    if winner: updates.append("winner=?"); values.append(winner)
+    if runner_up: updates.append("runner_up=?"); values.append(runner_up)
+    values.append(tid)
+    with transaction() as cursor:
+        cursor.execute(f"UPDATE Tournament SET {', '.join(updates)} WHERE tournament_id=?", values)
+        row = cursor.execute("SELECT * FROM Tournament WHERE tournament_id=?", (tid,)).fetchone()
+        publish("Tournament", "update", tid, row)
+        return row
+
+def delete_tournament(tid):
+    with transaction() as cursor:
+        row = cursor.execute("SELECT * FROM Tournament WHERE tournament_id=?", (tid,)).fetchone()
+        cursor.execute("DELETE FROM Tournament WHERE tournament_id=?", (tid,))
+        publish("Tournament", "delete", tid, row)
+
+# Team CRUD
+def add_team(team_name, coach_name, group_name, tournament_id):
+    with transaction() as cursor:
+        cursor.execute("INSERT INTO Team (team_name, coach_name, group_name, tournament_id) VALUES (?, ?, ?, ?)",
+                       (team_name, coach_name, group_name, tournament_id))
+        row_id = cursor.lastrowid
+        publish("Team", "insert", row_id, (row_id, team_name, coach_name, group_name, tournament_id))
+        return row_id
+
+def view_teams(tournament_id=None):
+    with transaction() as cursor:
+        if tournament_id:
+            cursor.execute("SELECT * FROM Team WHERE tournament_id=?", (tournament_id,))
+        else:
+            cursor.execute("SELECT * FROM Team")
+        return cursor.fetchall()
+
+def edit_team(team_id, team_name=None, coach_name=None, group_name=None):
+    updates, values = [], []
+    if team_name: updates.append("team_name=?"); values.append(team_name)
+    if coach_name: updates.append("coach_name=?"); values.append(coach_name)
+    if group_name: updates.append("group_name=?"); values.append(group_name)
+    values.append(team_id)
+    with transaction() as cursor:
+        cursor.execute(f"UPDATE Team SET {', '.join(updates)} WHERE team_id=?", values)
+        row = cursor.execute("SELECT * FROM Team WHERE team_id=?", (team_id,)).fetchone()
+        publish("Team", "update", team_id, row)
+        return row
+
+def delete_team(team_id):
+    with transaction() as cursor:
+        row = cursor.execute("SELECT * FROM Team WHERE team_id=?", (team_id,)).fetchone()
+        cursor.execute("DELETE FROM Team WHERE team_id=?", (team_id,))
+        publish("Team", "delete", team_id, row)
+
+# Player CRUD
+def add_player(player_name, position, team_id):
+    with transaction() as cursor:
+        cursor.execute("INSERT INTO Player (player_name, position, team_id) VALUES (?, ?, ?)",
+                       (player_name, position, team_id))
+        row_id = cursor.lastrowid
+        publish("Player", "insert", row_id, (row_id, player_name, position, team_id))
+        return row_id
+
+def view_players(team_id=None):
+    with transaction() as cursor:
+        if team_id:
+            cursor.execute("SELECT * FROM Player WHERE team_id=?", (team_id,))
+        else:
+            cursor.execute("SELECT * FROM Player")
+        return cursor.fetchall()
+
+def edit_player(player_id, player_name=None, position=None):
+    updates, values = [], []
+    if player_name: updates.append("player_name=?"); values.append(player_name)
+    if position: updates.append("position=?"); values.append(position)
+    values.append(player_id)
+    with transaction() as cursor:
+        cursor.execute(f"UPDATE Player SET {', '.join(updates)} WHERE player_id=?", values)
+        row = cursor.execute("SELECT * FROM Player WHERE player_id=?", (player_id,)).fetchone()
+        publish("Player", "update", player_id, row)
+        return row
+
+def delete_player(player_id):
+    with transaction() as cursor:
+        row = cursor.execute("SELECT * FROM Player WHERE player_id=?", (player_id,)).fetchone()
+        cursor.execute("DELETE FROM Player WHERE player_id=?", (player_id,))
+        publish("Player", "delete", player_id, row)
+
+# Match CRUD
+def add_match(date, stage, team1_id, team2_id, team1_score, team2_score, tournament_id):
+    with transaction() as cursor:
+        cursor.execute("INSERT INTO Match (date, stage, team1_id, team2_id, team1_score, team2_score, tournament_id) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                       (date, stage, team1_id, team2_id, team1_score, team2_score, tournament_id))
+        row_id = cursor.lastrowid
+        publish("Match", "insert", row_id, (row_id, date, stage, team1_id, team2_id, team1_score, team2_score, tournament_id))
+        return row_id
+
+def view_matches(tournament_id=None):
+    with transaction() as cursor:
+        if tournament_id:
+            cursor.execute("SELECT * FROM Match WHERE tournament_id=?", (tournament_id,))
+        else:
+            cursor.execute("SELECT * FROM Match")
+        return cursor.fetchall()
+
+def edit_match(match_id, date=None, stage=None, team1_score=None, team2_score=None):
+    updates, values = [], []
+    if date: updates.append("date=?"); values.append(date)
+    if stage: updates.append("stage=?"); values.append(stage)
+    if team1_score is not None: updates.append("team1_score=?"); values.append(team1_score)
+    if team2_score is not None: updates.append("team2_score=?"); values.append(team2_score)
+    values.append(match_id)
+    with transaction() as cursor:
+        cursor.execute(f"UPDATE Match SET {', '.join(updates)} WHERE match_id=?", values)
+        row = cursor.execute("SELECT * FROM Match WHERE match_id=?", (match_id,)).fetchone()
+        publish("Match", "update", match_id, row)
+        return row
+
+def delete_match(match_id):
+    with transaction() as cursor:
+        row = cursor.execute("SELECT * FROM Match WHERE match_id=?", (match_id,)).fetchone()
+        cursor.execute("DELETE FROM Match WHERE match_id=?", (match_id,))
+        publish("Match", "delete", match_id, row)
+
+# Event CRUD
+def add_event(match_id, player_id, minute, event_type):
+    with transaction() as cursor:
+        cursor.execute("INSERT INTO Event (match_id, player_id, minute, event_type) VALUES (?, ?, ?, ?)",
+                       (match_id, player_id, minute, event_type))
+        row_id = cursor.lastrowid
+        publish("Event", "insert", row_id, (row_id, match_id, player_id, minute, event_type))
+        return row_id
+
+def view_events(match_id=None):
+    with transaction() as cursor:
+        if match_id:
+            cursor.execute("SELECT * FROM Event WHERE match_id=?", (match_id,))
+        else:
+            cursor.execute("SELECT * FROM Event")
+        return cursor.fetchall()
+
+def edit_event(event_id, minute=None, event_type=None):
+    updates, values = [], []
+    if minute is not None: updates.append("minute=?"); values.append(minute)
+    if event_type: updates.append("event_type=?"); values.append(event_type)
+    values.append(event_id)
+    with transaction() as cursor:
+        cursor.execute(f"UPDATE Event SET {', '.join(updates)} WHERE event_id=?", values)
+        row = cursor.execute("SELECT * FROM Event WHERE event_id=?", (event_id,)).fetchone()
+        publish("Event", "update", event_id, row)
+        return row
+
+def delete_event(event_id):
+    with transaction() as cursor:
+        row = cursor.execute("SELECT * FROM Event WHERE event_id=?", (event_id,)).fetchone()
+        cursor.execute("DELETE FROM Event WHERE event_id=?", (event_id,))
+        publish("Event", "delete", event_id, row)
+
+# Keyset pagination for the table windows: rows ordered by primary key,
+# starting after the last key the caller already has (WHERE key > ?), so
+# every page is an index range read no matter how deep the user scrolls.
+PRIMARY_KEYS = {"Tournament": "tournament_id", "Team": "team_id", "Player": "player_id",
+                "Match": "match_id", "Event": "event_id"}
+
+def view_page(table, filters=None, after_id=None, limit=200):
+    key = PRIMARY_KEYS[table]
+    clauses, values = [], []
+    for column, value in (filters or {}).items():
+        clauses.append(f"{column}=?"); values.append(value)
+    if after_id is not None:
+        clauses.append(f"{key}>?"); values.append(after_id)
+    where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+    values.append(limit)
+    with transaction() as cursor:
+        cursor.execute(f"SELECT * FROM {table}{where} ORDER BY {key} LIMIT ?", values)
+        return cursor.fetchall()
+
+# -------------------------
+# --- Bulk CRUD -----------
+# -------------------------
+# Each bulk helper takes an iterable of row tuples (same column order as the
+# single-row add_* function), inserts them inside one transaction and returns
+# the new IDs in input order. executemany cannot report the ID of each row,
+# and the IDs of a batch need not be consecutive (explicit keys, rows deleted
+# and reused), so every row is executed on its own and its lastrowid kept.
+def _insert_many(table, sql, rows):
+    with transaction() as cursor:
+        ids = []
+        for row in rows:
+            cursor.execute(sql, row)
+            ids.append(cursor.lastrowid)
+        if ids:
+            publish(table, "insert", None)
+        return ids
+
+def add_tournaments_bulk(rows):
+    # rows: (year, host_country, winner, runner_up)
+    return _insert_many("Tournament", "INSERT INTO Tournament (year, host_country, winner, runner_up) VALUES (?, ?, ?, ?)", rows)
+
+def add_teams_bulk(rows):
+    # rows: (team_name, coach_name, group_name, tournament_id)
+    return _insert_many("Team", "INSERT INTO Team (team_name, coach_name, group_name, tournament_id) VALUES (?, ?, ?, ?)", rows)
+
+def add_players_bulk(rows):
+    # rows: (player_name, position, team_id)
+    return _insert_many("Player", "INSERT INTO Player (player_name, position, team_id) VALUES (?, ?, ?)", rows)
+
+def add_matches_bulk(rows):
+    # rows: (date, stage, team1_id, team2_id, team1_score, team2_score, tournament_id)
+    return _insert_many("Match", "INSERT INTO Match (date, stage, team1_id, team2_id, team1_score, team2_score, tournament_id) VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+
+def add_events_bulk(rows):
+    # rows: (match_id, player_id, minute, event_type)
+    return _insert_many("Event", "INSERT INTO Event (match_id, player_id, minute, event_type) VALUES (?, ?, ?, ?)", rows)
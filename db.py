@@ -0,0 +1,798 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import lru_cache
+
+# -------------------------
+# --- Connection Layer ----
+# -------------------------
+# One long-lived connection per thread instead of open/commit/close on every
+# CRUD call. The PRAGMAs below are applied once when a connection is opened.
+DB_PATH = "tournament.db"
+DB_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -20000,        # negative = KiB, so ~20 MB page cache
+    "mmap_size": 256 * 1024 * 1024,
+    "temp_store": "MEMORY",
+}
+
+_local = threading.local()
+_connections = []
+_lock = threading.Lock()
+_generation = 0   # bumped by close_all_connections() to retire every thread's conn
+
+
+def configure_db(path=None, **pragmas):
+    # Change the database file and/or PRAGMAs. Open connections are closed so
+    # the next get_connection() picks up the new settings.
+    global DB_PATH
+    close_all_connections()
+    if path is not None:
+        DB_PATH = path
+    DB_PRAGMAS.update(pragmas)
+
+
+def _open_connection():
+    # isolation_level=None: we issue BEGIN/COMMIT ourselves in transaction()
+    start = time.perf_counter()
+    conn = sqlite3.connect(DB_PATH, isolation_level=None, check_same_thread=False,
+                           factory=ProfiledConnection)
+    for name, value in DB_PRAGMAS.items():
+        if value is not None:
+            conn.execute(f"PRAGMA {name}={value}")
+    conn.setup_profiling()
+    _record(QueryRecord("CONNECT", DB_PATH, 0, time.perf_counter() - start))
+    return conn
+
+
+def get_connection():
+    conn = getattr(_local, "conn", None)
+    if getattr(_local, "private", False):
+        return conn
+    if conn is None or _local.generation != _generation:
+        conn = _open_connection()
+        _local.conn = conn
+        _local.depth = 0
+        _local.pending = []
+        _local.generation = _generation
+        with _lock:
+            _connections.append(conn)
+    return conn
+
+
+def close_connection():
+    # Close the calling thread's connection (if any)
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        return
+    with _lock:
+        if conn in _connections:
+            _connections.remove(conn)
+    conn.close()
+    _local.conn = None
+    _local.depth = 0
+
+
+def close_all_connections():
+    global _generation
+    with _lock:
+        _generation += 1
+        conns = list(_connections)
+        _connections.clear()
+    for conn in conns:
+        try:
+            conn.close()
+        except sqlite3.ProgrammingError:
+            pass
+    _local.conn = None
+    _local.depth = 0
+
+
+@contextmanager
+def use_connection(conn):
+    # Run get_connection()/transaction() on the calling thread against conn,
+    # a private connection (opened with isolation_level=None), e.g. to build
+    # a database other than DB_PATH. Other threads keep their pooled
+    # connections, and changes published meanwhile are not delivered.
+    saved = {name: getattr(_local, name, None) for name in ("conn", "depth", "pending", "private")}
+    _local.conn, _local.depth, _local.pending, _local.private = conn, 0, [], True
+    try:
+        yield conn
+    finally:
+        for name, value in saved.items():
+            setattr(_local, name, value)
+
+
+@contextmanager
+def transaction():
+    # Run a block of statements as one transaction on the thread's connection.
+    # Nested transaction() blocks join the outermost one, so bulk loaders can
+    # wrap many CRUD calls and pay for a single commit.
+    conn = get_connection()
+    depth = _local.depth
+    if depth == 0:
+        conn.execute("BEGIN")
+        _local.pending = []
+    _local.depth = depth + 1
+    cursor = conn.cursor()
+    try:
+        yield cursor
+    except BaseException:
+        _local.depth = depth
+        if depth == 0:
+            conn.rollback()
+            _local.pending = []
+        raise
+    else:
+        _local.depth = depth
+        if depth == 0:
+            conn.execute("COMMIT")   # (not conn.commit(), so the commit is profiled)
+            changes, _local.pending = _local.pending, []
+            _dispatch(changes)
+    finally:
+        cursor.close()
+
+
+# ---------------------------
+# --- Change Notifications ---
+# ---------------------------
+# CRUD functions publish (table, action, key, row) after every write so open
+# windows can patch a single row instead of reloading. action is "insert",
+# "update" or "delete" ("reset" when the whole table was replaced); key is
+# the primary key, or None when a bulk insert added many rows or on reset;
+# row is the full row tuple when it is known (for deletes, the row as it was
+# before the delete). Changes are delivered only once the outermost
+# transaction commits and are dropped on rollback.
+_listeners = []
+
+
+def subscribe(listener):
+    _listeners.append(listener)
+
+
+def unsubscribe(listener):
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+
+def publish(table, action, key, row=None):
+    if getattr(_local, "private", False):
+        return
+    change = (table, action, key, row)
+    if getattr(_local, "depth", 0):
+        _local.pending.append(change)
+    else:
+        _dispatch([change])
+
+
+def _dispatch(changes):
+    for change in changes:
+        for listener in list(_listeners):
+            listener(*change)
+
+
+# ---------------------------
+# --- Query Profiling -------
+# ---------------------------
+# Every connection comes from _open_connection() and is a ProfiledConnection,
+# so every statement (CRUD, analysis, pandas.read_sql_query, commits) runs
+# through ProfiledCursor.execute. Each call is kept as a QueryRecord in a
+# ring buffer of the last PROFILE["size"] statements: SQL, parameters, rows
+# returned or changed, wall time (execute + fetches) and SQLite VM steps
+# (counted with set_progress_handler). Connection opens are recorded as
+# "CONNECT" with the open time. Statements slower than PROFILE["slow_ms"]
+# are logged as warnings; with PROFILE["trace"] every statement SQLite runs,
+# including trigger bodies, is logged at DEBUG level via set_trace_callback.
+log = logging.getLogger("tournament.db")
+PROFILE = {
+    "enabled": True,
+    "size": 2000,
+    "slow_ms": float(os.environ.get("TOURNAMENT_SLOW_QUERY_MS", 0)) or None,
+    "trace": False,
+    "progress_ops": 100,    # VM instructions per progress-handler call
+}
+_query_log = deque(maxlen=PROFILE["size"])
+
+
+class QueryRecord:
+    __slots__ = ("sql", "params", "rows", "seconds", "steps", "thread")
+
+    def __init__(self, sql, params, rows, seconds, steps=0):
+        self.sql = sql
+        self.params = params
+        self.rows = rows
+        self.seconds = seconds
+        self.steps = steps
+        self.thread = threading.current_thread().name
+
+
+@lru_cache(maxsize=1024)
+def _one_line(sql):
+    return " ".join(sql.split())
+
+
+def _record(record):
+    if PROFILE["enabled"]:
+        _query_log.append(record)
+
+
+class ProfiledCursor(sqlite3.Cursor):
+    _last = None   # record of the statement being fetched from
+
+    def _timed(self, method, sql, params, store_params):
+        if not PROFILE["enabled"]:
+            return method(sql, params)
+        conn = self.connection
+        steps = conn.vm_steps
+        start = time.perf_counter()
+        try:
+            return method(sql, params)
+        finally:
+            elapsed = time.perf_counter() - start
+            record = QueryRecord(_one_line(sql), params if store_params else None,
+                                 max(self.rowcount, 0), elapsed,
+                                 (conn.vm_steps - steps) * PROFILE["progress_ops"])
+            self._last = record
+            _record(record)
+            if PROFILE["slow_ms"] and elapsed * 1000 >= PROFILE["slow_ms"]:
+                log.warning("slow query (%.1f ms): %s %r", elapsed * 1000, record.sql, record.params)
+
+    def execute(self, sql, params=()):
+        return self._timed(super().execute, sql, params, True)
+
+    def executemany(self, sql, seq_of_params):
+        # The parameter rows may be a generator, so they are not kept
+        return self._timed(super().executemany, sql, seq_of_params, False)
+
+    def _fetched(self, start, rows):
+        if self._last is not None:
+            self._last.seconds += time.perf_counter() - start
+            self._last.rows += rows
+
+    def fetchone(self):
+        start = time.perf_counter()
+        row = super().fetchone()
+        self._fetched(start, int(row is not None))
+        return row
+
+    def fetchmany(self, size=None):
+        start = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        self._fetched(start, len(rows))
+        return rows
+
+    def fetchall(self):
+        start = time.perf_counter()
+        rows = super().fetchall()
+        self._fetched(start, len(rows))
+        return rows
+
+
+class ProfiledConnection(sqlite3.Connection):
+    # Connection.execute() would bypass an overridden cursor(), so both are
+    # routed through ProfiledCursor here
+    vm_steps = 0
+
+    def setup_profiling(self):
+        if PROFILE["progress_ops"]:
+            self.set_progress_handler(self._count_steps, PROFILE["progress_ops"])
+        if PROFILE["trace"]:
+            self.set_trace_callback(lambda statement: log.debug("sql: %s", statement))
+
+    def _count_steps(self):
+        self.vm_steps += 1
+        return 0   # non-zero would abort the statement
+
+    def cursor(self, factory=ProfiledCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, params=()):
+        return self.cursor().execute(sql, params)
+
+    def executemany(self, sql, seq_of_params):
+        return self.cursor().executemany(sql, seq_of_params)
+
+
+def configure_profiling(**settings):
+    # e.g. configure_profiling(slow_ms=50, size=10000, trace=True)
+    global _query_log
+    PROFILE.update(settings)
+    if _query_log.maxlen != PROFILE["size"]:
+        _query_log = deque(_query_log, maxlen=PROFILE["size"])
+    close_all_connections()   # progress/trace hooks are installed on open
+
+
+def query_log():
+    return list(_query_log)
+
+
+def clear_query_log():
+    _query_log.clear()
+
+
+def query_summary():
+    # Per distinct statement: [sql, count, total s, mean s, max s, rows, VM steps]
+    summary = {}
+    for r in list(_query_log):
+        entry = summary.setdefault(r.sql, [r.sql, 0, 0.0, 0.0, 0.0, 0, 0])
+        entry[1] += 1
+        entry[2] += r.seconds
+        entry[4] = max(entry[4], r.seconds)
+        entry[5] += r.rows
+        entry[6] += r.steps
+    for entry in summary.values():
+        entry[3] = entry[2] / entry[1]
+    return list(summary.values())
+
+
+QUERY_SUMMARY_COLUMNS = ["sql", "count", "total_s", "mean_s", "max_s", "rows", "vm_steps"]
+
+
+def slowest_queries(n=10):
+    return sorted(query_summary(), key=lambda e: e[4], reverse=True)[:n]
+
+
+def frequent_queries(n=10):
+    return sorted(query_summary(), key=lambda e: (e[1], e[2]), reverse=True)[:n]
+
+
+# -------------------------
+# --- Database Init -------
+# -------------------------
+# Secondary indexes on foreign-key and filter columns. Single-column indexes
+# keep rows in primary-key order per value, which keyset paging relies on;
+# idx_match_scores and idx_event_type also carry extra columns so the
+# analysis queries are answered from the index alone.
+INDEXES = [
+    ("idx_team_tournament", "Team", "tournament_id"),
+    ("idx_player_team", "Player", "team_id"),
+    ("idx_match_tournament", "Match", "tournament_id"),
+    ("idx_match_scores", "Match", "tournament_id, team1_id, team2_id, team1_score, team2_score"),
+    ("idx_match_team1", "Match", "team1_id"),
+    ("idx_match_team2", "Match", "team2_id"),
+    ("idx_event_match", "Event", "match_id"),
+    ("idx_event_player", "Event", "player_id"),
+    ("idx_event_type", "Event", "event_type, match_id, player_id"),
+    # All-time analytics resolve teams and players across editions by name
+    ("idx_team_name_key", "Team", "lower(trim(team_name)), tournament_id"),
+    ("idx_player_name_key", "Player", "lower(trim(player_name))"),
+]
+
+
+def create_triggers(cursor, triggers):
+    # CREATE TRIGGER IF NOT EXISTS keeps an outdated definition, so a trigger
+    # whose stored SQL differs is dropped and created again. Returns whether
+    # any existing trigger was replaced.
+    replaced = False
+    for trigger in triggers:
+        definition = trigger.split("CREATE TRIGGER IF NOT EXISTS ", 1)[1]
+        name = definition.split(None, 1)[0]
+        stored = cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = ?",
+                                (name,)).fetchone()
+        if stored is not None and stored[0] != "CREATE TRIGGER " + definition:
+            cursor.execute(f"DROP TRIGGER {name}")
+            replaced = True
+        cursor.execute(trigger)
+    return replaced
+
+
+def init_db():
+    with transaction() as cursor:
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS Tournament (
+            tournament_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            year INTEGER,
+            host_country TEXT,
+            winner TEXT,
+            runner_up TEXT
+        )
+        """)
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS Team (
+            team_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            team_name TEXT,
+            coach_name TEXT,
+            group_name TEXT,
+            tournament_id INTEGER,
+            FOREIGN KEY (tournament_id) REFERENCES Tournament(tournament_id)
+        )
+        """)
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS Player (
+            player_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            player_name TEXT,
+            position TEXT,
+            team_id INTEGER,
+            FOREIGN KEY (team_id) REFERENCES Team(team_id)
+        )
+        """)
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS Match (
+            match_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            date TEXT,
+            stage TEXT,
+            team1_id INTEGER,
+            team2_id INTEGER,
+            team1_score INTEGER,
+            team2_score INTEGER,
+            tournament_id INTEGER,
+            FOREIGN KEY (team1_id) REFERENCES Team(team_id),
+            FOREIGN KEY (team2_id) REFERENCES Team(team_id),
+            FOREIGN KEY (tournament_id) REFERENCES Tournament(tournament_id)
+        )
+        """)
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS Event (
+            event_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            match_id INTEGER,
+            player_id INTEGER,
+            minute INTEGER,
+            event_type TEXT,
+            FOREIGN KEY (match_id) REFERENCES Match(match_id),
+            FOREIGN KEY (player_id) REFERENCES Player(player_id)
+        )
+        """)
+        # CREATE INDEX IF NOT EXISTS also migrates databases created before
+        # the indexes existed
+        for name, table, columns in INDEXES:
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})")
+
+        had_standings = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='TeamStanding'").fetchone()
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS TeamStanding (
+            tournament_id INTEGER,
+            team_id INTEGER,
+            played INTEGER NOT NULL DEFAULT 0,
+            won INTEGER NOT NULL DEFAULT 0,
+            drawn INTEGER NOT NULL DEFAULT 0,
+            lost INTEGER NOT NULL DEFAULT 0,
+            goals_for INTEGER NOT NULL DEFAULT 0,
+            goals_against INTEGER NOT NULL DEFAULT 0,
+            points INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (tournament_id, team_id)
+        ) WITHOUT ROWID
+        """)
+        replaced = create_triggers(cursor, STANDING_TRIGGERS)
+        if not had_standings or replaced:
+            # Database from before TeamStanding existed (or with older
+            # triggers): fill it once
+            rebuild_team_standings()
+
+        had_counts = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='PlayerEventCount'").fetchone()
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS PlayerEventCount (
+            player_id INTEGER,
+            event_type TEXT,
+            count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (player_id, event_type)
+        ) WITHOUT ROWID
+        """)
+        create_triggers(cursor, EVENT_COUNT_TRIGGERS)
+        if not had_counts:
+            rebuild_player_event_counts()
+
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS RatingHistory (
+            match_id INTEGER,
+            team_key TEXT,
+            date TEXT NOT NULL,
+            team_id INTEGER,
+            opponent_id INTEGER,
+            rating_before REAL NOT NULL,
+            rating_after REAL NOT NULL,
+            PRIMARY KEY (match_id, team_key)
+        ) WITHOUT ROWID
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_rating_position ON RatingHistory (date, match_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_rating_team ON RatingHistory "
+                       "(team_key, date, match_id, rating_after)")
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS RatingState (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            dirty_date TEXT,
+            dirty_match INTEGER
+        )
+        """)
+        # A new RatingState starts fully dirty, so the first read replays everything
+        cursor.execute("INSERT OR IGNORE INTO RatingState (id, dirty_date, dirty_match) VALUES (1, '', 0)")
+        create_triggers(cursor, RATING_TRIGGERS)
+
+        had_search = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'SearchIndex'").fetchone()
+        cursor.execute("CREATE VIRTUAL TABLE IF NOT EXISTS SearchIndex USING fts5(text, tokenize='trigram')")
+        cursor.execute("CREATE TABLE IF NOT EXISTS SearchPending (key INTEGER PRIMARY KEY)")
+        had_words = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'SearchWords'").fetchone()
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS SearchWords (
+            key INTEGER,
+            words TEXT,
+            first INTEGER,      -- 1 if words is the whole name
+            PRIMARY KEY (key, words)
+        ) WITHOUT ROWID
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_search_words ON SearchWords (first, words, key)")
+        create_triggers(cursor, SEARCH_TRIGGERS)
+        cursor.execute("DROP TABLE IF EXISTS SearchPrefix")   # replaced by SearchWords
+        if not had_search or not had_words:
+            invalidate_search_index()
+
+
+# ---------------------------
+# --- Team Standings --------
+# ---------------------------
+# TeamStanding is a per-tournament, per-team summary of Match, kept current
+# by the triggers below on every insert/update/delete of a match (including
+# bulk executemany loads). The leaderboard reads it in O(teams) instead of
+# re-aggregating every match. A match without both scores (not played yet)
+# is not counted.
+
+def _standing_delta(side, sign):
+    # Upsert that adds (sign=1) or removes (sign=-1) one match row's
+    # contribution for team1 or team2 of NEW/OLD. A side without a team
+    # (e.g. a final whose opponent is not known yet) and an unplayed match
+    # are not counted.
+    row = "NEW" if sign > 0 else "OLD"
+    other = "team2" if side == "team1" else "team1"
+    gf = f"{row}.{side}_score"
+    ga = f"{row}.{other}_score"
+    return f"""
+        INSERT INTO TeamStanding (tournament_id, team_id, played, won, drawn, lost, goals_for, goals_against, points)
+        SELECT {row}.tournament_id, {row}.{side}_id, {sign}, {sign} * ({gf} > {ga}), {sign} * ({gf} = {ga}),
+               {sign} * ({gf} < {ga}), {sign} * {gf}, {sign} * {ga},
+               {sign} * (3 * ({gf} > {ga}) + ({gf} = {ga}))
+        WHERE {row}.{side}_id IS NOT NULL AND {row}.tournament_id IS NOT NULL
+          AND {row}.team1_score IS NOT NULL AND {row}.team2_score IS NOT NULL
+        ON CONFLICT (tournament_id, team_id) DO UPDATE SET
+            played = played + excluded.played,
+            won = won + excluded.won,
+            drawn = drawn + excluded.drawn,
+            lost = lost + excluded.lost,
+            goals_for = goals_for + excluded.goals_for,
+            goals_against = goals_against + excluded.goals_against,
+            points = points + excluded.points;"""
+
+
+STANDING_TRIGGERS = [
+    f"""CREATE TRIGGER IF NOT EXISTS trg_match_standing_insert AFTER INSERT ON Match BEGIN
+        {_standing_delta("team1", 1)}
+        {_standing_delta("team2", 1)}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_match_standing_delete AFTER DELETE ON Match BEGIN
+        {_standing_delta("team1", -1)}
+        {_standing_delta("team2", -1)}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_match_standing_update
+    AFTER UPDATE OF tournament_id, team1_id, team2_id, team1_score, team2_score ON Match BEGIN
+        {_standing_delta("team1", -1)}
+        {_standing_delta("team2", -1)}
+        {_standing_delta("team1", 1)}
+        {_standing_delta("team2", 1)}
+    END""",
+]
+
+
+def rebuild_team_standings():
+    # Recompute TeamStanding from scratch (recovery / after external edits)
+    with transaction() as cursor:
+        cursor.execute("DELETE FROM TeamStanding")
+        cursor.execute("""
+        INSERT INTO TeamStanding (tournament_id, team_id, played, won, drawn, lost, goals_for, goals_against, points)
+        SELECT tournament_id, team_id, COUNT(*), SUM(gf > ga), SUM(gf = ga), SUM(gf < ga),
+               SUM(gf), SUM(ga), SUM(3 * (gf > ga) + (gf = ga))
+        FROM (
+            SELECT tournament_id, team1_id AS team_id, team1_score AS gf, team2_score AS ga FROM Match
+            UNION ALL
+            SELECT tournament_id, team2_id, team2_score, team1_score FROM Match
+        )
+        WHERE team_id IS NOT NULL AND tournament_id IS NOT NULL AND gf IS NOT NULL AND ga IS NOT NULL
+        GROUP BY tournament_id, team_id
+        """)
+
+
+# ---------------------------
+# --- Player Event Counts ---
+# ---------------------------
+# PlayerEventCount holds how many events of each type every Player row has
+# (goals, assists, saves, ...), kept current by triggers on Event the same
+# way TeamStanding follows Match. Career totals then group Player rows
+# instead of scanning every event. Events without a player or type are not
+# counted.
+
+def _event_count_delta(sign):
+    row = "NEW" if sign > 0 else "OLD"
+    return f"""
+        INSERT INTO PlayerEventCount (player_id, event_type, count)
+        SELECT {row}.player_id, {row}.event_type, {sign}
+        WHERE {row}.player_id IS NOT NULL AND {row}.event_type IS NOT NULL
+        ON CONFLICT (player_id, event_type) DO UPDATE SET count = count + excluded.count;"""
+
+
+EVENT_COUNT_TRIGGERS = [
+    f"""CREATE TRIGGER IF NOT EXISTS trg_event_count_insert AFTER INSERT ON Event BEGIN
+        {_event_count_delta(1)}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_event_count_delete AFTER DELETE ON Event BEGIN
+        {_event_count_delta(-1)}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_event_count_update AFTER UPDATE OF player_id, event_type ON Event BEGIN
+        {_event_count_delta(-1)}
+        {_event_count_delta(1)}
+    END""",
+]
+
+
+def rebuild_player_event_counts():
+    # Recompute PlayerEventCount from scratch (recovery / after external edits)
+    with transaction() as cursor:
+        cursor.execute("DELETE FROM PlayerEventCount")
+        cursor.execute("""
+        INSERT INTO PlayerEventCount (player_id, event_type, count)
+        SELECT player_id, event_type, COUNT(*) FROM Event
+        WHERE player_id IS NOT NULL AND event_type IS NOT NULL
+        GROUP BY player_id, event_type
+        """)
+
+
+# ---------------------------
+# --- Rating Watermark ------
+# ---------------------------
+# RatingHistory holds every team's Elo rating before and after each match,
+# written by ratings.py in one chronological pass over Match (ordered by
+# (date, match_id), a NULL date sorting first as ''). A replay can't run in
+# a trigger, so the triggers below only lower a watermark in RatingState to
+# the earliest (date, match_id) whose ratings may have changed; the next
+# read replays from there, starting from each team's last row before it.
+# NULL = up to date, ('', 0) = replay everything.
+
+def _lower_watermark(date, match_id):
+    return f"""
+        UPDATE RatingState SET dirty_date = {date}, dirty_match = {match_id}
+        WHERE id = 1 AND (dirty_date IS NULL OR ({date}, {match_id}) < (dirty_date, dirty_match));"""
+
+
+_FIRST_MATCH_OF_TEAM = """(SELECT {} FROM Match WHERE team1_id = OLD.team_id OR team2_id = OLD.team_id
+                          ORDER BY COALESCE(date, ''), match_id LIMIT 1)"""
+
+RATING_TRIGGERS = [
+    f"""CREATE TRIGGER IF NOT EXISTS trg_match_rating_insert AFTER INSERT ON Match BEGIN
+        {_lower_watermark("COALESCE(NEW.date, '')", "NEW.match_id")}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_match_rating_delete AFTER DELETE ON Match BEGIN
+        {_lower_watermark("COALESCE(OLD.date, '')", "OLD.match_id")}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_match_rating_update
+    AFTER UPDATE OF date, team1_id, team2_id, team1_score, team2_score ON Match BEGIN
+        {_lower_watermark("COALESCE(OLD.date, '')", "OLD.match_id")}
+        {_lower_watermark("COALESCE(NEW.date, '')", "NEW.match_id")}
+    END""",
+    # Ratings follow team names across editions, so a rename (or a deleted
+    # team) changes everything from that team's first match on
+    f"""CREATE TRIGGER IF NOT EXISTS trg_team_rating_update AFTER UPDATE OF team_name ON Team BEGIN
+        {_lower_watermark(_FIRST_MATCH_OF_TEAM.format("COALESCE(date, '')"), _FIRST_MATCH_OF_TEAM.format("match_id"))}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_team_rating_delete AFTER DELETE ON Team BEGIN
+        {_lower_watermark(_FIRST_MATCH_OF_TEAM.format("COALESCE(date, '')"), _FIRST_MATCH_OF_TEAM.format("match_id"))}
+    END""",
+]
+
+
+def invalidate_ratings():
+    # Make the next read replay every rating from the first match
+    with transaction() as cursor:
+        cursor.execute("UPDATE RatingState SET dirty_date = '', dirty_match = 0 WHERE id = 1")
+
+
+# ---------------------------
+# --- Search Index ----------
+# ---------------------------
+# SearchIndex is an FTS5 table (trigram tokenizer) over player names, team
+# names, coach names and host countries with the accents folded away, keyed
+# by rowid = id * 4 + SEARCH_KINDS[kind]. Folding needs Python (SQLite 3.40
+# has no remove_diacritics for trigrams, and a replace() chain for every
+# accented letter is too deep for its parser), so like the ratings the
+# triggers only record the work: a changed or new name is queued in
+# SearchPending and its old entries dropped, and search.update_search_index()
+# folds the queued names (run before a search, or in the background by the
+# app). SearchWords holds every name folded and lowercased from each of its
+# words to the end ("ali muller" marked first, "muller"), so names that
+# start with the query, or have a word that does, are index range reads; it
+# also answers queries of 1-2 characters, which are too short for trigrams.
+SEARCH_KINDS = {"player": 0, "team": 1, "coach": 2, "host": 3}
+SEARCH_SOURCES = [("player", "Player", "player_id", "player_name"), ("team", "Team", "team_id", "team_name"),
+                  ("coach", "Team", "team_id", "coach_name"), ("host", "Tournament", "tournament_id", "host_country")]
+
+
+def _search_triggers():
+    triggers = []
+    for table in ("Player", "Team", "Tournament"):
+        sources = [(SEARCH_KINDS[kind], key, column) for kind, source, key, column in SEARCH_SOURCES
+                   if source == table]
+        key = sources[0][1]
+        queue = "".join(f"INSERT OR IGNORE INTO SearchPending VALUES (NEW.{key} * 4 + {code}); "
+                        for code, _, _ in sources)
+        drop = "".join(f"DELETE FROM SearchIndex WHERE rowid = OLD.{key} * 4 + {code}; "
+                       f"DELETE FROM SearchWords WHERE key = OLD.{key} * 4 + {code}; "
+                       for code, _, _ in sources)
+        unqueue = f"DELETE FROM SearchPending WHERE key BETWEEN OLD.{key} * 4 AND OLD.{key} * 4 + 3; "
+        columns = ", ".join(column for _, _, column in sources)
+        name = table.lower()
+        triggers += [
+            f"CREATE TRIGGER IF NOT EXISTS trg_{name}_search_insert AFTER INSERT ON {table} BEGIN {queue}END",
+            f"CREATE TRIGGER IF NOT EXISTS trg_{name}_search_delete AFTER DELETE ON {table} BEGIN "
+            f"{drop}{unqueue}END",
+            f"CREATE TRIGGER IF NOT EXISTS trg_{name}_search_update AFTER UPDATE OF {columns} ON {table} BEGIN "
+            f"{drop}{queue}END",
+        ]
+    return triggers
+
+
+SEARCH_TRIGGERS = _search_triggers()
+
+
+def invalidate_search_index():
+    # Empty the index and queue every name; the next search re-indexes them
+    with transaction() as cursor:
+        cursor.execute("DELETE FROM SearchIndex")
+        cursor.execute("DELETE FROM SearchWords")
+        cursor.execute("DELETE FROM SearchPending")
+        for kind, table, key, column in SEARCH_SOURCES:
+            cursor.execute(f"INSERT INTO SearchPending SELECT {key} * 4 + {SEARCH_KINDS[kind]} FROM {table} "
+                           f"WHERE {column} IS NOT NULL")
+
+
+def rebuild_summaries():
+    # Both trigger-maintained summary tables; the ratings and the search
+    # index are brought up to date on their next read
+    with transaction():
+        rebuild_team_standings()
+        rebuild_player_event_counts()
+        invalidate_search_index()
+        invalidate_ratings()
+
+
+SUMMARY_TRIGGER_NAMES = ["trg_match_standing_insert", "trg_match_standing_delete", "trg_match_standing_update",
+                         "trg_event_count_insert", "trg_event_count_delete", "trg_event_count_update",
+                         "trg_match_rating_insert", "trg_match_rating_delete", "trg_match_rating_update",
+                         "trg_team_rating_update", "trg_team_rating_delete",
+                         "trg_player_search_insert", "trg_player_search_delete", "trg_player_search_update",
+                         "trg_team_search_insert", "trg_team_search_delete", "trg_team_search_update",
+                         "trg_tournament_search_insert", "trg_tournament_search_delete",
+                         "trg_tournament_search_update"]
+
+
+@contextmanager
+def bulk_load():
+    # For large imports: drop the summary triggers and secondary indexes,
+    # and afterwards rebuild the indexes (one sorted build each instead of
+    # per-row inserts), recreate the triggers and rebuild both summaries
+    # once. All of it is one transaction, so a failure restores everything.
+    with transaction() as cursor:
+        for name in SUMMARY_TRIGGER_NAMES:
+            cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+        for name, _, _ in INDEXES:
+            cursor.execute(f"DROP INDEX IF EXISTS {name}")
+        yield cursor
+        for name, table, columns in INDEXES:
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})")
+        for trigger in STANDING_TRIGGERS + EVENT_COUNT_TRIGGERS + RATING_TRIGGERS + SEARCH_TRIGGERS:
+            cursor.execute(trigger)
+        rebuild_summaries()
+
+
+def query_plan(sql, params=()):
+    # The detail column of EXPLAIN QUERY PLAN, e.g. "SEARCH Team USING INDEX ..."
+    rows = get_connection().execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+    return [row[3] for row in rows]
+
+
+def table_scans(sql, params=()):
+    # Plan steps that read a whole table or index instead of searching it
+    return [step for step in query_plan(sql, params) if step.startswith("SCAN")]
@@ -0,0 +1,174 @@
+import argparse
+import time
+
+import db
+from crud import (add_tournaments_bulk, add_teams_bulk, add_players_bulk,
+                  add_matches_bulk, add_events_bulk)
+
+# -----------------------------
+# --- Synthetic Data ----------
+# -----------------------------
+# Reproducible, arbitrarily large datasets for load and scale testing, e.g.
+#   python generate.py --db big.db --tournaments 1000 --matches 100000 --events 10000000
+# Rows go through the bulk CRUD helpers (so the TeamStanding triggers and
+# change notifications behave exactly as in the app) in batches of
+# batch_size, one transaction per batch. Only one batch is held in memory at
+# a time. The same seed and sizes give the same data on an empty database.
+
+COUNTRIES = ["Argentina", "Australia", "Belgium", "Brazil", "Cameroon", "Canada", "Chile", "Colombia",
+             "Costa Rica", "Croatia", "Denmark", "Ecuador", "England", "France", "Germany", "Ghana",
+             "Iran", "Italy", "Japan", "Mexico", "Morocco", "Netherlands", "Nigeria", "Poland",
+             "Portugal", "Qatar", "Russia", "Saudi Arabia", "Senegal", "Serbia", "South Africa",
+             "South Korea", "Spain", "Sweden", "Switzerland", "Tunisia", "Uruguay", "USA", "Wales"]
+FIRST_NAMES = ["Luis", "Marco", "Thomas", "Kevin", "Diego", "Paul", "Ivan", "Sergio", "Ali", "Kim",
+               "Joao", "Lucas", "Hugo", "Carlos", "Andre", "Mohamed", "Yuto", "David", "Jan", "Leo"]
+LAST_NAMES = ["Silva", "Muller", "Garcia", "Rossi", "Kane", "Santos", "Martin", "Novak", "Diallo",
+              "Park", "Jensen", "Lopez", "Costa", "Fernandez", "Suzuki", "Hakimi", "Berg", "Dalic"]
+POSITIONS = ["Goalkeeper", "Defender", "Midfielder", "Forward"]
+POSITION_WEIGHTS = [3, 8, 7, 5]          # a 23-man squad
+STAGES = ["Group", "Round of 16", "Quarterfinal", "Semi-final", "Final"]
+STAGE_WEIGHTS = [48, 8, 4, 2, 1]
+EVENT_TYPES = ["Goal", "Assist", "Yellow Card", "Red Card", "Save", "Substitution"]
+EVENT_WEIGHTS = [25, 18, 30, 2, 20, 5]
+
+
+def _probabilities(weights):
+    import numpy as np
+    p = np.asarray(weights, dtype=float)
+    return p / p.sum()
+
+
+def generate_data(tournaments=1000, teams_per_tournament=32, players_per_team=23, matches=100_000,
+                  events=1_000_000, seed=0, batch_size=50_000, progress=None):
+    # Append a synthetic dataset to the current database and return the row
+    # counts. progress(table, done, total) is called after every batch.
+    import numpy as np
+    if events > 0 and matches < 1:
+        raise ValueError("events need matches: matches must be at least 1")
+    if events > 0 and players_per_team < 1:
+        raise ValueError("events need players: players_per_team must be at least 1")
+    if matches > 0 and (tournaments < 1 or teams_per_tournament < 2):
+        raise ValueError("matches need at least 1 tournament with at least 2 teams")
+    rng = np.random.default_rng(seed)
+    progress = progress or (lambda table, done, total: None)
+    db.init_db()
+
+    # --- Tournaments: one every 4 years from 1930 ---
+    hosts = rng.integers(0, len(COUNTRIES), tournaments)
+    winners = rng.integers(0, len(COUNTRIES), tournaments)
+    runners_up = (winners + rng.integers(1, len(COUNTRIES), tournaments)) % len(COUNTRIES)
+    tournament_ids = []
+    for start in range(0, tournaments, batch_size):
+        stop = min(start + batch_size, tournaments)
+        tournament_ids += add_tournaments_bulk(
+            (1930 + 4 * i, COUNTRIES[hosts[i]], COUNTRIES[winners[i]], COUNTRIES[runners_up[i]])
+            for i in range(start, stop))
+        progress("Tournament", stop, tournaments)
+    tournament_ids = np.asarray(tournament_ids, dtype=np.int64)
+
+    # --- Teams: teams_per_tournament per tournament, groups of 4 ---
+    # Teams (and players) are addressed by position: tournament t's teams are
+    # team_ids[t * teams_per_tournament + [0, teams_per_tournament)]
+    total_teams = tournaments * teams_per_tournament
+    team_names = [COUNTRIES[j % len(COUNTRIES)] + ("" if j < len(COUNTRIES) else f" {j // len(COUNTRIES) + 1}")
+                  for j in range(teams_per_tournament)]
+    team_ids = []
+    for start in range(0, total_teams, batch_size):
+        stop = min(start + batch_size, total_teams)
+        coaches = rng.integers(0, len(LAST_NAMES), stop - start)
+        team_ids += add_teams_bulk(
+            (team_names[k % teams_per_tournament], f"Coach {LAST_NAMES[coaches[k - start]]}",
+             chr(ord("A") + (k % teams_per_tournament) // 4 % 26), int(tournament_ids[k // teams_per_tournament]))
+            for k in range(start, stop))
+        progress("Team", stop, total_teams)
+
+    # --- Players: players_per_team per team ---
+    total_players = total_teams * players_per_team
+    position_p = _probabilities(POSITION_WEIGHTS)
+    team_ids = np.asarray(team_ids, dtype=np.int64)
+    player_ids = []
+    for start in range(0, total_players, batch_size):
+        stop = min(start + batch_size, total_players)
+        n = stop - start
+        first = rng.integers(0, len(FIRST_NAMES), n)
+        last = rng.integers(0, len(LAST_NAMES), n)
+        positions = rng.choice(len(POSITIONS), n, p=position_p)
+        player_ids += add_players_bulk(
+            (f"{FIRST_NAMES[first[i]]} {LAST_NAMES[last[i]]}", POSITIONS[positions[i]],
+             int(team_ids[(start + i) // players_per_team]))
+            for i in range(n))
+        progress("Player", stop, total_players)
+
+    # --- Matches and their events, streamed together per batch ---
+    player_ids = np.asarray(player_ids, dtype=np.int64)
+    # Events are spread evenly over matches and each event's player belongs
+    # to one of the two teams in its match.
+    stage_p = _probabilities(STAGE_WEIGHTS)
+    event_p = _probabilities(EVENT_WEIGHTS)
+    # events_per_match for every match, plus one more for the first `extra`
+    events_per_match, extra = divmod(events, matches) if matches else (0, 0)
+    matches_done = events_done = 0
+    for start in range(0, matches, batch_size):
+        stop = min(start + batch_size, matches)
+        n = stop - start
+        t = rng.integers(0, tournaments, n)
+        home = rng.integers(0, teams_per_tournament, n)
+        away = (home + rng.integers(1, max(teams_per_tournament, 2), n)) % teams_per_tournament
+        team1 = t * teams_per_tournament + home    # positions in team_ids
+        team2 = t * teams_per_tournament + away
+        scores = rng.poisson(1.3, (n, 2))
+        stages = rng.choice(len(STAGES), n, p=stage_p)
+        days = rng.integers(0, 30, n)
+        years = 1930 + 4 * t
+        match_ids = np.asarray(add_matches_bulk(
+            (f"{years[i]}-06-{days[i] + 1:02d}", STAGES[stages[i]], int(team_ids[team1[i]]), int(team_ids[team2[i]]),
+             int(scores[i, 0]), int(scores[i, 1]), int(tournament_ids[t[i]]))
+            for i in range(n)), dtype=np.int64)
+        matches_done = stop
+        progress("Match", matches_done, matches)
+
+        # Events for this batch of matches, themselves cut into batch_size rows
+        counts = events_per_match + (np.arange(start, stop) < extra)
+        owner = np.repeat(np.arange(n), counts)
+        for e_start in range(0, len(owner), batch_size):
+            m = owner[e_start:e_start + batch_size]
+            k = len(m)
+            side = np.where(rng.random(k) < 0.5, team1[m], team2[m])
+            players = player_ids[side * players_per_team + rng.integers(0, players_per_team, k)]
+            minutes = rng.integers(1, 91, k)
+            types = rng.choice(len(EVENT_TYPES), k, p=event_p)
+            add_events_bulk(
+                (int(match_ids[m[i]]), int(players[i]), int(minutes[i]), EVENT_TYPES[types[i]])
+                for i in range(k))
+            events_done += k
+            progress("Event", events_done, events)
+
+    return {"Tournament": tournaments, "Team": total_teams, "Player": total_players,
+            "Match": matches, "Event": events_done}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fill a database with synthetic tournament data")
+    parser.add_argument("--db", default=db.DB_PATH, help="database file (default: %(default)s); rows are appended")
+    parser.add_argument("--tournaments", type=int, default=1000)
+    parser.add_argument("--teams", type=int, default=32, help="teams per tournament")
+    parser.add_argument("--players", type=int, default=23, help="players per team")
+    parser.add_argument("--matches", type=int, default=100_000)
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--batch-size", type=int, default=50_000)
+    args = parser.parse_args()
+
+    db.configure_db(args.db)
+    start = time.perf_counter()
+
+    def report(table, done, total):
+        print(f"\r{table:<10} {done:>12,} / {total:,}", end="\n" if done == total else "", flush=True)
+
+    try:
+        counts = generate_data(args.tournaments, args.teams, args.players, args.matches, args.events,
+                               args.seed, args.batch_size, report)
+    except ValueError as e:
+        parser.error(str(e))
+    db.close_all_connections()
+    print(f"{sum(counts.values()):,} rows in {time.perf_counter() - start:.1f}s")
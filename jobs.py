@@ -0,0 +1,111 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, CancelledError, wait
+
+import db
+
+# -----------------------------
+# --- Background Jobs ---------
+# -----------------------------
+# Runs analysis work on a thread pool so the Tk main loop keeps painting.
+# Results are handed back on the main thread by polling with root.after(),
+# because Tkinter must only be touched from the thread that created it.
+
+
+class Job:
+    def __init__(self, key, on_done, on_error):
+        self.key = key
+        self.on_done = on_done
+        self.on_error = on_error
+        self.future = None
+        self.conn = None        # worker's connection while the job runs
+        self.running = False    # set and cleared under JobRunner._lock
+        self.cancelled = False
+
+
+class JobRunner:
+    POLL_MS = 50
+
+    def __init__(self, root, max_workers=2):
+        self.root = root
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="analysis")
+        self.jobs = {}
+        self._polling = False
+        self._lock = threading.Lock()
+
+    def is_running(self, key):
+        return key in self.jobs
+
+    def submit(self, key, compute, on_done, on_error=None):
+        # key identifies the request, e.g. ("leaderboard", 3). Submitting a key
+        # that is already running returns the pending job instead of starting
+        # a second one, so repeated clicks are coalesced.
+        job = self.jobs.get(key)
+        if job is not None:
+            return job
+        job = Job(key, on_done, on_error)
+        job.future = self.executor.submit(self._run, job, compute)
+        self.jobs[key] = job
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.POLL_MS, self._poll)
+        return job
+
+    def _run(self, job, compute):
+        with self._lock:
+            if job.cancelled:
+                raise CancelledError()
+            job.conn = db.get_connection()
+            job.running = True
+        try:
+            return compute()
+        finally:
+            with self._lock:
+                job.running = False
+                job.conn = None
+
+    def cancel(self, key):
+        # Forget the job so its callbacks never fire. A job that has not
+        # started is removed from the queue; a running SQLite statement is
+        # interrupted so the worker frees up quickly. The worker's connection
+        # is shared by the jobs it runs one after another, so it is only
+        # interrupted while this job is still the one running on it.
+        job = self.jobs.pop(key, None)
+        if job is None:
+            return
+        job.future.cancel()
+        with self._lock:
+            job.cancelled = True
+            if job.running:
+                job.conn.interrupt()
+
+    def cancel_all(self):
+        # Cancel every job and wait until the running ones have returned, e.g.
+        # before the whole database is replaced under them
+        futures = [job.future for job in self.jobs.values()]
+        for key in list(self.jobs):
+            self.cancel(key)
+        wait(futures)
+
+    def _poll(self):
+        for key, job in list(self.jobs.items()):
+            if not job.future.done():
+                continue
+            del self.jobs[key]
+            try:
+                result = job.future.result()
+            except CancelledError:
+                continue
+            except Exception as e:
+                if job.on_error is not None:
+                    job.on_error(e)
+                continue
+            job.on_done(result)
+        if self.jobs:
+            self.root.after(self.POLL_MS, self._poll)
+        else:
+            self._polling = False
+
+    def shutdown(self):
+        for key in list(self.jobs):
+            self.cancel(key)
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,162 @@
+import db
+from analysis import cached, read_frame, ALL
+
+# -----------------------------
+# --- Elo Ratings -------------
+# -----------------------------
+# World Football Elo style: every team (by name, across editions) starts at
+# INITIAL_RATING; after a match the winner takes
+#   K_FACTOR * margin multiplier * (result - expected result)
+# points from the loser, where expected = 1 / (1 + 10 ** (-difference / 400))
+# and a draw scores 0.5. Matches without a score, and matches of a team
+# (name) against itself, are skipped.
+#
+# update_ratings() streams Match in (date, match_id) order and stores each
+# team's rating before/after every match in RatingHistory. The triggers in
+# db.py keep a watermark at the earliest match a write may have changed, so
+# after adding or editing a match only the matches from that point on are
+# replayed, starting from every team's last stored rating before it (its
+# checkpoint). The readers below bring the ratings up to date first.
+
+INITIAL_RATING = 1500.0
+K_FACTOR = 60               # eloratings.net weight for World Cup matches
+CHUNK_ROWS = 10_000
+
+REPLAY_MATCHES_SQL = """
+SELECT m.match_id, COALESCE(m.date, '') AS date, m.team1_id, m.team2_id,
+       lower(trim(t1.team_name)), lower(trim(t2.team_name)), m.team1_score, m.team2_score
+FROM Match m
+JOIN Team t1 ON t1.team_id = m.team1_id
+JOIN Team t2 ON t2.team_id = m.team2_id
+WHERE (COALESCE(m.date, ''), m.match_id) >= (?, ?)
+  AND m.team1_score IS NOT NULL AND m.team2_score IS NOT NULL
+  AND lower(trim(t1.team_name)) <> lower(trim(t2.team_name))
+ORDER BY COALESCE(m.date, ''), m.match_id
+"""
+# Each team's last rating before the watermark, one index seek per team name
+CHECKPOINT_SQL = """
+SELECT k.team_key,
+       (SELECT r.rating_after FROM RatingHistory r
+        WHERE r.team_key = k.team_key AND (r.date, r.match_id) < (?1, ?2)
+        ORDER BY r.date DESC, r.match_id DESC LIMIT 1) AS rating
+FROM (SELECT DISTINCT lower(trim(team_name)) AS team_key FROM Team) k
+"""
+INSERT_RATING_SQL = """
+INSERT INTO RatingHistory (match_id, team_key, date, team_id, opponent_id, rating_before, rating_after)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def margin_multiplier(goal_difference):
+    goal_difference = abs(goal_difference)
+    if goal_difference <= 1:
+        return 1.0
+    if goal_difference == 2:
+        return 1.5
+    return 1.75 + (goal_difference - 3) / 8
+
+
+def expected_result(rating, opponent_rating):
+    return 1 / (1 + 10 ** ((opponent_rating - rating) / 400))
+
+
+def rating_change(rating1, rating2, score1, score2):
+    # Points team1 gains (team2 loses the same)
+    result = 1.0 if score1 > score2 else 0.5 if score1 == score2 else 0.0
+    return K_FACTOR * margin_multiplier(score1 - score2) * (result - expected_result(rating1, rating2))
+
+
+def update_ratings():
+    # Replay the matches from the watermark on; returns how many were replayed
+    with db.transaction() as cursor:
+        # Take the write lock first so the watermark can't move while we read it
+        cursor.execute("UPDATE RatingState SET dirty_date = dirty_date WHERE id = 1")
+        watermark = cursor.execute("SELECT dirty_date, dirty_match FROM RatingState WHERE id = 1").fetchone()
+        if watermark[0] is None:
+            return 0
+        cursor.execute("DELETE FROM RatingHistory WHERE (date, match_id) >= (?, ?)", watermark)
+        ratings = {key: rating for key, rating in cursor.execute(CHECKPOINT_SQL, watermark) if rating is not None}
+
+        matches = db.get_connection().execute(REPLAY_MATCHES_SQL, watermark)
+        replayed = 0
+        while True:
+            chunk = matches.fetchmany(CHUNK_ROWS)
+            if not chunk:
+                break
+            rows = []
+            for match_id, date, team1_id, team2_id, key1, key2, score1, score2 in chunk:
+                rating1 = ratings.get(key1, INITIAL_RATING)
+                rating2 = ratings.get(key2, INITIAL_RATING)
+                change = rating_change(rating1, rating2, score1, score2)
+                ratings[key1] = rating1 + change
+                ratings[key2] = rating2 - change
+                rows.append((match_id, key1, date, team1_id, team2_id, rating1, rating1 + change))
+                rows.append((match_id, key2, date, team2_id, team1_id, rating2, rating2 - change))
+            cursor.executemany(INSERT_RATING_SQL, rows)
+            replayed += len(chunk)
+        cursor.execute("UPDATE RatingState SET dirty_date = NULL, dirty_match = NULL WHERE id = 1")
+    return replayed
+
+
+def rebuild_ratings():
+    # Replay every match from scratch (recovery / after changing K_FACTOR)
+    db.invalidate_ratings()
+    return update_ratings()
+
+
+# --- Readers: bring the ratings up to date, then query RatingHistory ---
+# One pass over idx_rating_team for the totals, then a key lookup for each
+# team's latest row
+CURRENT_RATINGS_SQL = """
+SELECT l.team_key, t.team_name, ROUND(r.rating_after, 1) AS rating, l.matches,
+       ROUND(l.peak, 1) AS peak, l.last_match
+FROM (SELECT team_key, COUNT(*) AS matches, MAX(rating_after) AS peak, MAX(date) AS last_match
+      FROM RatingHistory GROUP BY team_key) l
+JOIN RatingHistory r ON r.team_key = l.team_key
+ AND r.match_id = (SELECT x.match_id FROM RatingHistory x WHERE x.team_key = l.team_key AND x.date = l.last_match
+                   ORDER BY x.match_id DESC LIMIT 1)
+JOIN Team t ON t.team_id = r.team_id
+ORDER BY rating DESC, t.team_name
+"""
+
+RATING_HISTORY_SQL = """
+SELECT r.date, r.match_id, m.stage, t.team_name, o.team_name AS opponent,
+       CASE WHEN m.team1_id = r.team_id THEN m.team1_score ELSE m.team2_score END AS goals_for,
+       CASE WHEN m.team1_id = r.team_id THEN m.team2_score ELSE m.team1_score END AS goals_against,
+       ROUND(r.rating_before, 1) AS rating_before, ROUND(r.rating_after, 1) AS rating_after,
+       ROUND(r.rating_after - r.rating_before, 1) AS change
+FROM RatingHistory r
+JOIN Match m ON m.match_id = r.match_id
+JOIN Team t ON t.team_id = r.team_id
+JOIN Team o ON o.team_id = r.opponent_id
+"""
+
+
+def current_ratings_query(limit=None):
+    sql, params = CURRENT_RATINGS_SQL, []
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(int(limit))
+    return sql, params
+
+
+def rating_history_query(team_names=None):
+    # Every rating change, or only those of the given team names
+    sql, params = RATING_HISTORY_SQL, []
+    if team_names:
+        sql += f" WHERE r.team_key IN ({', '.join('lower(trim(?))' for _ in team_names)})"
+        params.extend(team_names)
+    return sql + " ORDER BY r.date, r.match_id, t.team_name", params
+
+
+@cached(lambda *args, **kwargs: {("Team", ALL), ("Match", ALL)})
+def current_ratings(limit=None):
+    update_ratings()
+    return read_frame(*current_ratings_query(limit))
+
+
+@cached(lambda *args, **kwargs: {("Team", ALL), ("Match", ALL)})
+def rating_history(team_names=None):
+    # team_names: tuple of names (hashable, for the cache) or None for all
+    update_ratings()
+    return read_frame(*rating_history_query(team_names))
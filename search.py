@@ -0,0 +1,214 @@
+import difflib
+import unicodedata
+
+import db
+from db import SEARCH_KINDS, SEARCH_SOURCES
+
+# -----------------------------
+# --- Name Search -------------
+# -----------------------------
+# Search-as-you-type over player names, team names, coach names and host
+# countries, e.g. "mull" finds Müller and "aguero" finds Agüero. Names are
+# indexed in db.SearchIndex (FTS5, trigram tokenizer) with their accents
+# folded by fold_text(); the query is folded the same way, so matching is
+# case- and accent-insensitive.
+#
+# Up to CANDIDATES candidates are collected best kind first: names that
+# start with the query, then names with a later word that does (both range
+# reads on db.SearchWords, alphabetical, so an exact name comes first), then
+# names that contain the query anywhere (one trigram phrase, 3+ characters,
+# straight off the index). None of them scores every match, so the time
+# stays flat on a million players. The candidates are ordered exact name,
+# name-starts-with, word-starts-with, the rest, then shortest name.
+# No hit: fuzzy fallback, the rows that contain the start or the end of the
+# query ranked by difflib similarity, which survives one typo.
+#
+# search() brings the index up to date first (a write); the app instead
+# refreshes it on the job runner and calls search(..., refresh=False), so
+# typing only ever reads.
+
+CANDIDATES = 200
+MIN_SIMILARITY = 0.75   # difflib ratio of a fuzzy hit; one typo in five letters is 0.8
+SEARCH_COLUMNS = ["kind", "id", "name", "team_id", "team_name", "tournament_id", "year"]
+CODE_KINDS = {code: kind for kind, code in SEARCH_KINDS.items()}
+
+
+def _fold_map():
+    # Latin letters with diacritics -> ASCII, and combining marks -> ''
+    fold = {"ß": "ss", "æ": "ae", "Æ": "AE", "œ": "oe", "Œ": "OE", "ø": "o", "Ø": "O", "đ": "d", "Đ": "D",
+            "ł": "l", "Ł": "L", "ı": "i", "ð": "d", "Ð": "D", "þ": "th", "Þ": "TH"}
+    for code in range(0xC0, 0x250):
+        char = chr(code)
+        base = "".join(c for c in unicodedata.normalize("NFKD", char) if not unicodedata.combining(c))
+        if char not in fold and base != char and base.isascii() and base.isalpha():
+            fold[char] = base
+    for code in range(0x300, 0x370):
+        fold[chr(code)] = ""
+    return str.maketrans(fold)
+
+
+FOLD_TABLE = _fold_map()
+
+
+def fold_text(text):
+    return (text or "").translate(FOLD_TABLE)
+
+
+# --- Index maintenance: fold the names the triggers queued ---
+PENDING_NAMES_SQL = """
+SELECT p.key, x.{column} FROM SearchPending p JOIN {table} x ON x.{key} = p.key >> 2
+WHERE (p.key & 3) = {code} AND x.{column} IS NOT NULL
+"""
+
+
+def word_starts(folded):
+    # {lowercase name from each of its words to the end: 1 for the whole name}
+    words = folded.lower().split()
+    starts = {" ".join(words[i:]): 0 for i in range(1, len(words))}
+    starts[" ".join(words)] = 1
+    return starts
+
+
+def search_index_pending():
+    return db.get_connection().execute("SELECT 1 FROM SearchPending LIMIT 1").fetchone() is not None
+
+
+def update_search_index(chunk_rows=10_000):
+    # Index the queued names; returns how many were indexed
+    if not search_index_pending():
+        return 0
+    indexed = 0
+    with db.transaction() as cursor:
+        # Take the write lock first so no name is queued while we drain the queue
+        cursor.execute("DELETE FROM SearchPending WHERE key < 0")
+        for kind, table, key, column in SEARCH_SOURCES:
+            names = db.get_connection().execute(
+                PENDING_NAMES_SQL.format(table=table, key=key, column=column, code=SEARCH_KINDS[kind]))
+            while True:
+                chunk = names.fetchmany(chunk_rows)
+                if not chunk:
+                    break
+                folded = [(rowid, fold_text(name)) for rowid, name in chunk]
+                cursor.executemany("INSERT INTO SearchIndex (rowid, text) VALUES (?, ?)", folded)
+                cursor.executemany("INSERT OR IGNORE INTO SearchWords (key, words, first) VALUES (?, ?, ?)",
+                                   [(rowid, words, first) for rowid, text in folded
+                                    for words, first in word_starts(text).items()])
+                indexed += len(chunk)
+        cursor.execute("DELETE FROM SearchPending")
+    return indexed
+
+
+def rebuild_search_index():
+    # Re-index every name from scratch (recovery / after changing fold_text)
+    db.invalidate_search_index()
+    return update_search_index()
+
+
+# --- Queries ---
+def _phrase(text):
+    return '"' + text.replace('"', '""') + '"'
+
+
+def _kind_filter(kinds):
+    if not kinds:
+        return "", []
+    codes = [SEARCH_KINDS[kind] for kind in kinds]
+    return f" AND rowid % 4 IN ({', '.join('?' * len(codes))})", codes
+
+
+def _word_start_hits(cursor, query, kinds, first):
+    # Names that start with query (first=1), or with a later word that does
+    upper = query[:-1] + chr(ord(query[-1]) + 1)
+    where, params = _kind_filter(kinds)
+    return cursor.execute(f"SELECT rowid, text FROM SearchIndex WHERE rowid IN "
+                          f"(SELECT key FROM SearchWords WHERE first = ? AND words >= ? AND words < ?"
+                          f"{where.replace('rowid', 'key')} ORDER BY words LIMIT ?)",
+                          [first, query, upper] + params + [CANDIDATES]).fetchall()
+
+
+def _substring_hits(cursor, query, kinds):
+    where, params = _kind_filter(kinds)
+    return cursor.execute(f"SELECT rowid, text FROM SearchIndex WHERE SearchIndex MATCH ?{where} LIMIT ?",
+                          [_phrase(query)] + params + [CANDIDATES]).fetchall()
+
+
+def _hits(cursor, query, kinds):
+    # Up to CANDIDATES (rowid, text): names that start with the query, then
+    # names with a word that does, then names that contain it
+    hits = dict(_word_start_hits(cursor, query, kinds, first=1))
+    if len(hits) < CANDIDATES:
+        hits.update(_word_start_hits(cursor, query, kinds, first=0))
+    if len(hits) < CANDIDATES and len(query) >= 3:
+        hits.update(_substring_hits(cursor, query, kinds))
+
+    def relevance(row):
+        text = row[1].lower()
+        return (text != query, not text.startswith(query), " " + query not in " " + text, len(text), text)
+    return sorted(list(hits.items())[:CANDIDATES], key=relevance)
+
+
+def _fuzzy_hits(cursor, query, kinds):
+    size = max(3, len(query) // 2)
+    pieces = {query[:size], query[-size:]}
+    where, params = _kind_filter(kinds)
+    rows = cursor.execute(f"SELECT rowid, text FROM SearchIndex WHERE SearchIndex MATCH ?{where} LIMIT ?",
+                          [" OR ".join(_phrase(p) for p in sorted(pieces))] + params + [CANDIDATES]).fetchall()
+    # SequenceMatcher caches what it knows about its second sequence (the
+    # query); names repeat across editions, so each is scored once
+    matcher = difflib.SequenceMatcher(b=query)
+    similarities = {}
+    scored = []
+    for rowid, text in rows:
+        if text not in similarities:
+            # Best match of the query against the whole name or any single word
+            similarity = 0
+            for word in [text.lower()] + text.lower().split():
+                matcher.set_seq1(word)
+                if matcher.real_quick_ratio() >= MIN_SIMILARITY and matcher.quick_ratio() >= MIN_SIMILARITY:
+                    similarity = max(similarity, matcher.ratio())
+            similarities[text] = similarity
+        if similarities[text] >= MIN_SIMILARITY:
+            scored.append((-similarities[text], len(text), rowid, text))
+    return [(rowid, text) for _, _, rowid, text in sorted(scored)]
+
+
+RESOLVE_SQL = {
+    "player": """SELECT p.player_id, p.player_name, t.team_id, t.team_name, tr.tournament_id, tr.year
+                 FROM Player p LEFT JOIN Team t ON t.team_id = p.team_id
+                 LEFT JOIN Tournament tr ON tr.tournament_id = t.tournament_id WHERE p.player_id IN ({ids})""",
+    "team": """SELECT t.team_id, t.team_name, t.team_id, t.team_name, tr.tournament_id, tr.year
+               FROM Team t LEFT JOIN Tournament tr ON tr.tournament_id = t.tournament_id WHERE t.team_id IN ({ids})""",
+    "coach": """SELECT t.team_id, t.coach_name, t.team_id, t.team_name, tr.tournament_id, tr.year
+                FROM Team t LEFT JOIN Tournament tr ON tr.tournament_id = t.tournament_id WHERE t.team_id IN ({ids})""",
+    "host": """SELECT tournament_id, host_country, NULL, NULL, tournament_id, year
+               FROM Tournament WHERE tournament_id IN ({ids})""",
+}
+
+
+def _resolve(cursor, rowids):
+    # rowids -> SEARCH_COLUMNS rows, in the same order
+    by_kind = {}
+    for rowid in rowids:
+        by_kind.setdefault(CODE_KINDS[rowid % 4], []).append(rowid // 4)
+    found = {}
+    for kind, ids in by_kind.items():
+        sql = RESOLVE_SQL[kind].format(ids=", ".join("?" * len(ids)))
+        for row in cursor.execute(sql, ids):
+            found[row[0] * 4 + SEARCH_KINDS[kind]] = (kind,) + row
+    return [found[rowid] for rowid in rowids if rowid in found]
+
+
+def search(text, kinds=None, limit=20, refresh=True):
+    # SEARCH_COLUMNS rows for the best `limit` matches of text; kinds limits
+    # the result to some of "player", "team", "coach", "host". refresh=False
+    # searches the index as it is (read-only).
+    query = " ".join(fold_text(text).lower().split())
+    if not query:
+        return []
+    if refresh:
+        update_search_index()
+    cursor = db.get_connection().cursor()
+    hits = _hits(cursor, query, kinds)
+    if not hits and len(query) >= 3:
+        hits = _fuzzy_hits(cursor, query, kinds)
+    return _resolve(cursor, [rowid for rowid, _ in hits[:limit]])
@@ -0,0 +1,488 @@
+import hashlib
+import os
+import sqlite3
+from functools import lru_cache
+
+import db
+from db import transaction
+from crud import (PRIMARY_KEYS, add_tournament, add_teams_bulk, add_players_bulk,
+                  add_matches_bulk, add_events_bulk)
+
+# -----------------------------
+# --- Seed Data ---------------
+# -----------------------------
+# FIFA 2010-2022 preset, loaded through the bulk helpers inside a single
+# transaction so the whole dataset costs one commit.
+def load_seed_data():
+    with transaction():
+        ##DATA SET
+        # -----------------------------
+        # --- Tournaments -------------
+        # -----------------------------
+        tid2010 = add_tournament(2010, "South Africa", "Spain", "Netherlands")
+        tid2014 = add_tournament(2014, "Brazil", "Germany", "Argentina")
+        tid2018 = add_tournament(2018, "Russia", "France", "Croatia")
+        tid2022 = add_tournament(2022, "Qatar", "Argentina", "France")
+
+        # -----------------------------
+        # --- Teams -------------------
+        # -----------------------------
+        # 2010
+        (t2010_spain, t2010_netherlands, t2010_germany, t2010_uruguay, t2010_ghana, t2010_brazil, t2010_argentina, t2010_england, t2010_france, t2010_italy) = add_teams_bulk([
+            ("Spain", "Vicente del Bosque", "H", tid2010),
+            ("Netherlands", "Bert van Marwijk", "E", tid2010),
+            ("Germany", "Joachim Löw", "D", tid2010),
+            ("Uruguay", "Óscar Tabárez", "A", tid2010),
+            ("Ghana", "Milovan Rajevac", "D", tid2010),
+            ("Brazil", "Dunga", "G", tid2010),
+            ("Argentina", "Diego Maradona", "B", tid2010),
+            ("England", "Fabio Capello", "C", tid2010),
+            ("France", "Raymond Domenech", "A", tid2010),
+            ("Italy", "Marcello Lippi", "F", tid2010),
+        ])
+
+        # 2014
+        (t2014_germany, t2014_argentina, t2014_brazil, t2014_netherlands, t2014_belgium, t2014_france, t2014_chile, t2014_colombia, t2014_mexico, t2014_uruguay) = add_teams_bulk([
+            ("Germany", "Joachim Löw", "G", tid2014),
+            ("Argentina", "Alejandro Sabella", "F", tid2014),
+            ("Brazil", "Luiz Felipe Scolari", "A", tid2014),
+            ("Netherlands", "Louis van Gaal", "B", tid2014),
+            ("Belgium", "Marc Wilmots", "H", tid2014),
+            ("France", "Didier Deschamps", "E", tid2014),
+            ("Chile", "Jorge Sampaoli", "D", tid2014),
+            ("Colombia", "José Pekerman", "C", tid2014),
+            ("Mexico", "Miguel Herrera", "A", tid2014),
+            ("Uruguay", "Óscar Tabárez", "B", tid2014),
+        ])
+
+        # 2018
+        (t2018_france, t2018_croatia, t2018_belgium, t2018_england, t2018_brazil, t2018_russia, t2018_sweden, t2018_uruguay, t2018_portugal, t2018_spain) = add_teams_bulk([
+            ("France", "Didier Deschamps", "C", tid2018),
+            ("Croatia", "Zlatko Dalić", "D", tid2018),
+            ("Belgium", "Roberto Martínez", "G", tid2018),
+            ("England", "Gareth Southgate", "G", tid2018),
+            ("Brazil", "Tite", "E", tid2018),
+            ("Russia", "Stanislav Cherchesov", "A", tid2018),
+            ("Sweden", "Jan Andersson", "F", tid2018),
+            ("Uruguay", "Óscar Tabárez", "A", tid2018),
+            ("Portugal", "Fernando Santos", "B", tid2018),
+            ("Spain", "Fernando Hierro", "B", tid2018),
+        ])
+
+        # 2022
+        (t2022_argentina, t2022_france, t2022_croatia, t2022_morocco, t2022_brazil, t2022_england, t2022_portugal, t2022_netherlands, t2022_germany, t2022_spain) = add_teams_bulk([
+            ("Argentina", "Lionel Scaloni", "C", tid2022),
+            ("France", "Didier Deschamps", "D", tid2022),
+            ("Croatia", "Zlatko Dalić", "F", tid2022),
+            ("Morocco", "Walid Regragui", "F", tid2022),
+            ("Brazil", "Tite", "G", tid2022),
+            ("England", "Gareth Southgate", "B", tid2022),
+            ("Portugal", "Fernando Santos", "H", tid2022),
+            ("Netherlands", "Louis van Gaal", "A", tid2022),
+            ("Germany", "Hansi Flick", "E", tid2022),
+            ("Spain", "Luis Enrique", "D", tid2022),
+        ])
+
+
+        # -----------------------------
+        # --- Players -----------------
+        # -----------------------------
+        p2010_players = add_players_bulk([
+            ("Andres Iniesta", "Midfielder", t2010_spain),
+            ("Iker Casillas", "Goalkeeper", t2010_spain),
+            ("Xavi", "Midfielder", t2010_spain),
+            ("David Villa", "Forward", t2010_spain),
+            ("Wesley Sneijder", "Midfielder", t2010_netherlands),
+            ("Robin van Persie", "Forward", t2010_netherlands),
+            ("Rafael van der Vaart", "Midfielder", t2010_netherlands),
+            ("Arjen Robben", "Forward", t2010_netherlands),
+            ("Miroslav Klose", "Forward", t2010_germany),
+            ("Thomas Müller", "Forward", t2010_germany),
+            ("Lukas Podolski", "Forward", t2010_germany),
+            ("Diego Forlán", "Forward", t2010_uruguay),
+            ("Luis Suárez", "Forward", t2010_uruguay),
+            ("Edinson Cavani", "Forward", t2010_uruguay),
+            ("Asamoah Gyan", "Forward", t2010_ghana),
+            ("Kevin-Prince Boateng", "Midfielder", t2010_ghana),
+            ("Kaka", "Midfielder", t2010_brazil),
+            ("Neymar", "Forward", t2010_brazil),
+            ("Lionel Messi", "Forward", t2010_argentina),
+            ("Sergio Agüero", "Forward", t2010_argentina),
+            ("Wayne Rooney", "Forward", t2010_england),
+            ("Frank Lampard", "Midfielder", t2010_england),
+            ("Franck Ribéry", "Midfielder", t2010_france),
+            ("Karim Benzema", "Forward", t2010_france),
+            ("Gianluigi Buffon", "Goalkeeper", t2010_italy),
+            ("Andrea Pirlo", "Midfielder", t2010_italy),
+            ("Daniele De Rossi", "Midfielder", t2010_italy),
+            ("Thiago Silva", "Defender", t2010_brazil),
+            ("Xabi Alonso", "Midfielder", t2010_spain),
+            ("David Beckham", "Midfielder", t2010_england),
+        ])
+
+
+
+
+        # 2014 Germany & Argentina & others
+        p2014_players = add_players_bulk([
+            # Germany
+            ("Mario Götze", "Forward", t2014_germany),
+            ("Manuel Neuer", "Goalkeeper", t2014_germany),
+            ("Toni Kroos", "Midfielder", t2014_germany),
+            ("Philipp Lahm", "Defender", t2014_germany),
+            ("Thomas Müller", "Forward", t2014_germany),
+            ("Mats Hummels", "Defender", t2014_germany),
+            ("Bastian Schweinsteiger", "Midfielder", t2014_germany),
+            # Argentina
+            ("Lionel Messi", "Forward", t2014_argentina),
+            ("Sergio Agüero", "Forward", t2014_argentina),
+            ("Gonzalo Higuaín", "Forward", t2014_argentina),
+            ("Ezequiel Lavezzi", "Midfielder", t2014_argentina),
+            ("Javier Mascherano", "Midfielder", t2014_argentina),
+            ("Sergio Romero", "Goalkeeper", t2014_argentina),
+            # Brazil
+            ("Neymar", "Forward", t2014_brazil),
+            ("Hulk", "Forward", t2014_brazil),
+            ("Oscar", "Midfielder", t2014_brazil),
+            ("Thiago Silva", "Defender", t2014_brazil),
+            ("David Luiz", "Defender", t2014_brazil),
+            ("Julio Cesar", "Goalkeeper", t2014_brazil),
+            # Netherlands
+            ("Robin van Persie", "Forward", t2014_netherlands),
+            ("Wesley Sneijder", "Midfielder", t2014_netherlands),
+            ("Arjen Robben", "Forward", t2014_netherlands),
+            ("Daryl Janmaat", "Defender", t2014_netherlands),
+            ("Maarten Stekelenburg", "Goalkeeper", t2014_netherlands),
+            # Belgium
+            ("Eden Hazard", "Forward", t2014_belgium),
+            ("Kevin De Bruyne", "Midfielder", t2014_belgium),
+            ("Vincent Kompany", "Defender", t2014_belgium),
+            # France
+            ("Antoine Griezmann", "Forward", t2014_france),
+            ("Paul Pogba", "Midfielder", t2014_france),
+            ("Hugo Lloris", "Goalkeeper", t2014_france),
+        ])
+
+        # 2018 France & Croatia & others
+        p2018_players = add_players_bulk([
+            # France
+            ("Kylian Mbappé", "Forward", t2018_france),
+            ("Antoine Griezmann", "Forward", t2018_france),
+            ("Paul Pogba", "Midfielder", t2018_france),
+            ("N'Golo Kanté", "Midfielder", t2018_france),
+            ("Hugo Lloris", "Goalkeeper", t2018_france),
+            ("Raphaël Varane", "Defender", t2018_france),
+            ("Samuel Umtiti", "Defender", t2018_france),
+            # Croatia
+            ("Luka Modric", "Midfielder", t2018_croatia),
+            ("Ivan Rakitic", "Midfielder", t2018_croatia),
+            ("Mario Mandzukic", "Forward", t2018_croatia),
+            ("Danijel Subasic", "Goalkeeper", t2018_croatia),
+            ("Dejan Lovren", "Defender", t2018_croatia),
+            ("Domagoj Vida", "Defender", t2018_croatia),
+            # Belgium
+            ("Eden Hazard", "Forward", t2018_belgium),
+            ("Romelu Lukaku", "Forward", t2018_belgium),
+            ("Kevin De Bruyne", "Midfielder", t2018_belgium),
+            ("Thibaut Courtois", "Goalkeeper", t2018_belgium),
+            ("Jan Vertonghen", "Defender", t2018_belgium),
+            # England
+            ("Harry Kane", "Forward", t2018_england),
+            ("Raheem Sterling", "Forward", t2018_england),
+            ("Jordan Henderson", "Midfielder", t2018_england),
+            ("Jordan Pickford", "Goalkeeper", t2018_england),
+            ("Harry Maguire", "Defender", t2018_england),
+            # Brazil
+            ("Neymar", "Forward", t2018_brazil),
+            ("Philippe Coutinho", "Midfielder", t2018_brazil),
+            ("Marcelo", "Defender", t2018_brazil),
+            ("Alisson Becker", "Goalkeeper", t2018_brazil),
+            # Russia
+            ("Artem Dzyuba", "Forward", t2018_russia),
+            ("Igor Akinfeev", "Goalkeeper", t2018_russia),
+            ("Denis Cheryshev", "Midfielder", t2018_russia),
+        ])
+
+        # 2022 Argentina & France & others
+        p2022_players = add_players_bulk([
+            # Argentina
+            ("Lionel Messi", "Forward", t2022_argentina),
+            ("Paulo Dybala", "Forward", t2022_argentina),
+            ("Enzo Fernández", "Midfielder", t2022_argentina),
+            ("Emiliano Martínez", "Goalkeeper", t2022_argentina),
+            ("Rodrigo De Paul", "Midfielder", t2022_argentina),
+            ("Lautaro Martínez", "Forward", t2022_argentina),
+            ("Nicolás Otamendi", "Defender", t2022_argentina),
+            # France
+            ("Kylian Mbappé", "Forward", t2022_france),
+            ("Antoine Griezmann", "Forward", t2022_france),
+            ("Paul Pogba", "Midfielder", t2022_france),
+            ("Hugo Lloris", "Goalkeeper", t2022_france),
+            ("Raphaël Varane", "Defender", t2022_france),
+            ("Olivier Giroud", "Forward", t2022_france),
+            # Croatia
+            ("Luka Modric", "Midfielder", t2022_croatia),
+            ("Ivan Perišić", "Forward", t2022_croatia),
+            ("Domagoj Vida", "Defender", t2022_croatia),
+            ("Lovre Kalinić", "Goalkeeper", t2022_croatia),
+            # Morocco
+            ("Achraf Hakimi", "Defender", t2022_morocco),
+            ("Youssef En-Nesyri", "Forward", t2022_morocco),
+            ("Sofyan Amrabat", "Midfielder", t2022_morocco),
+            ("Yassine Bounou", "Goalkeeper", t2022_morocco),
+            # Brazil
+            ("Neymar", "Forward", t2022_brazil),
+            ("Vinicius Jr.", "Forward", t2022_brazil),
+            ("Casemiro", "Midfielder", t2022_brazil),
+            # England
+            ("Harry Kane", "Forward", t2022_england),
+            ("Phil Foden", "Midfielder", t2022_england),
+            ("Jordan Pickford", "Goalkeeper", t2022_england),
+            # Portugal
+            ("Cristiano Ronaldo", "Forward", t2022_portugal),
+            ("Bruno Fernandes", "Midfielder", t2022_portugal),
+            ("Rui Patricio", "Goalkeeper", t2022_portugal),
+        ])
+
+        # -----------------------------
+        # --- Matches -----------------
+        # -----------------------------
+        m2010_matches = add_matches_bulk([
+            ("2010-06-11", "Group", t2010_spain, t2010_netherlands, 1, 0, tid2010),
+            ("2010-06-12", "Group", t2010_uruguay, t2010_germany, 0, 0, tid2010),
+            ("2010-06-13", "Group", t2010_ghana, t2010_brazil, 1, 2, tid2010),
+            ("2010-06-14", "Group", t2010_argentina, t2010_england, 2, 1, tid2010),
+            ("2010-06-15", "Group", t2010_france, t2010_italy, 0, 0, tid2010),
+            ("2010-06-20", "Round of 16", t2010_spain, t2010_ghana, 1, 0, tid2010),
+            ("2010-06-21", "Round of 16", t2010_germany, t2010_uruguay, 4, 2, tid2010),
+            ("2010-06-25", "Quarterfinal", t2010_spain, t2010_germany, 1, 0, tid2010),
+            ("2010-07-07", "Semifinal", t2010_netherlands, t2010_uruguay, 3, 2, tid2010),
+            ("2010-07-11", "Final", t2010_spain, t2010_netherlands, 1, 0, tid2010),
+        ])
+
+        # 2014 Germany tournament matches
+        (m2014_1, m2014_2, m2014_3, m2014_4, m2014_5, m2014_6, m2014_7, m2014_8, m2014_9, m2014_10) = add_matches_bulk([
+            ("2014-06-12", "Group", t2014_brazil, t2014_mexico, 3, 1, tid2014),
+            ("2014-06-13", "Group", t2014_mexico, t2014_netherlands, 1, 0, tid2014),
+            ("2014-06-14", "Group", t2014_brazil, t2014_netherlands, 1, 5, tid2014),
+            ("2014-06-15", "Group", t2014_germany, t2014_argentina, 4, 0, tid2014),
+            ("2014-06-16", "Group", t2014_argentina, t2014_germany, 2, 1, tid2014),
+            ("2014-06-17", "Round of 16", t2014_brazil, t2014_chile, 1, 1, tid2014),
+            ("2014-06-18", "Round of 16", t2014_colombia, t2014_uruguay, 2, 0, tid2014),
+            ("2014-07-08", "Semi-final", t2014_germany, t2014_brazil, 7, 1, tid2014),
+            ("2014-07-09", "Semi-final", t2014_argentina, t2014_netherlands, 0, 0, tid2014),
+            ("2014-07-13", "Final", t2014_germany, t2014_argentina, 1, 0, tid2014),
+        ])
+
+
+        # 2018 Russia tournament matches
+        (m2018_1, m2018_2, m2018_3, m2018_4, m2018_5, m2018_6, m2018_7, m2018_8, m2018_9, m2018_10) = add_matches_bulk([
+            ("2018-06-14", "Group", t2018_russia, t2018_spain, 5, 0, tid2018),
+            ("2018-06-15", "Group", t2018_france, t2018_uruguay, 0, 1, tid2018),
+            ("2018-06-16", "Group", t2018_portugal, t2018_spain, 3, 3, tid2018),
+            ("2018-06-17", "Group", t2018_france, t2018_belgium, 2, 1, tid2018),
+            ("2018-06-18", "Group", t2018_france, t2018_brazil, 1, 1, tid2018),
+            ("2018-06-19", "Group", t2018_brazil, t2018_russia, 1, 1, tid2018),
+            ("2018-06-20", "Round of 16", t2018_france, t2018_russia, 4, 3, tid2018),
+            ("2018-06-21", "Round of 16", t2018_uruguay, t2018_portugal, 2, 1, tid2018),
+            ("2018-07-14", "Semi-final", t2018_france, t2018_belgium, 1, 0, tid2018),
+            ("2018-07-15", "Final", t2018_france, t2018_croatia, 4, 2, tid2018),
+        ])
+
+
+            # 2022 Qatar tournament matches
+        (m2022_1, m2022_2, m2022_3, m2022_4, m2022_5, m2022_6, m2022_7, m2022_8, m2022_9, m2022_10) = add_matches_bulk([
+            ("2022-11-20", "Group", t2022_netherlands, t2022_england, 0, 2, tid2022),
+            ("2022-11-21", "Group", t2022_england, t2022_portugal, 6, 2, tid2022),
+            ("2022-11-22", "Group", t2022_brazil, t2022_netherlands, 0, 2, tid2022),
+            ("2022-11-23", "Group", t2022_spain, t2022_netherlands, 1, 1, tid2022),
+            ("2022-11-24", "Group", t2022_argentina, t2022_germany, 1, 2, tid2022),
+            ("2022-11-25", "Group", t2022_croatia, t2022_argentina, 0, 0, tid2022),
+            ("2022-12-03", "Round of 16", t2022_argentina, t2022_portugal, 2, 1, tid2022),
+            ("2022-12-04", "Round of 16", t2022_france, t2022_croatia, 3, 1, tid2022),
+            ("2022-12-17", "Semi-final", t2022_argentina, t2022_croatia, 3, 0, tid2022),
+            ("2022-12-18", "Final", t2022_argentina, t2022_france, 3, 3, tid2022),
+        ])
+
+
+
+        # -----------------------------
+        # --- Key Events --------------
+        # -----------------------------
+        add_events_bulk([
+            (m2010_matches[0], p2010_players[0], 54, "Goal"),
+            (m2010_matches[1], p2010_players[9], 77, "Goal"),
+            (m2010_matches[2], p2010_players[17], 23, "Goal"),
+            (m2010_matches[3], p2010_players[19], 45, "Goal"),
+            (m2010_matches[4], p2010_players[25], 12, "Save"),
+            (m2010_matches[5], p2010_players[0], 88, "Goal"),
+            (m2010_matches[6], p2010_players[8], 60, "Goal"),
+            (m2010_matches[7], p2010_players[0], 116, "Goal"),
+            (m2010_matches[8], p2010_players[4], 55, "Goal"),
+            (m2010_matches[9], p2010_players[0], 116, "Goal"),
+        ])
+
+            # -----------------------------
+        # --- Key Events 2014 ---------
+        # -----------------------------
+        add_events_bulk([
+            (m2014_1, p2014_players[0], 29, "Goal"),    # Mario Götze
+            (m2014_1, p2014_players[7], 45, "Goal"),    # Lionel Messi
+            (m2014_2, p2014_players[13], 60, "Save"),   # Neymar
+            (m2014_3, p2014_players[18], 12, "Goal"),   # Robin van Persie
+            (m2014_4, p2014_players[2], 75, "Assist"),  # Toni Kroos
+            (m2014_5, p2014_players[8], 88, "Goal"),    # Sergio Agüero
+            (m2014_6, p2014_players[21], 34, "Goal"),   # Arjen Robben
+        ])
+
+        # -----------------------------
+        # --- Key Events 2018 ---------
+        # -----------------------------
+        add_events_bulk([
+            (m2018_1, p2018_players[0], 18, "Goal"),     # Kylian Mbappé
+            (m2018_1, p2018_players[7], 28, "Assist"),   # Luka Modric
+            (m2018_2, p2018_players[12], 35, "Goal"),    # Eden Hazard
+            (m2018_3, p2018_players[16], 42, "Goal"),    # Harry Kane
+            (m2018_4, p2018_players[20], 50, "Assist"),  # Neymar
+            (m2018_5, p2018_players[3], 68, "Goal"),     # Antoine Griezmann
+            (m2018_6, p2018_players[1], 90, "Save"),     # Hugo Lloris
+        ])
+
+        # -----------------------------
+        # --- Key Events 2022 ---------
+        # -----------------------------
+        add_events_bulk([
+            (m2022_1, p2022_players[0], 23, "Goal"),     # Lionel Messi
+            (m2022_1, p2022_players[7], 45, "Goal"),     # Kylian Mbappé
+            (m2022_2, p2022_players[10], 60, "Assist"),  # Enzo Fernández
+            (m2022_3, p2022_players[14], 70, "Goal"),    # Antoine Griezmann
+            (m2022_4, p2022_players[20], 80, "Goal"),    # Luka Modric
+            (m2022_5, p2022_players[17], 88, "Save"),    # Hugo Lloris
+            (m2022_6, p2022_players[3], 115, "Goal"),    # Emiliano Martínez
+        ])
+
+
+# -----------------------------
+# --- Seed Snapshot -----------
+# -----------------------------
+# The preset is built once into SEED_SNAPSHOT and copied into the live
+# database with the SQLite backup API. Both files record the seed version
+# (a hash of the rows load_seed_data() writes) in a SeedInfo table, so the
+# snapshot is rebuilt only when the preset data changes. The live database
+# is filled from it only when it holds no data yet, or when the user asks
+# (Reset to Seed Data, `cli.py init --seed`); a database with the user's
+# edits is never replaced behind their back.
+SEED_SNAPSHOT = "tournament_seed.db"   # kept next to the live database
+
+
+def snapshot_path():
+    return os.path.join(os.path.dirname(os.path.abspath(db.DB_PATH)), SEED_SNAPSHOT)
+
+
+def data_digest(conn):
+    # Hash of every row of the data tables, in primary key order
+    digest = hashlib.sha256()
+    for table, key in PRIMARY_KEYS.items():
+        for row in conn.execute(f"SELECT * FROM {table} ORDER BY {key}"):
+            digest.update(repr(row).encode())
+    return digest.hexdigest()[:16]
+
+
+def _build_seed(conn):
+    # Schema and preset on a private connection (db.DB_PATH and the other
+    # threads' connections are left alone)
+    with db.use_connection(conn):
+        db.init_db()
+        load_seed_data()
+
+
+@lru_cache(maxsize=1)
+def seed_version():
+    # Digest of the preset, built in a throwaway in-memory database
+    conn = sqlite3.connect(":memory:", isolation_level=None)
+    try:
+        _build_seed(conn)
+        return data_digest(conn)
+    finally:
+        conn.close()
+
+
+def _read_only(path, query):
+    # First row of query on an existing database file, or None
+    if not os.path.exists(path):
+        return None
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        return conn.execute(query).fetchone()
+    except sqlite3.DatabaseError:
+        return None
+    finally:
+        conn.close()
+
+
+def stored_seed_version(path):
+    # Seed version a database file was built from, or None
+    row = _read_only(path, "SELECT version FROM SeedInfo")
+    return row[0] if row else None
+
+
+def has_data(path):
+    # Whether the database file holds any tournament, team, player, match or event
+    query = " UNION ALL ".join(f"SELECT 1 FROM {table}" for table in PRIMARY_KEYS) + " LIMIT 1"
+    return _read_only(path, query) is not None
+
+
+def build_seed_snapshot(path=None):
+    # Write the preset to a fresh database file (atomically replaces path)
+    path = path or snapshot_path()
+    tmp_path = path + ".tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    # The snapshot is a single self-contained file, so no WAL
+    conn = sqlite3.connect(tmp_path, isolation_level=None)
+    try:
+        conn.execute("PRAGMA journal_mode=DELETE")
+        _build_seed(conn)
+        conn.execute("CREATE TABLE SeedInfo (version TEXT)")
+        conn.execute("INSERT INTO SeedInfo VALUES (?)", (seed_version(),))
+    finally:
+        conn.close()
+    os.replace(tmp_path, path)
+    return path
+
+
+def ensure_seed_snapshot(path=None):
+    # Rebuild the snapshot file only when the preset data changed
+    path = path or snapshot_path()
+    if stored_seed_version(path) != seed_version():
+        build_seed_snapshot(path)
+    return path
+
+
+def restore_seed_snapshot(path=None):
+    # Overwrite the live database with the snapshot, page by page. The backup
+    # holds the write lock while it copies, and the pooled connections see the
+    # new pages on their next statement, so they stay open; callers with
+    # background jobs stop those first (JobRunner.cancel_all).
+    path = ensure_seed_snapshot(path)
+    src = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    dst = sqlite3.connect(db.DB_PATH)
+    try:
+        src.backup(dst)
+    finally:
+        src.close()
+        dst.close()
+    db.init_db()   # migrate: indexes/tables added since the snapshot was built
+    for table in PRIMARY_KEYS:
+        db.publish(table, "reset", None)
+
+
+def ensure_seeded_db(path=None, force=False):
+    # Fill the live database from the snapshot when it holds no data yet.
+    # force=True (an explicit request) also replaces existing data, unless
+    # it already is the current preset. Returns True if the database was reset.
+    if not has_data(db.DB_PATH) or (force and stored_seed_version(db.DB_PATH) != seed_version()):
+        restore_seed_snapshot(path)
+        return True
+    db.init_db()
+    return False
@@ -0,0 +1,245 @@
+import argparse
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import db
+from analysis import cached, read_rows, ALL
+
+# -----------------------------
+# --- Monte Carlo Forecast ----
+# -----------------------------
+# Replays a tournament many times from its groups (Team.group_name) to
+# estimate how often each team wins its group, reaches every knockout round
+# and takes the title, e.g.
+#   python simulate.py --tournament 4 --simulations 1000000
+#
+# Model: goals are Poisson. A team's attack and defence are its goals for /
+# against per match over every edition (by team name, from TeamStanding),
+# relative to the average and shrunk towards 1 by PRIOR_MATCHES, so
+# expected goals of i against j = mean * attack[i] * defence[j].
+# Groups: round robin, ranked by points, goal difference, goals for, then
+# lots; the top ADVANCE of each group go through. Knockout: group winners
+# are the top seeds in a standard bracket (byes go to the best seeds when
+# the qualifiers are not a power of two), and a group winner's first
+# opponent is the runner-up of the neighbouring group. A draw goes to extra
+# time (a third of the rates), then a 50/50 shoot-out.
+#
+# Every shard of SHARD_SIZE simulations is a vectorised NumPy run with its
+# own generator from SeedSequence(seed).spawn(), and shards are spread over a
+# process pool. The shards depend only on (simulations, seed), so the result
+# is the same for any number of workers.
+
+PRIOR_MATCHES = 5           # pseudo-matches of average form added to each team
+DEFAULT_MEAN_GOALS = 1.3    # per team per match, when there are no results yet
+ADVANCE = 2
+SHARD_SIZE = 50_000
+POINTS_KEY = 1_000_000      # ranking key = points, then goal difference, then goals for
+GD_KEY = 1_000
+
+FORECAST_TEAMS_SQL = """
+SELECT t.team_id, t.team_name, COALESCE(t.group_name, '-') AS group_name,
+       COALESCE(h.played, 0), COALESCE(h.goals_for, 0), COALESCE(h.goals_against, 0)
+FROM Team t
+LEFT JOIN (SELECT lower(trim(x.team_name)) AS team_key, SUM(s.played) AS played,
+                  SUM(s.goals_for) AS goals_for, SUM(s.goals_against) AS goals_against
+           FROM Team x JOIN TeamStanding s ON s.tournament_id = x.tournament_id AND s.team_id = x.team_id
+           GROUP BY lower(trim(x.team_name))) h ON h.team_key = lower(trim(t.team_name))
+WHERE t.tournament_id = ?
+ORDER BY group_name, t.team_id
+"""
+MEAN_GOALS_SQL = "SELECT SUM(goals_for) * 1.0 / SUM(played) FROM TeamStanding"
+
+
+def fit_model(tournament_id):
+    # {"team_id", "team_name", "group_name", "attack", "defence": per team,
+    #  "rates": expected goals matrix, "groups": [team indices per group]}
+    import numpy as np
+    _, rows = read_rows(FORECAST_TEAMS_SQL, (tournament_id,))
+    if len(rows) < 2:
+        raise ValueError(f"tournament {tournament_id} needs at least two teams to simulate")
+    mean = get_mean_goals()
+    team_id, team_name, group_name, played, goals_for, goals_against = (list(c) for c in zip(*rows))
+    played = np.asarray(played, dtype=float)
+    expected = (played + PRIOR_MATCHES) * mean
+    attack = (np.asarray(goals_for, dtype=float) + PRIOR_MATCHES * mean) / expected
+    defence = (np.asarray(goals_against, dtype=float) + PRIOR_MATCHES * mean) / expected
+    groups = {}
+    for i, name in enumerate(group_name):
+        groups.setdefault(name, []).append(i)
+    return {"team_id": team_id, "team_name": team_name, "group_name": group_name,
+            "attack": attack, "defence": defence, "rates": mean * np.outer(attack, defence),
+            "groups": list(groups.values())}
+
+
+def get_mean_goals():
+    mean = db.get_connection().execute(MEAN_GOALS_SQL).fetchone()[0]
+    return mean or DEFAULT_MEAN_GOALS
+
+
+def bracket_order(size):
+    # Seed (0 = best) in each bracket slot; slots 2k and 2k+1 meet in round one
+    order = [0]
+    while len(order) < size:
+        order = [s for seed in order for s in (seed, 2 * len(order) - 1 - seed)]
+    return order
+
+
+def knockout_seeds(groups, advance=ADVANCE):
+    # (group, finishing place) for seeds 0, 1, ...: every group winner, then
+    # the other qualifiers place by place, ordered so that winner g meets the
+    # runner-up of group g^1 when the bracket is exactly 2 x groups
+    seeds = [(g, 0) for g in range(len(groups))]
+    for place in range(1, advance):
+        for g in reversed(range(len(groups))):
+            partner = g ^ 1 if g ^ 1 < len(groups) else g
+            if place < len(groups[partner]):
+                seeds.append((partner, place))
+    return seeds
+
+
+def round_names(bracket_size):
+    # Column for "reached the round with n teams left", n = bracket_size ... 2
+    names = {2: "final", 4: "semi_final", 8: "quarterfinal"}
+    rounds = []
+    n = bracket_size
+    while n >= 2:
+        rounds.append(names.get(n, f"round_of_{n}"))
+        n //= 2
+    return rounds
+
+
+def _knockout(rng, rates, a, b):
+    # Whether a beats b (arrays of team indices)
+    goals_a = rng.poisson(rates[a, b])
+    goals_b = rng.poisson(rates[b, a])
+    a_wins = goals_a > goals_b
+    # Extra time and penalties only for the drawn matches
+    level = goals_a == goals_b
+    a, b = a[level], b[level]
+    extra_a = rng.poisson(rates[a, b] / 3)
+    extra_b = rng.poisson(rates[b, a] / 3)
+    a_wins[level] = (extra_a > extra_b) | ((extra_a == extra_b) & (rng.random(len(a)) < 0.5))
+    return a_wins
+
+
+def simulate_shard(model, simulations, seed_sequence, advance=ADVANCE):
+    # One vectorised batch; returns an int64 array [stage, team] of how many
+    # simulations each team reached: 0 = won its group, 1 = qualified,
+    # then one row per later round, last row = champion
+    import numpy as np
+    rng = np.random.default_rng(seed_sequence)
+    rates, groups = model["rates"], model["groups"]
+    n_teams = len(rates)
+    seeds = knockout_seeds(groups, advance)
+    bracket_size = 1
+    while bracket_size < len(seeds):
+        bracket_size *= 2
+    counts = np.zeros((len(round_names(bracket_size)) + 2, n_teams), dtype=np.int64)
+
+    # --- Group stage: ranked[g][:, place] = team index ---
+    ranked = []
+    for members in groups:
+        members = np.asarray(members)
+        k = len(members)
+        points = np.zeros((simulations, k), dtype=np.int64)
+        goal_difference = np.zeros((simulations, k), dtype=np.int64)
+        goals_for = np.zeros((simulations, k), dtype=np.int64)
+        for i in range(k):
+            for j in range(i + 1, k):
+                gi = rng.poisson(rates[members[i], members[j]], simulations)
+                gj = rng.poisson(rates[members[j], members[i]], simulations)
+                points[:, i] += 3 * (gi > gj) + (gi == gj)
+                points[:, j] += 3 * (gj > gi) + (gi == gj)
+                goal_difference[:, i] += gi - gj
+                goal_difference[:, j] += gj - gi
+                goals_for[:, i] += gi
+                goals_for[:, j] += gj
+        key = points * POINTS_KEY + goal_difference * GD_KEY + goals_for + rng.random((simulations, k))
+        ranked.append(members[np.argsort(-key, axis=1)])
+        counts[0] += np.bincount(ranked[-1][:, 0], minlength=n_teams)
+
+    # --- Knockout: slots hold team indices, -1 for a bye ---
+    slots = np.full((simulations, bracket_size), -1, dtype=np.int64)
+    for slot, seed in enumerate(bracket_order(bracket_size)):
+        if seed < len(seeds):
+            group, place = seeds[seed]
+            slots[:, slot] = ranked[group][:, place]
+    stage = 1
+    while slots.shape[1] > 1:
+        counts[stage] += np.bincount(slots[slots >= 0], minlength=n_teams)
+        a, b = slots[:, 0::2], slots[:, 1::2]
+        a_wins = np.ones(a.shape, dtype=bool)
+        played = (a >= 0) & (b >= 0)
+        a_wins[a < 0] = False
+        a_wins[played] = _knockout(rng, rates, a[played], b[played])
+        slots = np.where(a_wins, a, b)
+        stage += 1
+    counts[stage] += np.bincount(slots[:, 0], minlength=n_teams)
+    return counts
+
+
+def _shards(simulations, seed, shard_size):
+    import numpy as np
+    sizes = [shard_size] * (simulations // shard_size)
+    if simulations % shard_size:
+        sizes.append(simulations % shard_size)
+    return list(zip(sizes, np.random.SeedSequence(seed).spawn(len(sizes))))
+
+
+def simulate(model, simulations=100_000, seed=0, workers=None, shard_size=SHARD_SIZE, advance=ADVANCE):
+    # Sum of simulate_shard() over every shard, run on `workers` processes
+    # (default: one per CPU, capped at the number of shards)
+    if simulations < 1:
+        raise ValueError("simulations must be at least 1")
+    shards = _shards(simulations, seed, shard_size)
+    workers = min(workers or os.cpu_count() or 1, len(shards))
+    if workers <= 1:
+        results = [simulate_shard(model, n, s, advance) for n, s in shards]
+    else:
+        # spawn: never fork a process that holds SQLite connections and threads
+        with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            results = list(pool.map(simulate_shard, [model] * len(shards), *zip(*shards),
+                                    [advance] * len(shards)))
+    return sum(results)
+
+
+@cached(lambda *args, **kwargs: {("Team", ALL), ("Match", ALL)})
+def tournament_forecast(tournament_id, simulations=100_000, seed=0, workers=None):
+    # DataFrame: one row per team with attack/defence and the probability of
+    # winning the group, qualifying, reaching each round and the title,
+    # sorted by title chance
+    import pandas as pd
+    if simulations < 1:
+        raise ValueError("simulations must be at least 1")
+    model = fit_model(tournament_id)
+    counts = simulate(model, simulations, seed, workers)
+    stages = ["win_group", "qualify"] + round_names(2 ** (len(counts) - 2))[1:] + ["champion"]
+    df = pd.DataFrame({"team_id": model["team_id"], "team_name": model["team_name"],
+                       "group_name": model["group_name"],
+                       "attack": model["attack"].round(3), "defence": model["defence"].round(3)})
+    for name, row in zip(stages, counts):
+        df[name] = row / simulations
+    return df.sort_values(["champion", "qualify"], ascending=False, ignore_index=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Monte Carlo forecast of a tournament")
+    parser.add_argument("--db", default=db.DB_PATH, help="database file (default: %(default)s)")
+    parser.add_argument("--tournament", type=int, required=True)
+    parser.add_argument("--simulations", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, help="processes (default: one per CPU)")
+    args = parser.parse_args()
+    if args.simulations < 1:
+        parser.error("--simulations must be at least 1")
+
+    db.configure_db(args.db)
+    db.init_db()
+    start = time.perf_counter()
+    forecast = tournament_forecast.__wrapped__(args.tournament, args.simulations, args.seed, args.workers)
+    elapsed = time.perf_counter() - start
+    db.close_all_connections()
+    print(forecast.drop(columns=["team_id"]).to_string(index=False, float_format=lambda v: f"{v:.4f}"))
+    print(f"{args.simulations:,} simulations in {elapsed:.1f}s ({args.simulations / elapsed:,.0f}/s)")
@@ -0,0 +1,18 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import db  # noqa: E402
+
+
+@pytest.fixture
+def fresh_db(tmp_path):
+    # An empty schema in a temporary file; the previous database is restored afterwards
+    original_path = db.DB_PATH
+    db.configure_db(str(tmp_path / "test.db"))
+    db.init_db()
+    yield db
+    db.configure_db(original_path)
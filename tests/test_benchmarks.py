@@ -0,0 +1,31 @@
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+import benchmark as suite  # noqa: E402  (not the pytest-benchmark fixture)
+import db  # noqa: E402
+from generate import generate_data  # noqa: E402
+
+# benchmark.py's analysis metrics under pytest-benchmark, on the suite's
+# 10,000-match data set. Compare two commits with
+#   pytest tests/test_benchmarks.py --benchmark-autosave
+#   pytest tests/test_benchmarks.py --benchmark-compare --benchmark-compare-fail=median:50%
+MATCHES = 10_000
+CASES = suite.analysis_cases()
+
+
+@pytest.fixture(scope="module")
+def suite_db(tmp_path_factory):
+    original_path = db.DB_PATH
+    db.configure_db(str(tmp_path_factory.mktemp("suite") / "suite.db"))
+    db.init_db()
+    generate_data(tournaments=suite.SUITE_TOURNAMENTS, matches=MATCHES, events=MATCHES * 10, seed=0)
+    yield db
+    db.configure_db(original_path)
+
+
+@pytest.mark.benchmark(group="analysis")
+@pytest.mark.parametrize("name", CASES)
+def test_analysis(benchmark, suite_db, name):
+    func, args = CASES[name]
+    benchmark.pedantic(func, args, rounds=5, warmup_rounds=1)
@@ -0,0 +1,54 @@
+import pandas as pd
+
+import analysis
+import crud
+
+
+def _knockout(final_winner="Team 7"):
+    tid = crud.add_tournament(2006, "Germany", final_winner, None)
+    team = {n: crud.add_team(f"Team {n}", "Coach", None, tid) for n in range(1, 9)}
+    ids = {}
+    # Free-text stages as they appear in real data; drawn matches have no
+    # winner by score, so the winner is the team that plays the next round
+    for key, date, stage, t1, t2, s1, s2 in [
+            ("qf1", "07-01", "Quarter-finals", 1, 2, 2, 1), ("qf2", "07-01", "quarterfinal", 3, 4, 1, 1),
+            ("qf3", "07-02", "Quarter final", 5, 6, 0, 3), ("qf4", "07-02", "QUARTERFINAL", 7, 8, 2, 0),
+            ("sf1", "07-04", "Semi-final", 1, 4, 1, 0), ("sf2", "07-05", "semifinal", 6, 7, 2, 2),
+            ("third", "07-08", "Third place", 4, 6, 3, 1), ("final", "07-09", "Final", 1, 7, 1, 1)]:
+        ids[key] = crud.add_match(f"2006-{date}", stage, team[t1], team[t2], s1, s2, tid)
+    crud.add_match("2006-06-10", "Group A", team[1], team[2], 0, 0, tid)
+    return tid, ids
+
+
+def test_bracket_is_rebuilt_from_free_text_stages(fresh_db):
+    tid, ids = _knockout()
+    board = analysis.knockout_bracket(tid).set_index("match_id")
+
+    assert set(board.index) == {ids[k] for k in ("qf1", "qf2", "qf3", "qf4", "sf1", "sf2", "final")}
+    assert board.loc[ids["qf2"], "stage"] == "Quarterfinal"
+    assert board.loc[ids["sf2"], "stage"] == "Semi-final"
+    winners = {key: board.loc[ids[key], "winner"] for key in ("qf1", "qf2", "qf3", "qf4", "sf1", "sf2", "final")}
+    assert winners == {"qf1": "Team 1", "qf2": "Team 4", "qf3": "Team 6", "qf4": "Team 7",
+                       "sf1": "Team 1", "sf2": "Team 7", "final": "Team 7"}
+
+    parents = board["parent_id"].to_dict()
+    assert [parents[ids[k]] for k in ("qf1", "qf2", "qf3", "qf4", "sf1", "sf2")] == [
+        ids["sf1"], ids["sf1"], ids["sf2"], ids["sf2"], ids["final"], ids["final"]]
+    assert board["parent_id"].isna().sum() == 1
+
+
+def test_bracket_layout_puts_each_match_between_its_feeders(fresh_db):
+    tid, ids = _knockout()
+    board = analysis.knockout_bracket(tid).set_index("match_id")
+
+    assert board["x"].to_dict() == {ids["qf1"]: 0, ids["qf2"]: 0, ids["qf3"]: 0, ids["qf4"]: 0,
+                                    ids["sf1"]: 1, ids["sf2"]: 1, ids["final"]: 2}
+    assert [board.loc[ids[k], "y"] for k in ("qf1", "qf2", "qf3", "qf4")] == [0, 1, 2, 3]
+    assert board.loc[ids["sf1"], "y"] == 0.5
+    assert board.loc[ids["final"], "y"] == 1.5
+
+
+def test_drawn_final_without_a_recorded_winner_is_left_open(fresh_db):
+    tid, ids = _knockout(final_winner=None)
+    board = analysis.knockout_bracket(tid).set_index("match_id")
+    assert pd.isna(board.loc[ids["final"], "winner"])
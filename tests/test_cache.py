@@ -0,0 +1,83 @@
+import pytest
+
+import analysis
+import crud
+
+
+@pytest.fixture
+def cache(fresh_db):
+    analysis.clear_cache()
+    yield analysis
+    analysis.clear_cache()
+
+
+def test_read_only_arrays_are_shared_and_frames_are_copied(cache):
+    tid = crud.add_tournament(2022, "Qatar", None, None)
+    brazil = crud.add_team("Brazil", "Tite", "G", tid)
+    serbia = crud.add_team("Serbia", "Stojković", "G", tid)
+    crud.add_match("2022-11-24", "Group G", brazil, serbia, 2, 0, tid)
+
+    first, second = analysis.head_to_head(), analysis.head_to_head()
+    assert second["played"] is first["played"]
+    assert not second["played"].flags.writeable
+
+    board = analysis.compute_leaderboard(tid)
+    board.loc[:, "points"] = 99
+    assert analysis.compute_leaderboard(tid)["points"].tolist() == [3, 0]
+    assert analysis.cache_info()["hits"] >= 2
+
+
+def _hit(func, *args):
+    # Whether calling func(*args) was served from the cache
+    hits = analysis.cache_info()["hits"]
+    func(*args)
+    return analysis.cache_info()["hits"] > hits
+
+
+def _edition(year, stages):
+    tid = crud.add_tournament(year, "Host", None, None)
+    home = crud.add_team(f"Home {year}", "Coach", "A", tid)
+    away = crud.add_team(f"Away {year}", "Coach", "A", tid)
+    return tid, [crud.add_match(f"{year}-06-{day + 10}", stage, home, away, 1, 0, tid)
+                 for day, stage in enumerate(stages)]
+
+
+def test_editing_one_edition_keeps_the_others_cached(cache):
+    t2010, _ = _edition(2010, ["Group A"])
+    t2014, (match_2014,) = _edition(2014, ["Group A"])
+    for tid in (t2010, t2014):
+        assert not _hit(cache.compute_leaderboard, tid)
+    cache.head_to_head()
+
+    crud.edit_match(match_2014, team1_score=3)
+    assert _hit(cache.compute_leaderboard, t2010)
+    assert not _hit(cache.compute_leaderboard, t2014)
+    assert cache.compute_leaderboard(t2014)["goals_for"].max() == 3
+    # The all-time matrices depend on every edition
+    assert not _hit(cache.head_to_head)
+
+
+def test_group_edits_keep_the_bracket_cached(cache):
+    tid, (group, final) = _edition(2018, ["Group A", "Final"])
+    assert not _hit(cache.knockout_bracket, tid)
+    assert not _hit(cache.group_standings, tid)
+
+    crud.edit_match(group, team1_score=2)
+    assert _hit(cache.knockout_bracket, tid)
+    assert not _hit(cache.group_standings, tid)
+
+    crud.edit_match(final, team1_score=0, team2_score=1)
+    assert not _hit(cache.knockout_bracket, tid)
+    assert cache.knockout_bracket(tid)["winner"].tolist() == ["Away 2018"]
+
+
+def test_a_card_drops_the_group_table_of_its_edition_only(cache):
+    t2010, (match_2010,) = _edition(2010, ["Group A"])
+    t2014, _ = _edition(2014, ["Group A"])
+    for tid in (t2010, t2014):
+        cache.group_standings(tid)
+
+    player = crud.add_player("Booked", "DF", crud.view_teams(t2010)[0][0])
+    crud.add_event(match_2010, player, 10, "Red Card")
+    assert not _hit(cache.group_standings, t2010)
+    assert _hit(cache.group_standings, t2014)
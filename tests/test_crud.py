@@ -0,0 +1,38 @@
+import crud
+import db
+
+
+def _rows(table, key, ids):
+    sql = f"SELECT * FROM {table} WHERE {key}=?"
+    return [db.get_connection().execute(sql, (row_id,)).fetchone()[1:] for row_id in ids]
+
+
+def test_bulk_ids_belong_to_the_inserted_rows(fresh_db):
+    tid = crud.add_tournament(2022, "Qatar", "Argentina", "France")
+    # A row with an explicit key and a deleted one leave gaps in the sequence
+    db.get_connection().execute("INSERT INTO Team (team_id, team_name, tournament_id) VALUES (50, 'Fixed', ?)",
+                                (tid,))
+    crud.delete_team(crud.add_team("Gone", None, None, tid))
+
+    teams = [("Argentina", "Scaloni", "C", tid), ("France", "Deschamps", "D", tid), ("Morocco", "Regragui", "F", tid)]
+    team_ids = crud.add_teams_bulk(teams)
+    assert len(set(team_ids)) == 3
+    assert _rows("Team", "team_id", team_ids) == teams
+
+    # Rows are read lazily, so another insert can land between two of them
+    players = [("Messi", "FW", team_ids[0]), ("Mbappé", "FW", team_ids[1])]
+    def lazily():
+        yield players[0]
+        crud.add_player("Substitute", "MF", team_ids[2])
+        yield players[1]
+    player_ids = crud.add_players_bulk(lazily())
+    assert _rows("Player", "player_id", player_ids) == players
+
+    matches = [("2022-12-18", "Final", team_ids[0], team_ids[1], 3, 3, tid),
+               ("2022-12-14", "Semi-final", team_ids[1], team_ids[2], 2, 0, tid)]
+    match_ids = crud.add_matches_bulk(matches)
+    assert _rows("Match", "match_id", match_ids) == matches
+
+    events = [(match_ids[0], player_ids[1], 80, "Goal"), (match_ids[0], player_ids[0], 23, "Goal")]
+    assert _rows("Event", "event_id", crud.add_events_bulk(events)) == events
+    assert crud.add_events_bulk([]) == []
@@ -0,0 +1,29 @@
+import pytest
+
+import db
+import generate
+
+
+@pytest.mark.parametrize("sizes", [dict(matches=0, events=10), dict(players_per_team=0),
+                                   dict(teams_per_tournament=1), dict(tournaments=0)])
+def test_impossible_sizes_are_rejected_before_writing(fresh_db, sizes):
+    arguments = dict(tournaments=2, teams_per_tournament=4, players_per_team=3, matches=5, events=10)
+    with pytest.raises(ValueError):
+        generate.generate_data(**dict(arguments, **sizes))
+    assert db.get_connection().execute("SELECT count(*) FROM Tournament").fetchone()[0] == 0
+
+
+def test_event_players_belong_to_the_teams_of_their_match(fresh_db):
+    counts = generate.generate_data(tournaments=3, teams_per_tournament=4, players_per_team=3, matches=20,
+                                    events=55, batch_size=7)
+    assert counts == {"Tournament": 3, "Team": 12, "Player": 36, "Match": 20, "Event": 55}
+    conn = db.get_connection()
+    assert conn.execute("""
+        SELECT count(*) FROM Event e
+        JOIN Match m ON m.match_id = e.match_id
+        JOIN Player p ON p.player_id = e.player_id
+        JOIN Team t ON t.team_id = p.team_id
+        WHERE p.team_id IN (m.team1_id, m.team2_id) AND t.tournament_id = m.tournament_id
+          AND m.team1_id != m.team2_id
+    """).fetchone()[0] == 55
+    assert generate.generate_data(tournaments=1, matches=0, events=0)["Event"] == 0
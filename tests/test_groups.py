@@ -0,0 +1,56 @@
+import analysis
+import crud
+
+
+def _group_tournament():
+    tid = crud.add_tournament(2022, "Qatar", None, None)
+    team = {name: crud.add_team(name, "Coach", group, tid)
+            for name, group in [("Alpha", "A"), ("Bravo", "A"), ("Charlie", "A"), ("Delta", "A"),
+                                ("Echo", "B"), ("Foxtrot", "B"), ("Hotel", "C"), ("Golf", "C")]}
+    matches = {}
+    for group, home, away, s1, s2 in [
+            ("A", "Alpha", "Bravo", 1, 0), ("A", "Alpha", "Charlie", 0, 1), ("A", "Alpha", "Delta", 1, 1),
+            ("A", "Bravo", "Charlie", 1, 0), ("A", "Bravo", "Delta", 1, 1), ("A", "Charlie", "Delta", 0, 0),
+            ("B", "Echo", "Foxtrot", 0, 0), ("C", "Hotel", "Golf", 0, 0)]:
+        matches[home, away] = crud.add_match("2022-11-20", f"Group {group}", team[home], team[away], s1, s2, tid)
+    booked = crud.add_player("Echo Player", "MF", team["Echo"])
+    crud.add_event(matches["Echo", "Foxtrot"], booked, 30, "Yellow Card")
+    return tid, team, matches
+
+
+def _table(board, group):
+    rows = board[board["group_name"] == group]
+    return list(zip(rows["team_name"], rows["points"], rows["decided_by"]))
+
+
+def test_fifa_tiebreakers(fresh_db):
+    tid, _, _ = _group_tournament()
+    board = analysis.group_standings(tid)
+
+    # Alpha and Bravo are level on points, goal difference and goals for;
+    # Alpha won the match between them. Charlie scored fewer goals.
+    assert _table(board, "A") == [("Alpha", 4, ""), ("Bravo", 4, "h2h_points"),
+                                  ("Charlie", 4, "goals_for"), ("Delta", 3, "points")]
+    assert _table(board, "B") == [("Foxtrot", 1, ""), ("Echo", 1, "fair_play")]
+    assert _table(board, "C") == [("Golf", 1, ""), ("Hotel", 1, "lots")]
+    assert board["position"].tolist() == [1, 2, 3, 4, 1, 2, 1, 2]
+
+
+def test_mini_table_only_counts_matches_inside_the_level_block(fresh_db):
+    tid, _, _ = _group_tournament()
+    board = analysis.group_standings(tid).set_index("team_name")
+    assert board.loc["Alpha", ["h2h_points", "h2h_goal_difference"]].tolist() == [3, 1]
+    assert board.loc["Bravo", ["h2h_points", "h2h_goal_difference"]].tolist() == [0, -1]
+    # Charlie is not level with them, so its wins do not enter the mini-table
+    assert board.loc["Charlie", "h2h_points"] == 0
+
+
+def test_what_if_reranks_only_the_edited_group(fresh_db):
+    tid, _, matches = _group_tournament()
+    board = analysis.group_what_if(tid, matches["Alpha", "Bravo"], 0, 1)
+
+    assert set(board["group_name"]) == {"A"}
+    assert board[["team_name", "position", "actual_position"]].values.tolist() == [
+        ["Bravo", 1, 2], ["Charlie", 2, 3], ["Delta", 3, 4], ["Alpha", 4, 1]]
+    # Nothing was written
+    assert _table(analysis.group_standings(tid), "A")[0] == ("Alpha", 4, "")
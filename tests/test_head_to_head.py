@@ -0,0 +1,22 @@
+import analysis
+import crud
+
+
+def test_matrices_merge_editions_by_team_name(fresh_db):
+    for year, (s1, s2) in [(2014, (1, 7)), (2018, (2, 2)), (2022, (None, None))]:
+        tid = crud.add_tournament(year, "Host", None, None)
+        brazil = crud.add_team(" Brazil" if year == 2018 else "Brazil", "Coach", "A", tid)
+        germany = crud.add_team("Germany", "Coach", "A", tid)
+        crud.add_match(f"{year}-07-08", "Semi-final", brazil, germany, s1, s2, tid)
+
+    matrices = analysis.head_to_head()
+    assert [name.strip() for name in matrices["teams"]] == ["Brazil", "Germany"]
+    # The 2022 match has no score yet and is not counted
+    assert matrices["played"].tolist() == [[0, 2], [2, 0]]
+    assert matrices["won"].tolist() == [[0, 0], [1, 0]]
+    assert matrices["lost"].tolist() == [[0, 1], [0, 0]]
+    assert matrices["drawn"].tolist() == [[0, 1], [1, 0]]
+    assert matrices["goal_difference"].tolist() == [[0, -6], [6, 0]]
+
+    only_2014 = analysis.head_to_head([1])
+    assert only_2014["played"].tolist() == [[0, 1], [1, 0]]
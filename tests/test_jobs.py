@@ -0,0 +1,53 @@
+import sqlite3
+import threading
+import time
+
+import pytest
+
+import db
+from jobs import JobRunner
+
+SLOW_SQL = "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < 2000000) SELECT sum(i) FROM n"
+
+
+class FakeRoot:
+    def after(self, ms, callback):
+        pass
+
+
+@pytest.fixture
+def runner(fresh_db):
+    runner = JobRunner(FakeRoot(), max_workers=1)
+    yield runner
+    runner.shutdown()
+
+
+def _slow_query(started):
+    # About a second of SQLite work; started is set just before it begins
+    def compute():
+        started.set()
+        return db.get_connection().execute(SLOW_SQL).fetchone()[0]
+    return compute
+
+
+def test_cancelling_a_finished_job_leaves_the_next_one_alone(runner):
+    first = runner.submit("first", lambda: 1, print)
+    first.future.result()
+    started = threading.Event()
+    second = runner.submit("second", _slow_query(started), print)
+    started.wait()
+    time.sleep(0.2)
+
+    runner.cancel("first")
+    assert second.future.result() == 2000000 * 2000001 // 2
+
+
+def test_cancelling_a_running_job_interrupts_its_query(runner):
+    started = threading.Event()
+    job = runner.submit("slow", _slow_query(started), print)
+    started.wait()
+    time.sleep(0.2)
+
+    runner.cancel("slow")
+    with pytest.raises(sqlite3.OperationalError, match="interrupted"):
+        job.future.result()
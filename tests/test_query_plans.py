@@ -0,0 +1,11 @@
+import benchmark
+import seed
+
+
+def test_hot_queries_search_indexes_on_the_seed(fresh_db):
+    seed.load_seed_data()
+    assert benchmark.query_plan_scans() == {}
+
+
+def test_hot_queries_search_indexes_at_scale():
+    assert benchmark.check_query_plans() == {}
@@ -0,0 +1,22 @@
+import crud
+import db
+import ratings
+
+
+def test_match_between_teams_with_the_same_name_is_skipped(fresh_db):
+    tid = crud.add_tournament(2022, "Qatar", None, None)
+    brazil = crud.add_team("Brazil", "Tite", "G", tid)
+    other_brazil = crud.add_team(" brazil", "Tite", "G", tid)
+    serbia = crud.add_team("Serbia", "Stojković", "G", tid)
+    crud.add_match("2022-11-24", "Group", brazil, serbia, 2, 0, tid)
+    crud.add_match("2022-11-28", "Group", brazil, brazil, 1, 0, tid)
+    crud.add_match("2022-12-02", "Group", brazil, other_brazil, 1, 0, tid)
+
+    assert ratings.update_ratings() == 1
+    history = db.get_connection().execute("SELECT match_id, team_key FROM RatingHistory").fetchall()
+    assert len(history) == 2
+
+    # The watermark advanced, so later matches still replay
+    crud.add_match("2022-12-05", "Round of 16", serbia, brazil, 1, 1, tid)
+    assert ratings.update_ratings() == 1
+    assert ratings.current_ratings.__wrapped__()["matches"].tolist() == [2, 2]
@@ -0,0 +1,63 @@
+import crud
+import search
+
+
+def _names(text, **kwargs):
+    return [row[2] for row in search.search(text, **kwargs)]
+
+
+def _tournament():
+    tid = crud.add_tournament(2014, "Brasil", None, None)
+    germany = crud.add_team("Germany", "Joachim Löw", "G", tid)
+    france = crud.add_team("France", "Didier Deschamps", "F", tid)
+    return tid, germany, france
+
+
+def test_accents_and_case_are_folded(fresh_db):
+    _, germany, france = _tournament()
+    crud.add_player("Thomas Müller", "FW", germany)
+    crud.add_player("Kylian Mbappé", "FW", france)
+    assert _names("muller") == ["Thomas Müller"]
+    assert _names("MBAPPE") == ["Kylian Mbappé"]
+    assert _names("löw", kinds=["coach"]) == ["Joachim Löw"]
+
+
+def test_short_queries_match_word_starts(fresh_db):
+    _, germany, france = _tournament()
+    crud.add_player("Thomas Müller", "FW", germany)
+    crud.add_player("Samuel Umtiti", "DF", france)
+    assert _names("mu", kinds=["player"]) == ["Thomas Müller"]
+    assert _names("u", kinds=["player"]) == ["Samuel Umtiti"]
+
+
+def test_exact_and_prefix_matches_come_first(fresh_db):
+    _, germany, _ = _tournament()
+    crud.add_players_bulk([(f"Joachim Berger {i}", "MF", germany) for i in range(search.CANDIDATES + 50)])
+    crud.add_player("Berg", "MF", germany)
+    crud.add_player("Bergmann", "MF", germany)
+    assert _names("berg", limit=3) == ["Berg", "Bergmann", "Joachim Berger 0"]
+
+
+def test_fuzzy_fallback_survives_a_typo_but_not_noise(fresh_db):
+    _, germany, france = _tournament()
+    crud.add_player("Thomas Müller", "FW", germany)
+    crud.add_player("Samuel Umtiti", "DF", france)
+    assert _names("mueller") == ["Thomas Müller"]
+    assert _names("muler") == ["Thomas Müller"]
+
+
+def test_renamed_and_deleted_names_are_reindexed(fresh_db):
+    _, germany, _ = _tournament()
+    player = crud.add_player("Thomas Müller", "FW", germany)
+    assert search.search_index_pending()
+    assert _names("muller") == ["Thomas Müller"]
+    assert not search.search_index_pending()
+
+    crud.edit_player(player, player_name="Miroslav Klose")
+    assert search.search_index_pending()
+    assert _names("muller") == []
+    assert _names("klose") == ["Miroslav Klose"]
+
+    crud.delete_player(player)
+    assert _names("klose") == []
+    assert _names("mi", kinds=["player"]) == []
@@ -0,0 +1,42 @@
+import threading
+
+import crud
+import db
+import seed
+
+
+def test_building_the_seed_leaves_the_live_database_alone(fresh_db, tmp_path):
+    live_path = db.DB_PATH
+    crud.add_tournament(1999, "Nowhere")
+    changes = []
+
+    def listener(*change):
+        changes.append(change)
+    db.subscribe(listener)
+    worker_conn = {}
+    built = threading.Event()
+
+    def worker():
+        conn = db.get_connection()
+        built.wait()
+        worker_conn["same"] = db.get_connection() is conn
+        worker_conn["rows"] = conn.execute("SELECT count(*) FROM Tournament").fetchone()[0]
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    try:
+        seed.seed_version.cache_clear()
+        snapshot = seed.build_seed_snapshot(str(tmp_path / "seed.db"))
+    finally:
+        built.set()
+        thread.join()
+        db.unsubscribe(listener)
+
+    assert db.DB_PATH == live_path
+    assert worker_conn == {"same": True, "rows": 1}
+    assert changes == []
+    assert seed.stored_seed_version(snapshot) == seed.seed_version()
+
+    seed.restore_seed_snapshot(snapshot)
+    assert len(crud.view_tournaments()) == 4
+    assert seed.stored_seed_version(live_path) == seed.seed_version()
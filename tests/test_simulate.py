@@ -0,0 +1,16 @@
+import pytest
+
+import crud
+import simulate
+
+
+@pytest.mark.parametrize("simulations", [0, -1])
+def test_fewer_than_one_simulation_is_rejected(fresh_db, simulations):
+    tid = crud.add_tournament(2022, "Qatar", None, None)
+    crud.add_team("Brazil", "Tite", "G", tid)
+    crud.add_team("Serbia", "Stojković", "G", tid)
+
+    with pytest.raises(ValueError, match="at least 1"):
+        simulate.tournament_forecast.__wrapped__(tid, simulations)
+    with pytest.raises(ValueError, match="at least 1"):
+        simulate.simulate(simulate.fit_model(tid), simulations)
@@ -0,0 +1,35 @@
+import analysis
+import crud
+import db
+
+
+def _standings():
+    return db.get_connection().execute(
+        "SELECT team_id, played, points FROM TeamStanding ORDER BY team_id").fetchall()
+
+
+def test_match_without_opponent_is_not_counted(fresh_db):
+    tid = crud.add_tournament(2022, "Qatar", None, None)
+    argentina = crud.add_team("Argentina", "Scaloni", "C", tid)
+    crud.add_match("2022-12-20", "Final", argentina, None, None, None, tid)
+    assert _standings() == []
+
+    db.rebuild_team_standings()
+    assert _standings() == []
+    board = analysis.compute_leaderboard.__wrapped__(tid)
+    assert board[["played", "points"]].values.tolist() == [[0, 0]]
+
+
+def test_unplayed_match_counts_once_it_has_a_score(fresh_db):
+    tid = crud.add_tournament(2022, "Qatar", None, None)
+    argentina = crud.add_team("Argentina", "Scaloni", "C", tid)
+    france = crud.add_team("France", "Deschamps", "D", tid)
+    match = crud.add_match("2022-12-18", "Final", argentina, france, None, None, tid)
+    assert _standings() == []
+
+    crud.edit_match(match, team1_score=3, team2_score=3)
+    assert _standings() == [(argentina, 1, 1), (france, 1, 1)]
+    db.rebuild_team_standings()
+    assert _standings() == [(argentina, 1, 1), (france, 1, 1)]
+    for compute in (analysis.compute_leaderboard, analysis.compute_leaderboard_from_matches):
+        assert compute.__wrapped__(tid)["played"].tolist() == [1, 1]
@@ -0,0 +1,11 @@
+import benchmark
+
+
+def test_app_modules_follow_app_imports():
+    modules = benchmark.app_modules()
+    assert {"db", "crud", "analysis", "jobs", "widgets", "search"} <= set(modules)
+    assert "tkinter" not in modules
+
+
+def test_no_heavy_imports_at_startup():
+    assert benchmark.heavy_imports_at_startup() == []
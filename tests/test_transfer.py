@@ -0,0 +1,30 @@
+import pytest
+
+import db
+import seed
+
+pytest.importorskip("pyarrow")
+import transfer  # noqa: E402
+
+
+def _snapshot(conn):
+    return seed.data_digest(conn), conn.execute("SELECT * FROM TeamStanding ORDER BY 1, 2").fetchall()
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "arrow"])
+def test_export_then_import_round_trips_every_row(fresh_db, tmp_path, fmt):
+    seed.load_seed_data()
+    before = _snapshot(db.get_connection())
+    counts = transfer.export_database(str(tmp_path / "export"), fmt, chunk_rows=50)
+
+    db.configure_db(str(tmp_path / "copy.db"))
+    db.init_db()
+    assert transfer.import_database(str(tmp_path / "export"), chunk_rows=50) == counts
+    assert _snapshot(db.get_connection()) == before
+
+    # Clashing keys abort the import and keep the tables as they were
+    with pytest.raises(ValueError, match="Tournament"):
+        transfer.import_database(str(tmp_path / "export"))
+    assert _snapshot(db.get_connection()) == before
+    assert transfer.import_database(str(tmp_path / "export"), replace=True) == counts
+    assert _snapshot(db.get_connection()) == before
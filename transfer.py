@@ -0,0 +1,156 @@
+import os
+import sqlite3
+
+import db
+from crud import PRIMARY_KEYS
+
+# -----------------------------
+# --- Parquet / Arrow Transfer --
+# -----------------------------
+# Whole-database export and import, one file per table (Tournament.parquet,
+# Team.parquet, ... or *.arrow for the Arrow IPC file format). Tables are
+# streamed in chunks of chunk_rows: fetchmany() -> Arrow record batch on the
+# way out, record batch -> executemany() on the way in, so memory stays
+# bounded and no Python loop runs per row. Primary keys are kept, so
+# references between the files stay valid. The TeamStanding and
+# PlayerEventCount summaries are not exported; they are rebuilt after an
+# import. Needs pyarrow (pip install pyarrow), which is imported on first use.
+
+TABLES = list(PRIMARY_KEYS)          # parents before children
+FORMATS = {"parquet": ".parquet", "arrow": ".arrow"}
+CHUNK_ROWS = 100_000
+
+
+def _pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError("Parquet/Arrow export and import need pyarrow: pip install pyarrow") from e
+    return pa
+
+
+def table_columns(table):
+    # [(name, declared type)] in table order
+    return [(row[1], row[2].upper()) for row in db.get_connection().execute(f"PRAGMA table_info({table})")]
+
+
+def _schema(pa, table):
+    types = {"INTEGER": pa.int64(), "REAL": pa.float64(), "TEXT": pa.string()}
+    return pa.schema([(name, types.get(decl, pa.string())) for name, decl in table_columns(table)])
+
+
+def export_database(directory, fmt="parquet", chunk_rows=CHUNK_ROWS, progress=None):
+    # Write every table to directory; returns {table: rows written}.
+    # progress(table, rows_so_far) is called after every chunk.
+    pa = _pyarrow()
+    os.makedirs(directory, exist_ok=True)
+    counts = {}
+    for table in TABLES:
+        schema = _schema(pa, table)
+        path = os.path.join(directory, table + FORMATS[fmt])
+        if fmt == "parquet":
+            writer = pa.parquet.ParquetWriter(path, schema)
+        else:
+            writer = pa.ipc.new_file(path, schema)
+        counts[table] = 0
+        # One read transaction per table, so the chunks form a consistent snapshot
+        with db.transaction() as cursor:
+            cursor.execute(f"SELECT * FROM {table} ORDER BY {PRIMARY_KEYS[table]}")
+            try:
+                while True:
+                    rows = cursor.fetchmany(chunk_rows)
+                    if not rows:
+                        break
+                    columns = zip(*rows)
+                    arrays = [pa.array(values, type=field.type) for values, field in zip(columns, schema)]
+                    writer.write_batch(pa.record_batch(arrays, schema=schema))
+                    counts[table] += len(rows)
+                    if progress:
+                        progress(table, counts[table])
+            finally:
+                writer.close()
+    return counts
+
+
+def _batches(pa, path, fmt, chunk_rows):
+    if fmt == "parquet":
+        yield from pa.parquet.ParquetFile(path).iter_batches(batch_size=chunk_rows)
+    else:
+        with pa.ipc.open_file(path) as reader:
+            for i in range(reader.num_record_batches):
+                yield reader.get_batch(i)
+
+
+def detect_format(directory):
+    for fmt, ext in FORMATS.items():
+        if os.path.exists(os.path.join(directory, TABLES[0] + ext)):
+            return fmt
+    raise FileNotFoundError(f"no {TABLES[0]}.parquet or {TABLES[0]}.arrow in {directory}")
+
+
+def import_database(directory, fmt=None, replace=False, chunk_rows=CHUNK_ROWS, progress=None,
+                    publish_changes=True):
+    # Load the files written by export_database() in one transaction.
+    # replace=True empties the tables first; otherwise rows are added and a
+    # clashing primary key aborts the whole import (ValueError naming the
+    # table). Foreign keys are deferred and checked once at the end for the
+    # imported tables rather than per row; rows that already referenced a
+    # missing parent before the import are not blamed on it. Indexes and
+    # summaries are rebuilt once afterwards (db.bulk_load).
+    # Returns {table: rows read}.
+    pa = _pyarrow()
+    fmt = fmt or detect_format(directory)
+    paths = {table: os.path.join(directory, table + FORMATS[fmt]) for table in TABLES}
+    imported = [table for table in TABLES if os.path.exists(paths[table])]
+    counts = {}
+    with db.bulk_load() as cursor:
+        cursor.execute("PRAGMA defer_foreign_keys = ON")
+        if replace:
+            for table in reversed(TABLES):
+                cursor.execute(f"DELETE FROM {table}")
+            orphans = set()
+        else:
+            orphans = _orphans(cursor, imported)
+        for table in TABLES:
+            counts[table] = 0
+            if table not in imported:
+                continue
+            known = {name for name, _ in table_columns(table)}
+            for batch in _batches(pa, paths[table], fmt, chunk_rows):
+                names = [name for name in batch.schema.names if name in known]
+                columns = [batch.column(batch.schema.get_field_index(name)).to_pylist() for name in names]
+                try:
+                    cursor.executemany(f"INSERT INTO {table} ({', '.join(names)}) "
+                                       f"VALUES ({', '.join('?' * len(names))})", zip(*columns))
+                except sqlite3.IntegrityError as e:
+                    raise ValueError(f"{table}: {e} while importing {paths[table]} (a row id that already "
+                                     f"exists?); import with --replace or into an empty database. "
+                                     f"Nothing was imported") from e
+                counts[table] += batch.num_rows
+                if progress:
+                    progress(table, counts[table])
+        problems = sorted(_orphans(cursor, imported) - orphans)
+        if problems:
+            table, rowid, parent = problems[0]
+            raise ValueError(f"{len(problems)} rows reference missing parents, "
+                             f"e.g. {table} row {rowid} -> {parent}; nothing was imported")
+    if publish_changes:
+        publish_reset()
+    return counts
+
+
+def _orphans(cursor, tables):
+    # {(table, rowid, parent table)} of the rows whose parent is missing
+    orphans = set()
+    for table in tables:
+        for _, rowid, parent, _ in cursor.execute(f"PRAGMA foreign_key_check({table})"):
+            orphans.add((table, rowid, parent))
+    return orphans
+
+
+def publish_reset():
+    # Tell open windows and the analysis cache that every table was replaced
+    for table in TABLES:
+        db.publish(table, "reset", None)
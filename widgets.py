@@ -0,0 +1,110 @@
+import queue
+import threading
+import tkinter as tk
+from tkinter import ttk
+
+import db
+
+# -----------------------------
+# --- Paged Table Widget ------
+# -----------------------------
+# A Treeview that loads rows one page at a time. It only holds the pages the
+# user has scrolled through, and it asks for the next page when the scrollbar
+# gets near the bottom. Rows are keyed by their first column (the primary
+# key), which is also used as the Treeview item id, so a single changed row
+# can be patched in place (see watch()). Changes committed on another thread
+# (the job runner) are queued and applied on the Tk thread, which polls for
+# them, because Tkinter must only be touched from the thread that created it.
+
+
+class PagedTable(tk.Frame):
+    PAGE_SIZE = 200
+    PREFETCH_AT = 0.9   # fetch the next page once 90% of the loaded rows are visible
+    POLL_MS = 100       # how often changes from other threads are applied
+
+    def __init__(self, master, columns, headings, fetch_page, page_size=None):
+        # fetch_page(after_key, limit) -> list of row tuples ordered by key
+        super().__init__(master)
+        self.fetch_page = fetch_page
+        self.page_size = page_size or self.PAGE_SIZE
+        self.last_key = None
+        self.exhausted = False
+        self._loading = False
+        self._scheduled = False
+        self._changes = queue.SimpleQueue()
+
+        self.tree = ttk.Treeview(self, columns=columns, show="headings")
+        for col, text in zip(columns, headings):
+            self.tree.heading(col, text=text)
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self._on_scroll)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+    def reload(self):
+        self.tree.delete(*self.tree.get_children())
+        self.last_key = None
+        self.exhausted = False
+        self.load_more()
+
+    def load_more(self):
+        if self.exhausted or self._loading:
+            return
+        self._loading = True
+        try:
+            rows = self.fetch_page(self.last_key, self.page_size)
+            for row in rows:
+                self.tree.insert("", "end", iid=str(row[0]), values=row)
+            if rows:
+                self.last_key = rows[-1][0]
+            self.exhausted = len(rows) < self.page_size
+        finally:
+            self._loading = False
+
+    def watch(self, table):
+        # Follow db change notifications for table until the widget is
+        # destroyed. Called on the Tk thread.
+        tk_thread = threading.current_thread()
+
+        def on_change(changed_table, action, key, row):
+            if changed_table != table:
+                return
+            if threading.current_thread() is tk_thread:
+                self.apply_change(action, key, row)
+            else:
+                self._changes.put((action, key, row))
+        db.subscribe(on_change)
+        self.bind("<Destroy>", lambda e: db.unsubscribe(on_change) if e.widget is self else None, add="+")
+        self.after(self.POLL_MS, self._apply_queued)
+
+    def _apply_queued(self):
+        if not self.winfo_exists():
+            return
+        while not self._changes.empty():
+            self.apply_change(*self._changes.get())
+        self.after(self.POLL_MS, self._apply_queued)
+
+    def apply_change(self, action, key, row=None):
+        iid = str(key)
+        if action == "update" and self.tree.exists(iid):
+            self.tree.item(iid, values=row)
+        elif action == "delete" and self.tree.exists(iid):
+            self.tree.delete(iid)
+        elif action == "insert" and self.exhausted:
+            # New keys sort after everything loaded, so the next keyset page
+            # picks up exactly the new rows that match this table's filter
+            self.exhausted = False
+            self.load_more()
+        elif action == "reset":
+            self.reload()
+
+    def _on_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        if not self.exhausted and not self._scheduled and float(last) >= self.PREFETCH_AT:
+            # Defer: inserting rows from inside the scroll callback re-enters it
+            self._scheduled = True
+            self.after_idle(self._scheduled_load)
+
+    def _scheduled_load(self):
+        self._scheduled = False
+        self.load_more()